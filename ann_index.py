@@ -0,0 +1,375 @@
+import os
+import tempfile
+import numpy as np
+from face_matcher import ENCODING_DIM, DEFAULT_TOLERANCE
+
+
+def squared_distances(a, b, b_sq_norms=None):
+    """
+    두 벡터 집합 사이의 제곱 유클리드 거리
+    Args:
+        a (numpy.ndarray): (M, D)
+        b (numpy.ndarray): (N, D)
+        b_sq_norms (numpy.ndarray, optional): b의 제곱 노름 (미리 계산된 경우)
+    Returns:
+        numpy.ndarray: (M, N) 제곱 거리 행렬
+    """
+    if b_sq_norms is None:
+        b_sq_norms = np.einsum('ij,ij->i', b, b)
+    dist = np.einsum('ij,ij->i', a, a)[:, None] + b_sq_norms[None, :]
+    dist -= 2.0 * (a @ b.T)
+    np.maximum(dist, 0.0, out=dist)
+    return dist
+
+
+def kmeans(data, n_clusters, iterations=20, seed=0, chunk_size=65536):
+    """
+    순수 NumPy k-means (IVF 중심점 학습용)
+    Args:
+        data (numpy.ndarray): (N, D) float32 학습 데이터
+        n_clusters (int): 클러스터 수
+        iterations (int): 반복 횟수
+        seed (int): 난수 시드
+        chunk_size (int): 할당 단계에서 한 번에 처리할 행 수
+    Returns:
+        numpy.ndarray: (n_clusters, D) 중심점
+    """
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = assign_nearest(data, centroids, chunk_size)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        # 정렬 후 reduceat으로 클러스터별 합 계산 (np.add.at보다 훨씬 빠름)
+        order = np.argsort(assignments, kind='stable')
+        occupied = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[occupied]
+        sums = np.zeros_like(centroids)
+        sums[occupied] = np.add.reduceat(data[order], starts, axis=0)
+
+        empty = counts == 0
+        counts[empty] = 1
+        centroids = (sums / counts[:, None]).astype(np.float32)
+        # 비어 있는 클러스터는 임의의 학습 벡터로 다시 시작
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), int(empty.sum()), replace=False)]
+
+    return centroids
+
+
+def assign_nearest(data, centroids, chunk_size=65536):
+    """
+    각 벡터를 가장 가까운 중심점에 할당
+    Returns:
+        numpy.ndarray: (N,) 중심점 인덱스
+    """
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    assignments = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        assignments[start:start + chunk_size] = squared_distances(chunk, centroids, centroid_norms).argmin(axis=1)
+    return assignments
+
+
+class IVFFlatIndex:
+    """
+    IVF-Flat 근사 최근접 이웃 인덱스 (순수 NumPy)
+    - k-means로 공간을 nlist개 셀로 나누고, 검색 시 가까운 nprobe개 셀만 정밀 비교
+    - nprobe를 키우면 재현율이 올라가고 지연 시간이 늘어남
+    - 학습 전에는 전체를 정밀 비교하고, train_threshold개가 모이면 자동 학습
+    """
+
+    def __init__(self, nlist=256, nprobe=8, train_threshold=None, tolerance=DEFAULT_TOLERANCE, seed=0):
+        """
+        Args:
+            nlist (int): IVF 셀 수
+            nprobe (int): 검색 시 살펴볼 셀 수
+            train_threshold (int, optional): 자동 학습을 시작할 등록 수 (기본값: nlist * 39)
+            tolerance (float): 일치로 판단하는 최대 거리
+            seed (int): k-means 난수 시드
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold or nlist * 39
+        self.tolerance = tolerance
+        self.seed = seed
+
+        self.names = []  # 전역 ID -> 사용자 ID
+        self.centroids = None
+        # 학습 전 벡터 (전역 ID 순서)
+        self.pending = np.empty((0, ENCODING_DIM), dtype=np.float32)
+        # 셀별 벡터/전역 ID/제곱 노름 (용량을 두 배씩 늘려 추가 비용을 상각)
+        self.cell_vectors = []
+        self.cell_ids = []
+        self.cell_norms = []
+        self.cell_sizes = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def train(self, data=None, iterations=20, max_train_points=None):
+        """
+        중심점 학습 후 기존 벡터를 셀에 배치
+        Args:
+            data (numpy.ndarray, optional): 학습 데이터 (기본값: 지금까지 추가된 벡터)
+            iterations (int): k-means 반복 횟수
+            max_train_points (int, optional): 학습에 사용할 최대 표본 수 (기본값: nlist * 256)
+        """
+        vectors = self.vectors_by_id()
+        data = vectors if data is None else np.asarray(data, dtype=np.float32)
+        if len(data) < self.nlist:
+            raise ValueError(f"학습 데이터가 부족합니다: {len(data)}개 < nlist {self.nlist}")
+
+        max_train_points = max_train_points or self.nlist * 256
+        if len(data) > max_train_points:
+            rng = np.random.default_rng(self.seed)
+            data = data[rng.choice(len(data), max_train_points, replace=False)]
+
+        self.centroids = kmeans(np.ascontiguousarray(data), self.nlist, iterations, self.seed)
+        self.cell_vectors = [np.empty((0, ENCODING_DIM), dtype=np.float32) for _ in range(self.nlist)]
+        self.cell_ids = [np.empty(0, dtype=np.int64) for _ in range(self.nlist)]
+        self.cell_norms = [np.empty(0, dtype=np.float32) for _ in range(self.nlist)]
+        self.cell_sizes = np.zeros(self.nlist, dtype=np.int64)
+
+        self.pending = np.empty((0, ENCODING_DIM), dtype=np.float32)
+        if len(vectors):
+            self._insert(vectors, np.arange(len(vectors)))
+
+    def vectors_by_id(self):
+        """
+        저장된 모든 벡터를 전역 ID 순서로 반환
+        """
+        if not self.is_trained:
+            return self.pending
+        vectors = np.empty((len(self.names), ENCODING_DIM), dtype=np.float32)
+        for cell_vectors, cell_ids, size in zip(self.cell_vectors, self.cell_ids, self.cell_sizes):
+            vectors[cell_ids[:size]] = cell_vectors[:size]
+        return vectors
+
+    def _insert(self, vectors, ids):
+        """
+        학습된 인덱스의 셀에 벡터 배치
+        """
+        assignments = assign_nearest(vectors, self.centroids)
+        norms = np.einsum('ij,ij->i', vectors, vectors)
+        order = np.argsort(assignments, kind='stable')
+        cells, starts = np.unique(assignments[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        for cell, start, end in zip(cells, starts, ends):
+            rows = order[start:end]
+            size = self.cell_sizes[cell]
+            needed = size + len(rows)
+            capacity = len(self.cell_ids[cell])
+            if needed > capacity:
+                capacity = max(needed, capacity * 2, 16)
+                self.cell_vectors[cell] = self._grow(self.cell_vectors[cell], size, (capacity, ENCODING_DIM))
+                self.cell_ids[cell] = self._grow(self.cell_ids[cell], size, (capacity,))
+                self.cell_norms[cell] = self._grow(self.cell_norms[cell], size, (capacity,))
+
+            self.cell_vectors[cell][size:needed] = vectors[rows]
+            self.cell_ids[cell][size:needed] = ids[rows]
+            self.cell_norms[cell][size:needed] = norms[rows]
+            self.cell_sizes[cell] = needed
+
+    @staticmethod
+    def _grow(array, size, shape):
+        grown = np.empty(shape, dtype=array.dtype)
+        grown[:size] = array[:size]
+        return grown
+
+    def add_many(self, encodings, names):
+        """
+        여러 인코딩 추가 (학습 전이면 보류 목록에 쌓고 임계값 도달 시 자동 학습)
+        Args:
+            encodings (list): 얼굴 인코딩 리스트
+            names (list): 각 인코딩의 사용자 ID
+        """
+        names = list(names)
+        if not names:
+            return
+        vectors = np.asarray(encodings, dtype=np.float32).reshape(len(names), ENCODING_DIM)
+        ids = np.arange(len(self.names), len(self.names) + len(names))
+        self.names.extend(names)
+
+        if self.is_trained:
+            self._insert(vectors, ids)
+        else:
+            self.pending = np.vstack([self.pending, vectors])
+            if len(self.pending) >= self.train_threshold:
+                self.train()
+
+    def add(self, encoding, name):
+        """
+        인코딩 하나 추가 (얼굴 등록 직후 사용)
+        """
+        self.add_many([encoding], [name])
+
+    def remove(self, name):
+        """
+        사용자 ID의 인코딩을 모두 삭제 (남은 인코딩의 전역 ID를 앞으로 당김)
+        Args:
+            name (str): 사용자 ID
+        Returns:
+            int: 삭제한 인코딩 수
+        """
+        keep = np.array([existing != name for existing in self.names], dtype=bool)
+        removed = len(keep) - int(keep.sum())
+        if not removed:
+            return 0
+        new_ids = np.cumsum(keep) - 1  # 기존 전역 ID -> 새 전역 ID
+        self.names = [existing for existing, kept in zip(self.names, keep) if kept]
+
+        if not self.is_trained:
+            self.pending = self.pending[keep]
+            return removed
+        for cell in range(self.nlist):
+            size = self.cell_sizes[cell]
+            if not size:
+                continue
+            ids = self.cell_ids[cell][:size]
+            rows = keep[ids]
+            count = int(rows.sum())
+            if count < size:
+                self.cell_vectors[cell][:count] = self.cell_vectors[cell][:size][rows]
+                self.cell_norms[cell][:count] = self.cell_norms[cell][:size][rows]
+                self.cell_sizes[cell] = count
+            self.cell_ids[cell][:count] = new_ids[ids[rows]]
+        return removed
+
+    def replace(self, encoding, name):
+        """
+        사용자 ID의 기존 인코딩을 새 인코딩 하나로 교체 (재등록)
+        """
+        self.remove(name)
+        self.add(encoding, name)
+
+    def search(self, probe, k=1, nprobe=None):
+        """
+        근사 top-k 검색
+        Args:
+            probe (numpy.ndarray): (128,) 프로브 인코딩
+            k (int): 반환할 후보 수
+            nprobe (int, optional): 이번 검색에서 살펴볼 셀 수 (기본값: self.nprobe)
+        Returns:
+            tuple: (전역 ID 배열, 거리 배열) - 가까운 순
+        """
+        probe = np.asarray(probe, dtype=np.float32).reshape(1, ENCODING_DIM)
+
+        if not self.is_trained:
+            if not len(self.pending):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            candidate_ids = np.arange(len(self.pending))
+            candidate_dist = squared_distances(probe, self.pending)[0]
+        else:
+            nprobe = min(nprobe or self.nprobe, self.nlist)
+            centroid_dist = squared_distances(probe, self.centroids)[0]
+            cells = np.argpartition(centroid_dist, nprobe - 1)[:nprobe]
+
+            id_parts = []
+            dist_parts = []
+            for cell in cells:
+                size = self.cell_sizes[cell]
+                if not size:
+                    continue
+                id_parts.append(self.cell_ids[cell][:size])
+                dist_parts.append(squared_distances(probe, self.cell_vectors[cell][:size],
+                                                    self.cell_norms[cell][:size])[0])
+            if not id_parts:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            candidate_ids = np.concatenate(id_parts)
+            candidate_dist = np.concatenate(dist_parts)
+
+        k = min(k, len(candidate_ids))
+        top = np.argpartition(candidate_dist, k - 1)[:k]
+        top = top[np.argsort(candidate_dist[top])]
+        return candidate_ids[top], np.sqrt(candidate_dist[top])
+
+    def identify(self, probe, k=1, nprobe=None):
+        """
+        1:N 식별 - FaceMatcher.identify와 같은 형식으로 반환
+        Returns:
+            list: [(사용자 ID, 거리), ...] (가까운 순)
+        """
+        ids, dist = self.search(probe, k, nprobe)
+        return [(self.names[i], float(d)) for i, d in zip(ids, dist)]
+
+    def best_match(self, probe, tolerance=None):
+        """
+        가장 가까운 등록 얼굴이 허용 거리 안에 있으면 반환
+        Returns:
+            tuple: (사용자 ID 또는 None, 거리 또는 None)
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+        candidates = self.identify(probe, k=1)
+        if candidates and candidates[0][1] <= tolerance:
+            return candidates[0]
+        return None, candidates[0][1] if candidates else None
+
+    def save(self, path):
+        """
+        인덱스를 npz 파일로 저장 (임시 파일에 기록 후 원자적 교체)
+        """
+        if self.is_trained:
+            vectors = np.concatenate([v[:n] for v, n in zip(self.cell_vectors, self.cell_sizes)])
+            ids = np.concatenate([i[:n] for i, n in zip(self.cell_ids, self.cell_sizes)])
+            centroids = self.centroids
+            cell_sizes = self.cell_sizes
+        else:
+            vectors = self.pending
+            ids = np.arange(len(self.pending))
+            centroids = np.empty((0, ENCODING_DIM), dtype=np.float32)
+            cell_sizes = np.empty(0, dtype=np.int64)
+
+        index_dir = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=index_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(file,
+                         params=np.array([self.nlist, self.nprobe, self.train_threshold, self.seed]),
+                         tolerance=np.array(self.tolerance),
+                         names=np.array(self.names, dtype=str),
+                         centroids=centroids,
+                         cell_sizes=cell_sizes,
+                         vectors=vectors,
+                         ids=ids)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        npz 파일에서 인덱스 복원
+        Returns:
+            IVFFlatIndex: 복원된 인덱스
+        """
+        with np.load(path, allow_pickle=False) as data:
+            nlist, nprobe, train_threshold, seed = (int(x) for x in data['params'])
+            index = cls(nlist, nprobe, train_threshold, float(data['tolerance']), seed)
+            index.names = data['names'].tolist()
+            centroids = data['centroids']
+            vectors = data['vectors']
+            ids = data['ids']
+            cell_sizes = data['cell_sizes']
+
+        if not len(centroids):
+            index.pending = np.ascontiguousarray(vectors, dtype=np.float32)
+            return index
+
+        index.centroids = centroids
+        index.cell_sizes = cell_sizes.astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(cell_sizes)])
+        for cell in range(nlist):
+            start, end = offsets[cell], offsets[cell + 1]
+            cell_vectors = np.ascontiguousarray(vectors[start:end])
+            index.cell_vectors.append(cell_vectors)
+            index.cell_ids.append(ids[start:end].copy())
+            index.cell_norms.append(np.einsum('ij,ij->i', cell_vectors, cell_vectors))
+        return index
@@ -0,0 +1,261 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from db import get_pool, migrate
+
+# 감사 로그 데이터베이스 경로
+AUDIT_DB_PATH = "./audit.db"
+
+# 인증 결과
+SUCCESS = 'success'
+FAILURE = 'failure'
+ERROR = 'error'
+
+# 시간별 집계 조회 결과
+# - attempts: 시도 수, successes: 성공 수, success_rate: 성공률 (0~1)
+# - avg_ms / max_ms: 전체 소요 시간 평균/최대 (ms, 측정된 시도만)
+HourlyStats = namedtuple('HourlyStats', ['hour', 'kind', 'action', 'attempts', 'successes', 'success_rate',
+                                         'avg_ms', 'max_ms'])
+
+AUDIT_MIGRATIONS = [
+    # 1: 원본 이벤트(추가 전용)와 시간별 집계 테이블
+    ("""
+        CREATE TABLE auth_events (
+            id INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,              -- 시도 시각 (epoch 초)
+            kind TEXT NOT NULL,            -- 'face', 'gesture', 'file_gesture'
+            action TEXT NOT NULL,          -- 'verify' 또는 'register'
+            subject TEXT,                  -- 사용자 ID 또는 파일 이름
+            outcome TEXT NOT NULL,         -- 'success', 'failure', 'error'
+            reason TEXT,                   -- 실패 사유
+            total_ms REAL,                 -- 시작부터 결정까지 걸린 시간
+            stages TEXT                    -- 단계별 소요 시간 (JSON)
+        )
+    """,
+     "CREATE INDEX idx_auth_events_subject ON auth_events (subject, ts)",
+     """
+        CREATE TABLE auth_rollup_hourly (
+            hour INTEGER NOT NULL,         -- 시간 시작 시각 (epoch 초, 3600의 배수)
+            kind TEXT NOT NULL,
+            action TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            total_ms_sum REAL NOT NULL,    -- total_ms 합계 (평균 계산용)
+            total_ms_count INTEGER NOT NULL,  -- total_ms가 있는 시도 수
+            total_ms_max REAL,
+            PRIMARY KEY (hour, kind, action, outcome)
+        ) WITHOUT ROWID
+    """),
+]
+
+INSERT_EVENT_SQL = """
+    INSERT INTO auth_events (ts, kind, action, subject, outcome, reason, total_ms, stages)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_ROLLUP_SQL = """
+    INSERT INTO auth_rollup_hourly (hour, kind, action, outcome, attempts, total_ms_sum, total_ms_count, total_ms_max)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (hour, kind, action, outcome) DO UPDATE SET
+        attempts = attempts + excluded.attempts,
+        total_ms_sum = total_ms_sum + excluded.total_ms_sum,
+        total_ms_count = total_ms_count + excluded.total_ms_count,
+        total_ms_max = MAX(COALESCE(total_ms_max, excluded.total_ms_max), COALESCE(excluded.total_ms_max, total_ms_max))
+"""
+
+
+class AuditLog:
+    """
+    버퍼형 인증 감사 로그
+    - record()는 메모리 큐에 튜플 하나를 넣기만 함 (DB 접근/직렬화 없음 - 인증 경로 지연 없음)
+    - 백그라운드 스레드가 flush_interval마다(또는 batch_size개가 쌓이면 바로) 한 트랜잭션으로 기록
+    - 같은 트랜잭션에서 시간별 집계 테이블을 갱신하므로 성공률/지연 조회는 원본 행을 훑지 않음
+    - 큐가 max_buffer를 넘으면 새 이벤트를 버리고 개수만 집계 (DB 장애 시 메모리 보호)
+    """
+
+    def __init__(self, db_path=AUDIT_DB_PATH, flush_interval=1.0, batch_size=500, max_buffer=100000):
+        """
+        Args:
+            db_path (str): 감사 로그 SQLite 데이터베이스 경로
+            flush_interval (float): 기록 주기 (초)
+            batch_size (int): 이만큼 쌓이면 주기를 기다리지 않고 기록
+            max_buffer (int): 메모리에 쌓아 둘 최대 이벤트 수
+        """
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.pool = get_pool(db_path)
+        migrate(db_path, AUDIT_MIGRATIONS)
+
+        self.buffer = deque()  # append/popleft는 스레드 안전
+        self.wakeup = threading.Event()
+        self.flush_lock = threading.Lock()
+        self.closed = False
+        self.recorded = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+        self.invalid = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name='audit-flush', daemon=True)
+        self.thread.start()
+
+    def record(self, kind, action, subject, outcome, reason=None, total_ms=None, stages=None):
+        """
+        인증 시도 한 건 기록 (버퍼에 넣기만 하고 바로 반환)
+        Args:
+            kind (str): 'face', 'gesture', 'file_gesture'
+            action (str): 'verify' 또는 'register'
+            subject (str): 사용자 ID 또는 파일 이름
+            outcome (str): SUCCESS, FAILURE, ERROR
+            reason (str, optional): 실패 사유
+            total_ms (float, optional): 시작부터 결정까지 걸린 시간 (ms)
+            stages (dict, optional): 단계별 소요 시간
+        """
+        if len(self.buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self.buffer.append((time.time(), kind, action, subject, outcome, reason, total_ms, stages))
+        self.recorded += 1
+        if len(self.buffer) >= self.batch_size:
+            self.wakeup.set()
+
+    def _run(self):
+        while not self.closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # 기록에 실패한 배치는 버림 (인증 경로로 예외를 올리지 않음)
+                self.failed += 1
+
+    def flush(self):
+        """
+        버퍼에 쌓인 이벤트를 한 트랜잭션으로 기록 (백그라운드 스레드 또는 종료 시 호출)
+        Returns:
+            int: 기록한 이벤트 수
+        """
+        with self.flush_lock:
+            events = []
+            while self.buffer:
+                events.append(self.buffer.popleft())
+            if not events:
+                return 0
+
+            start = time.perf_counter()
+            rows = []
+            rollup = {}
+            for ts, kind, action, subject, outcome, reason, total_ms, stages in events:
+                # 값 하나를 바꿀 수 없다고 배치 전체를 잃지 않도록 행 단위로 변환
+                # (JSON이 아닌 단계 값은 문자열로, 그래도 안 되면 그 행의 단계 값만 비움)
+                try:
+                    stages = json.dumps(stages, default=str) if stages else None
+                except (TypeError, ValueError):
+                    stages = None
+                    self.invalid += 1
+                try:
+                    total_ms = None if total_ms is None else float(total_ms)
+                except (TypeError, ValueError):
+                    total_ms = None
+                    self.invalid += 1
+                rows.append((ts, kind, action, None if subject is None else str(subject), outcome,
+                             None if reason is None else str(reason), total_ms, stages))
+                key = (int(ts // 3600) * 3600, kind, action, outcome)
+                attempts, ms_sum, ms_count, ms_max = rollup.get(key, (0, 0.0, 0, None))
+                if total_ms is not None:
+                    ms_sum += total_ms
+                    ms_count += 1
+                    ms_max = total_ms if ms_max is None else max(ms_max, total_ms)
+                rollup[key] = (attempts + 1, ms_sum, ms_count, ms_max)
+
+            with self.pool.transaction() as conn:
+                conn.executemany(INSERT_EVENT_SQL, rows)
+                conn.executemany(UPSERT_ROLLUP_SQL, [(*key, *value) for key, value in rollup.items()])
+
+            self.flushed += len(events)
+            self.flushes += 1
+            self.flush_seconds += time.perf_counter() - start
+            return len(events)
+
+    def hourly(self, since=None, kind=None):
+        """
+        시간별 성공률/지연 조회 (집계 테이블만 읽음)
+        Args:
+            since (float, optional): 이 시각(epoch 초) 이후 시간대만 (기본값: 최근 24시간)
+            kind (str, optional): 인증 종류 필터
+        Returns:
+            list: HourlyStats 리스트 (시간순)
+        """
+        since = time.time() - 24 * 3600 if since is None else since
+        sql = """
+            SELECT hour, kind, action, SUM(attempts),
+                   SUM(CASE WHEN outcome = 'success' THEN attempts ELSE 0 END),
+                   SUM(total_ms_sum), SUM(total_ms_count), MAX(total_ms_max)
+            FROM auth_rollup_hourly
+            WHERE hour >= ?
+        """
+        params = [int(since // 3600) * 3600]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " GROUP BY hour, kind, action ORDER BY hour, kind, action"
+
+        stats = []
+        for hour, kind, action, attempts, successes, ms_sum, ms_count, ms_max in self.pool.fetchall(sql, params):
+            stats.append(HourlyStats(hour, kind, action, attempts, successes, successes / attempts,
+                                     ms_sum / ms_count if ms_count else None, ms_max))
+        return stats
+
+    def close(self):
+        """
+        백그라운드 스레드를 멈추고 남은 이벤트 기록
+        """
+        self.closed = True
+        self.wakeup.set()
+        self.thread.join(timeout=5.0)
+        self.flush()
+
+    def stats(self):
+        """
+        Returns:
+            dict: 기록/버림/저장 이벤트 수, 대기 중인 이벤트 수, 평균 배치 기록 시간(ms)
+        """
+        return {
+            'recorded': self.recorded,
+            'dropped': self.dropped,
+            'flushed': self.flushed,
+            'pending': len(self.buffer),
+            'failed_batches': self.failed,
+            'invalid': self.invalid,
+            'flushes': self.flushes,
+            'avg_flush_ms': self.flush_seconds / self.flushes * 1000 if self.flushes else 0.0,
+        }
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_audit_log(db_path=AUDIT_DB_PATH):
+    """
+    데이터베이스 파일별 프로세스 전역 감사 로그 (Streamlit 재실행/세션 간에 공유)
+    - 프로세스 종료 시 남은 이벤트를 기록
+    Args:
+        db_path (str): 감사 로그 SQLite 데이터베이스 경로
+    Returns:
+        AuditLog: 감사 로그
+    """
+    path = os.path.abspath(db_path)
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None or log.closed:
+            log = AuditLog(path)
+            _logs[path] = log
+            atexit.register(log.close)
+        return log
@@ -0,0 +1,647 @@
+import bisect
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import face_recognition
+import mediapipe as mp
+import numpy as np
+from frame_quality import FrameQualityGate
+from frame_pipeline import FramePipeline
+from gesture_buffer import GestureResultBuffer
+from gesture_commit import GestureCommitPolicy
+from gesture_submitter import RecognizerSubmitter
+
+# 엔진이 내보내는 이벤트
+# - kind: 'face_detected', 'progress', 'step', 'decision' 등 이벤트 종류
+# - level: 화면에 표시할 때의 수준 ('info', 'success', 'warning', 'error')
+# - message: 사용자에게 보여줄 메시지
+# - data: 결과 값 (dict)
+AuthEvent = namedtuple('AuthEvent', ['kind', 'level', 'message', 'data'])
+# 제스처 손 소유 확인 결과
+# - observations: 녹화 중 손이 보인 인식 결과 수, bound: 인증 얼굴의 손으로 판정된 수
+# - foreign: 크기/거리가 맞지 않거나 얼굴이 여럿이라 다른 사람 손일 수 있는 수, unpaired: 가까운 시각의 얼굴 검출이 없던 수
+HandBinding = namedtuple('HandBinding', ['owned', 'observations', 'bound', 'foreign', 'unpaired'])
+
+# 엔진 상태
+IDLE = 'idle'
+SEARCHING = 'searching'
+CAPTURING = 'capturing'
+RECORDING = 'recording'
+ACCEPTED = 'accepted'
+REJECTED = 'rejected'
+
+
+def detections_to_face_locations(detections, image_shape):
+    """
+    MediaPipe 상대 좌표 박스를 face_recognition의 (top, right, bottom, left) 형식으로 변환
+    Args:
+        detections (list): MediaPipe FaceDetection 결과의 detections
+        image_shape (tuple): 프레임 shape (height, width, ...)
+    Returns:
+        list: 프레임 안으로 잘라낸 (top, right, bottom, left) 튜플 리스트
+    """
+    height, width = image_shape[:2]
+    face_locations = []
+    for detection in detections:
+        box = detection.location_data.relative_bounding_box
+        left = max(0, int(box.xmin * width))
+        top = max(0, int(box.ymin * height))
+        right = min(width, int((box.xmin + box.width) * width))
+        bottom = min(height, int((box.ymin + box.height) * height))
+        if right > left and bottom > top:
+            face_locations.append((top, right, bottom, left))
+    return face_locations
+
+
+def encode_faces(rgb_frame, detections=None):
+    """
+    프레임의 얼굴 인코딩 계산
+    Args:
+        rgb_frame (numpy.ndarray): RGB 프레임
+        detections (list, optional): MediaPipe detections - 있으면 그 박스를 그대로 사용하고
+            dlib HOG 얼굴 검출(face_locations)을 생략
+    Returns:
+        list: 얼굴 인코딩 리스트
+    """
+    if detections:
+        face_locations = detections_to_face_locations(detections, rgb_frame.shape)
+    else:
+        face_locations = face_recognition.face_locations(rgb_frame)
+    return face_recognition.face_encodings(rgb_frame, face_locations)
+
+
+def show_event(event, placeholder):
+    """
+    이벤트를 표시 대상에 출력 (Streamlit 어댑터용)
+    Args:
+        event (AuthEvent): 엔진 이벤트
+        placeholder: level 이름의 메서드(info/success/warning/error)를 가진 대상 (st, st.empty() 등)
+    """
+    getattr(placeholder, event.level)(event.message)
+
+
+class FaceAuthEngine:
+    """
+    UI에 의존하지 않는 얼굴 등록/인증 상태 머신
+    - searching(얼굴 없음) -> capturing(품질 게이트 대기) -> accepted / rejected
+    - process(frame)에 프레임을 넣으면 이벤트 리스트를 돌려줌
+    - 검출기/매처/인코더를 주입받으므로 Streamlit 없이 워커 프로세스나 벤치마크에서 그대로 사용 가능
+    - 등록 모드는 인코딩과 캡처 프레임만 결정에 담아 돌려주고, 저장은 호출한 쪽에서 수행
+    """
+
+    def __init__(self, detector, mode='verify', matcher=None, identifier=None, user_id=None,
+                 reuse_detections=True, max_wait=2.0, encoder=encode_faces):
+        """
+        Args:
+            detector: process(rgb_frame)로 MediaPipe 형식 detections를 돌려주는 얼굴 검출기
+            mode (str): 'register' 또는 'verify'
+            matcher (FaceMatcher, optional): 1:1 검증용 매처 (user_id가 있을 때 사용)
+            identifier (optional): 1:N 식별기 (best_match 제공, 기본값: matcher)
+            user_id (str, optional): 주장된 사용자 ID
+            reuse_detections (bool): MediaPipe 검출 박스를 인코딩에 그대로 사용할지 여부
+            max_wait (float): 품질 기준을 넘는 프레임이 없을 때 최대 대기 시간 (초)
+            encoder (callable): (rgb_frame, detections) -> 인코딩 리스트
+        """
+        self.detector = detector
+        self.mode = mode
+        self.matcher = matcher
+        self.identifier = identifier if identifier is not None else matcher
+        self.user_id = user_id
+        self.reuse_detections = reuse_detections
+        self.encoder = encoder
+        self.gate = FrameQualityGate(max_wait=max_wait)
+        self.reset()
+
+    def reset(self):
+        """
+        처음 상태로 되돌림 (재시도)
+        """
+        self.gate.reset()
+        self.state = SEARCHING
+        self.decision = None
+        self.frames = 0
+        self.last_detections = []  # 마지막으로 처리한 프레임의 얼굴 검출 결과
+        # 단계별 누적 소요 시간 (ms) - 감사 로그/벤치마크용
+        self.timings = {'detect_ms': 0.0, 'quality_ms': 0.0, 'encode_ms': 0.0, 'match_ms': 0.0}
+
+    @property
+    def done(self):
+        return self.state in (ACCEPTED, REJECTED)
+
+    def process(self, frame, now=None):
+        """
+        프레임 한 장 처리
+        Args:
+            frame (numpy.ndarray): BGR 프레임
+            now (float, optional): 현재 시각 (기본값: time.time())
+        Returns:
+            list: AuthEvent 리스트
+        """
+        if self.done:
+            return []
+        self.frames += 1
+
+        start = time.perf_counter()
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = self.detector.process(rgb_frame)
+        self.timings['detect_ms'] += (time.perf_counter() - start) * 1000
+        self.last_detections = results.detections or []
+        if not results.detections:
+            self.gate.reset()
+            self.state = SEARCHING
+            return []
+
+        events = []
+        if self.state == SEARCHING and self.mode == 'register':
+            events.append(AuthEvent('face_detected', 'info',
+                                    "얼굴이 감지되었습니다. 선명한 프레임이 잡히면 바로 캡처됩니다.", {}))
+        self.state = CAPTURING
+
+        # 품질 기준을 넘는 프레임(또는 시간 초과 시 최선의 프레임)만 인코딩
+        start = time.perf_counter()
+        candidate = self.gate.update(frame, rgb_frame, results.detections, now)
+        self.timings['quality_ms'] += (time.perf_counter() - start) * 1000
+        if candidate is None:
+            return events
+        events.extend(self._encode(candidate))
+        return events
+
+    def finish(self):
+        """
+        입력이 끝났을 때 호출 (업로드된 프레임 묶음 등) - 아직 결정 전이면 지금까지 본 가장 좋은 프레임으로 결정
+        Returns:
+            list: AuthEvent 리스트 (얼굴이 한 번도 검출되지 않았으면 빈 리스트)
+        """
+        if self.done or self.gate.best is None:
+            return []
+        candidate = self.gate.best
+        self.gate.reset()
+        return self._encode(candidate)
+
+    def _encode(self, candidate):
+        events = []
+        detections = candidate.detections if self.reuse_detections else None
+        start = time.perf_counter()
+        face_encodings = self.encoder(candidate.rgb_frame, detections)
+        self.timings['encode_ms'] += (time.perf_counter() - start) * 1000
+        if not face_encodings:
+            events.append(self._decide(False, 'warning', "얼굴이 감지되지 않았습니다. 다시 시도하세요.",
+                                       reason='no_encoding'))
+        elif self.mode == 'register':
+            events.append(self._decide(True, 'success', "얼굴이 성공적으로 등록되었습니다!",
+                                       encoding=face_encodings[0], frame=candidate.frame,
+                                       quality=candidate.quality))
+        else:
+            events.append(self._match(face_encodings[0]))
+        return events
+
+    def _match(self, face_encoding):
+        start = time.perf_counter()
+        if self.user_id is not None:
+            # 1:1 검증 - 주장된 사용자의 템플릿만 비교
+            matched, distance = self.matcher.verify(self.user_id, face_encoding)
+            name = self.user_id if matched else None
+        else:
+            # 1:N 식별 - 가장 가까운 등록 얼굴 선택
+            name, distance = self.identifier.best_match(face_encoding)
+        self.timings['match_ms'] += (time.perf_counter() - start) * 1000
+
+        if name is not None:
+            return self._decide(True, 'success', f"인증 성공! 얼굴: {name}", name=name, distance=distance)
+        return self._decide(False, 'error', "인증 실패! 등록된 얼굴이 없습니다.",
+                            reason='no_match', distance=distance)
+
+    def _decide(self, accepted, level, message, **data):
+        self.state = ACCEPTED if accepted else REJECTED
+        data['accepted'] = accepted
+        self.decision = data
+        return AuthEvent('decision', level, message, data)
+
+
+class GestureSequenceEngine:
+    """
+    UI에 의존하지 않는 제스처 시퀀스 입력 상태 머신
+    - idle -> recording(단계별 확정) -> accepted(모든 단계 인식) / rejected(인식 실패 단계 있음)
+    - process(frame, capture_ms)는 새 인식 결과로 단계를 진행하고, 인식기가 비어 있으면 프레임을 제출
+    - update(results)는 인식 결과만으로 진행하므로 인식기 없이 벤치마크 가능
+    - 저장/검증은 결정에 담긴 제스처 시퀀스로 호출한 쪽에서 수행
+    """
+
+    def __init__(self, recognizer=None, steps=3, commit_policy=None, inference_size=None, results=None):
+        """
+        Args:
+            recognizer: recognize_async와 listener 속성을 가진 LIVE_STREAM 인식기 (없으면 update만 사용)
+            steps (int): 입력할 제스처 수
+            commit_policy (GestureCommitPolicy, optional): 제스처 확정 정책
+            inference_size (tuple, optional): 인식용 (width, height) (기본값: 원본 해상도)
+            results (GestureResultBuffer, optional): 인식 결과 버퍼
+        """
+        self.steps = steps
+        self.commit_policy = commit_policy or GestureCommitPolicy()
+        self.results = results if results is not None else GestureResultBuffer()
+        self.pipeline = FramePipeline(inference_size)
+        self.submitter = RecognizerSubmitter(recognizer, self.on_result) if recognizer is not None else None
+        self.reset()
+
+    def reset(self):
+        """
+        처음 상태로 되돌림 (재등록/재시도)
+        """
+        self.state = IDLE
+        self.step = 0
+        self.gestures = []
+        self.decision = None
+        self.results.clear()
+        self.step_started = None
+        self.step_ms = []  # 단계별 시작부터 확정까지 걸린 시간 (ms)
+
+    @property
+    def done(self):
+        return self.state in (ACCEPTED, REJECTED)
+
+    @property
+    def current_gesture(self):
+        """
+        화면 표시용 가장 최근 제스처
+        """
+        latest = self.results.latest
+        return latest.category if latest else None
+
+    def on_result(self, result, output_image, timestamp_ms):
+        """
+        MediaPipe 제스처 인식 결과 콜백 (인식기 작업 스레드에서 호출)
+        - 결과를 버퍼에 쌓기만 하고, 집계는 process/update에서 한 번씩 수행
+        """
+        if result.gestures and result.gestures[0]:
+            top = result.gestures[0][0]
+            self.results.push(timestamp_ms, top.category_name, top.score)
+        else:
+            self.results.push(timestamp_ms, None, 0.0)
+
+    def start(self, now=None):
+        """
+        첫 단계 시작
+        Returns:
+            list: AuthEvent 리스트
+        """
+        self.reset()
+        self.state = RECORDING
+        self.step_started = time.time() if now is None else now
+        self.commit_policy.start(self.step_started)
+        return [AuthEvent('started', 'warning', "준비하세요!", {})]
+
+    def update(self, records, now=None):
+        """
+        새 인식 결과로 현재 단계 진행
+        Args:
+            records (list): GestureResult 리스트 (오래된 순)
+            now (float, optional): 현재 시각 (기본값: time.time())
+        Returns:
+            list: AuthEvent 리스트
+        """
+        if self.state != RECORDING:
+            return []
+
+        now = time.time() if now is None else now
+        commit = self.commit_policy.update(records, now)
+        if commit is None:
+            progress = int(self.commit_policy.progress * 100)
+            return [AuthEvent('progress', 'error', f"제스처 {self.step + 1} 인식중... {progress}%",
+                              {'step': self.step, 'progress': progress})]
+
+        events = []
+        self.gestures.append(commit.category)
+        self.step_ms.append((now - self.step_started) * 1000)
+        self.step_started = now
+        if commit.category is not None:
+            events.append(AuthEvent('step', 'success', f"제스처 {self.step + 1}번 완료!",
+                                    {'step': self.step, 'gesture': commit.category, 'reason': commit.reason}))
+        else:
+            events.append(AuthEvent('step', 'warning', f"제스처 {self.step + 1}번 인식 실패!",
+                                    {'step': self.step, 'gesture': None, 'reason': commit.reason}))
+        self.step += 1
+
+        # 다음 단계 바로 시작 또는 결정
+        if self.step < self.steps:
+            self.commit_policy.start(now, previous=commit.category)
+        elif all(gesture is not None for gesture in self.gestures):
+            self.state = ACCEPTED
+            self.decision = {'accepted': True, 'gestures': list(self.gestures)}
+            events.append(AuthEvent('decision', 'success', "모든 제스처가 완료되었습니다!", self.decision))
+        else:
+            self.state = REJECTED
+            self.decision = {'accepted': False, 'gestures': list(self.gestures)}
+            events.append(AuthEvent('decision', 'error',
+                                    "일부 제스처가 제대로 인식되지 않았습니다. 다시 시도해주세요.", self.decision))
+        return events
+
+    def process(self, frame, capture_ms, now=None):
+        """
+        프레임 한 장 처리
+        Args:
+            frame (numpy.ndarray): BGR 프레임
+            capture_ms (int): 프레임 캡처 시각 (monotonic ms)
+            now (float, optional): 현재 시각 (기본값: time.time())
+        Returns:
+            list: AuthEvent 리스트
+        """
+        # 지난 프레임 이후 새로 도착한 인식 결과 (각 결과는 한 번만 집계)
+        events = self.update(self.results.drain(), now)
+
+        # 인식기가 처리 중이면 이 프레임은 건너뛰고 다음 최신 프레임을 제출
+        if self.submitter is not None and not self.done and self.submitter.try_acquire():
+            image_rgb = self.pipeline.to_rgb(frame)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+            self.submitter.submit(mp_image, capture_ms)
+        return events
+
+    def stats(self):
+        """
+        Returns:
+            dict: 제출/드롭/완료 프레임 수 등 인식 처리량 통계
+        """
+        return self.submitter.stats() if self.submitter is not None else {}
+
+
+class HandFaceBinding:
+    """
+    제스처를 취한 손이 인증 중인 얼굴의 손인지 확인하는 기하 검사
+    - 얼굴 검출 박스와 손 랜드마크를 캡처 시각으로 짝지어 비교 (둘 다 프레임 기준 정규화 좌표)
+    - 같은 사람의 손이면 얼굴과 비슷한 거리에 있으므로 손바닥 길이(손목~중지 뿌리)가 얼굴 높이에 비례하고,
+      손목이 팔이 닿는 범위(얼굴 높이의 배수) 안에 있음
+    - 얼굴이 둘 이상 보이는 프레임의 손은 누구 손인지 알 수 없으므로 다른 사람 손으로 집계
+    - 자세 추정 없이 크기/거리만 보므로, 바로 옆에 같은 거리로 선 사람의 손까지 구분하지는 못함
+    """
+
+    def __init__(self, min_scale=0.25, max_scale=1.5, max_reach=4.0, max_skew_ms=150, min_observations=5,
+                 min_ratio=0.8, capacity=512):
+        """
+        Args:
+            min_scale (float): 얼굴 높이 대비 최소 손바닥 길이
+            max_scale (float): 얼굴 높이 대비 최대 손바닥 길이
+            max_reach (float): 얼굴 중심에서 손목까지 최대 거리 (얼굴 높이 배수)
+            max_skew_ms (int): 손 인식 결과와 짝지을 얼굴 검출의 최대 시각 차이 (ms)
+            min_observations (int): 판정에 필요한 최소 짝지어진 손 관측 수
+            min_ratio (float): 짝지어진 손 관측 중 인증 얼굴의 손으로 판정되어야 하는 비율
+            capacity (int): 보관할 최대 얼굴/손 관측 수
+        """
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.max_reach = max_reach
+        self.max_skew_ms = max_skew_ms
+        self.min_observations = min_observations
+        self.min_ratio = min_ratio
+        self.lock = threading.Lock()
+        self.faces = deque(maxlen=capacity)  # (timestamp_ms, [(cx, cy, height), ...])
+        self.hands = deque(maxlen=capacity)  # (timestamp_ms, 손목 (x, y), 중지 뿌리 (x, y))
+
+    def reset(self):
+        with self.lock:
+            self.faces.clear()
+            self.hands.clear()
+
+    def add_faces(self, timestamp_ms, detections, image_shape):
+        """
+        프레임 한 장의 얼굴 검출 결과 추가 (얼굴 작업 스레드에서 호출)
+        Args:
+            timestamp_ms (int): 프레임 캡처 시각 (ms)
+            detections (list): MediaPipe FaceDetection 결과의 detections (없으면 빈 리스트)
+            image_shape (tuple): 프레임 shape (height, width, ...)
+        """
+        # 가로/세로 비율이 다른 정규화 좌표를 높이 기준 단위로 맞춤
+        aspect = image_shape[1] / image_shape[0]
+        boxes = []
+        for detection in detections:
+            box = detection.location_data.relative_bounding_box
+            boxes.append(((box.xmin + box.width / 2) * aspect, box.ymin + box.height / 2, box.height))
+        with self.lock:
+            self.faces.append((timestamp_ms, boxes))
+
+    def add_hand(self, timestamp_ms, landmarks, image_shape):
+        """
+        제스처 인식 결과의 손 랜드마크 추가 (인식기 콜백 스레드에서 호출)
+        Args:
+            timestamp_ms (int): 인식한 프레임의 타임스탬프 (ms)
+            landmarks (list): 손 하나의 정규화 랜드마크 21개 (x, y 속성)
+            image_shape (tuple): 프레임 shape (height, width, ...)
+        """
+        aspect = image_shape[1] / image_shape[0]
+        wrist, middle = landmarks[0], landmarks[9]
+        with self.lock:
+            self.hands.append((timestamp_ms, (wrist.x * aspect, wrist.y), (middle.x * aspect, middle.y)))
+
+    def belongs(self, face, wrist, middle):
+        """
+        손 하나가 얼굴 하나의 손으로 볼 수 있는 크기/위치인지 여부
+        Args:
+            face (tuple): 얼굴 (중심 x, 중심 y, 높이)
+            wrist (tuple): 손목 좌표
+            middle (tuple): 중지 뿌리 좌표
+        Returns:
+            bool: 소유 판정
+        """
+        center_x, center_y, height = face
+        if height <= 0:
+            return False
+        scale = np.hypot(middle[0] - wrist[0], middle[1] - wrist[1]) / height
+        reach = np.hypot(wrist[0] - center_x, wrist[1] - center_y) / height
+        return self.min_scale <= scale <= self.max_scale and reach <= self.max_reach
+
+    def verdict(self):
+        """
+        지금까지의 관측으로 소유 판정
+        Returns:
+            HandBinding: 판정과 집계
+        """
+        with self.lock:
+            faces = list(self.faces)
+            hands = list(self.hands)
+        face_times = [timestamp for timestamp, _ in faces]
+        bound = foreign = unpaired = 0
+        for timestamp, wrist, middle in hands:
+            # 캡처 시각이 가장 가까운 얼굴 검출과 짝지음
+            index = bisect.bisect_left(face_times, timestamp)
+            nearest = min((i for i in (index - 1, index) if 0 <= i < len(faces)),
+                          key=lambda i: abs(face_times[i] - timestamp), default=None)
+            if nearest is None or abs(face_times[nearest] - timestamp) > self.max_skew_ms:
+                unpaired += 1
+                continue
+            boxes = faces[nearest][1]
+            if len(boxes) == 1 and self.belongs(boxes[0], wrist, middle):
+                bound += 1
+            elif boxes:
+                foreign += 1
+            else:
+                unpaired += 1
+        paired = bound + foreign
+        owned = paired >= self.min_observations and bound >= paired * self.min_ratio
+        return HandBinding(owned, len(hands), bound, foreign, unpaired)
+
+
+class CombinedAuthEngine:
+    """
+    얼굴 인증과 제스처 시퀀스 입력을 같은 프레임으로 동시에 진행하는 상태 머신
+    - 캡처 루프는 프레임마다 제스처 인식기에 제출하고(LIVE_STREAM 비동기), 얼굴 검출/인코딩은 얼굴 작업 스레드에 넘김
+      (얼굴 작업 스레드가 바쁘면 그 프레임은 얼굴 쪽만 건너뜀)
+    - 얼굴 결정이 먼저 나도 제스처가 끝날 때까지 얼굴 검출은 계속하여 손 소유 확인에 사용
+    - accepted: 얼굴 인증 성공 + 모든 제스처 단계 인식 + 제스처 손이 인증한 얼굴의 손
+      (제스처 시퀀스 일치 검증은 결정에 담긴 gestures로 호출한 쪽에서 수행)
+    - 얼굴 이벤트는 kind 앞에 'face_', 제스처 결정은 'gesture_decision'을 붙여 구분하고, 최종 결정만 'decision'
+    """
+
+    def __init__(self, face, gesture, binding=None, face_grace=3.0):
+        """
+        Args:
+            face (FaceAuthEngine): 검증 모드 얼굴 엔진
+            gesture (GestureSequenceEngine): 제스처 엔진 (인식기가 있으면 결과 콜백에서 손 랜드마크 수집)
+            binding (HandFaceBinding, optional): 손 소유 확인 (기본값: 기본 기준)
+            face_grace (float): 제스처가 끝난 뒤 얼굴 결정을 기다릴 최대 시간 (초)
+        """
+        self.face = face
+        self.gesture = gesture
+        self.binding = binding if binding is not None else HandFaceBinding()
+        self.face_grace = face_grace
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='combined-face')
+        self.pending = None  # 얼굴 작업 스레드에서 처리 중인 프레임
+        self.image_shape = None
+        if gesture.submitter is not None:
+            gesture.submitter.listener = self.on_gesture_result
+        self.reset()
+
+    def reset(self):
+        """
+        처음 상태로 되돌림 (재시도)
+        """
+        self.face.reset()
+        self.gesture.reset()
+        self.binding.reset()
+        self.state = IDLE
+        self.decision = None
+        self.gesture_done_at = None
+        self.face_missing = False
+        self.face_submitted = 0
+        self.face_skipped = 0
+
+    @property
+    def done(self):
+        return self.state in (ACCEPTED, REJECTED)
+
+    def on_gesture_result(self, result, output_image, timestamp_ms):
+        """
+        제스처 인식 결과 콜백 - 녹화 중이면 손 랜드마크를 소유 확인에 넘기고 제스처 엔진에 전달
+        """
+        if self.state == RECORDING and self.image_shape is not None and result.hand_landmarks:
+            self.binding.add_hand(timestamp_ms, result.hand_landmarks[0], self.image_shape)
+        self.gesture.on_result(result, output_image, timestamp_ms)
+
+    def start(self, now=None):
+        """
+        얼굴 인증과 첫 제스처 단계를 함께 시작
+        Returns:
+            list: AuthEvent 리스트
+        """
+        self.wait()
+        self.reset()
+        self.state = RECORDING
+        return self.gesture.start(now)
+
+    def _face_step(self, frame, capture_ms):
+        # 얼굴 작업 스레드 - 결정 전이면 엔진으로 처리, 결정 후에는 검출만 해서 손 소유 확인용 얼굴 위치 기록
+        if not self.face.done:
+            events = self.face.process(frame)
+            detections = self.face.last_detections
+            if not self.face.done and self.gesture_done_at is not None \
+                    and time.monotonic() - self.gesture_done_at >= self.face_grace:
+                # 제스처가 끝났는데 품질 기준을 넘는 프레임이 없으면 지금까지의 최선 프레임으로 결정
+                events.extend(self.face.finish())
+                self.face_missing = not self.face.done
+        else:
+            events = []
+            detections = self.face.detector.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).detections or []
+        self.binding.add_faces(capture_ms, detections, frame.shape)
+        return [event._replace(kind='face_' + event.kind) for event in events]
+
+    def process(self, frame, capture_ms, now=None):
+        """
+        프레임 한 장을 두 엔진에 공급
+        Args:
+            frame (numpy.ndarray): BGR 프레임 (얼굴 작업 스레드에는 복사본을 넘기므로 반환 뒤 버퍼를 재사용해도 됨)
+            capture_ms (int): 프레임 캡처 시각 (monotonic ms)
+            now (float, optional): 현재 시각 (기본값: time.time())
+        Returns:
+            list: AuthEvent 리스트
+        """
+        if self.done:
+            return []
+        self.image_shape = frame.shape
+        events = []
+        if self.pending is not None and self.pending.done():
+            events.extend(self.pending.result())
+            self.pending = None
+        if self.state == RECORDING:
+            if self.pending is None:
+                # 캡처 링 슬롯/브로커 공유 메모리는 곧 덮어써지므로 얼굴 작업 스레드에는 복사본을 넘김
+                self.pending = self.worker.submit(self._face_step, frame.copy(), capture_ms)
+                self.face_submitted += 1
+            else:
+                self.face_skipped += 1
+
+        for event in self.gesture.process(frame, capture_ms, now):
+            events.append(event._replace(kind='gesture_decision') if event.kind == 'decision' else event)
+        if self.gesture.done and self.gesture_done_at is None:
+            self.gesture_done_at = time.monotonic()
+        events.extend(self._decide_if_ready())
+        return events
+
+    def _decide_if_ready(self):
+        if self.state != RECORDING:
+            return []
+        if self.face.done and not self.face.decision['accepted']:
+            return [self._decide(False, 'error', "얼굴 인증에 실패했습니다.", 'face')]
+        if self.gesture.state == REJECTED:
+            return [self._decide(False, 'error', "일부 제스처가 제대로 인식되지 않았습니다. 다시 시도해주세요.",
+                                 'unrecognized_step')]
+        if self.face_missing:
+            return [self._decide(False, 'error', "얼굴이 감지되지 않았습니다. 다시 시도하세요.", 'no_face')]
+        if not (self.face.done and self.gesture.done):
+            return []
+        binding = self.binding.verdict()
+        if not binding.owned:
+            return [self._decide(False, 'error', "제스처를 취한 손이 인증한 얼굴의 손으로 확인되지 않았습니다.",
+                                 'hand_not_owned', binding)]
+        return [self._decide(True, 'success', "얼굴과 제스처 입력이 모두 완료되었습니다!", None, binding)]
+
+    def _decide(self, accepted, level, message, reason, binding=None):
+        self.state = ACCEPTED if accepted else REJECTED
+        self.decision = {
+            'accepted': accepted,
+            'reason': reason,
+            'face': self.face.decision,
+            'gestures': list(self.gesture.gestures),
+            'binding': (binding or self.binding.verdict())._asdict(),
+        }
+        return AuthEvent('decision', level, message, self.decision)
+
+    def wait(self):
+        """
+        얼굴 작업 스레드에서 처리 중인 프레임이 끝날 때까지 대기 (검출기 반납 전 호출)
+        """
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def close(self):
+        """
+        얼굴 작업 스레드 종료
+        """
+        self.worker.shutdown(wait=True)
+        self.pending = None
+
+    def stats(self):
+        """
+        Returns:
+            dict: 제스처 인식 처리량 통계 + 얼굴 작업 스레드에 넘긴/건너뛴 프레임 수
+        """
+        return dict(self.gesture.stats(), face_submitted=self.face_submitted, face_skipped=self.face_skipped)
@@ -0,0 +1,593 @@
+import argparse
+import base64
+import json
+import math
+import os
+import queue
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import cv2
+import mediapipe as mp
+import numpy as np
+from auth_engine import FaceAuthEngine, GestureSequenceEngine, encode_faces, ACCEPTED, REJECTED
+from audit import get_audit_log, SUCCESS, FAILURE, ERROR
+from encode_batcher import SERVICE_BATCH_MS, get_encoding_batcher
+from encode_executor import get_encoding_executor
+from face_matcher import FaceMatcher
+from face_store import FaceTemplateStore
+from gesture_store import UserGestureStore
+from model_pool import face_detector_pool, video_gesture_recognizer_pool
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY_BYTES = 32 << 20
+# 한 요청에 담을 수 있는 최대 프레임 수
+MAX_FRAMES = 300
+# 타임스탬프가 없는 프레임 묶음의 기본 FPS
+DEFAULT_FPS = 15.0
+# 허용하는 사용자 ID (얼굴 이미지 파일 이름으로 쓰이므로 경로 문자 불가)
+USER_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+# 업로드된 프레임 묶음 (images: 인코딩된 JPEG/PNG 바이트 리스트, timestamps_ms: 프레임별 촬영 시각)
+FrameBurst = namedtuple('FrameBurst', ['images', 'timestamps_ms'])
+
+
+def parse_burst(content_type, body, fps=DEFAULT_FPS):
+    """
+    요청 본문을 프레임 묶음으로 변환 (디코딩은 워커에서 수행)
+    - image/jpeg, image/png: 프레임 한 장
+    - application/json: {"frames": [base64 이미지, ...], "timestamps_ms": [...] (선택)}
+    Args:
+        content_type (str): 요청 Content-Type
+        body (bytes): 요청 본문
+        fps (float): timestamps_ms가 없을 때 프레임 간격을 정할 FPS
+    Returns:
+        FrameBurst: 프레임 묶음
+    Raises:
+        ValueError: 형식이 잘못되었거나 프레임이 없거나 너무 많은 경우, fps가 양의 유한한 수가 아닌 경우
+    """
+    if not math.isfinite(fps) or fps <= 0:
+        raise ValueError("fps는 0보다 큰 유한한 수여야 합니다.")
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('image/jpeg', 'image/png'):
+        images, timestamps = [body], None
+    elif content_type == 'application/json':
+        try:
+            payload = json.loads(body)
+            images = [base64.b64decode(frame) for frame in payload['frames']]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"프레임 묶음 형식이 잘못되었습니다: {e}")
+        timestamps = payload.get('timestamps_ms')
+    else:
+        raise ValueError("image/jpeg, image/png 또는 application/json 본문만 받습니다.")
+
+    if not images or len(images) > MAX_FRAMES:
+        raise ValueError(f"프레임은 1~{MAX_FRAMES}장이어야 합니다.")
+    if timestamps is None:
+        return FrameBurst(images, [int(index * 1000 / fps) for index in range(len(images))])
+    try:
+        timestamps = [int(timestamp) for timestamp in timestamps]
+    except (ValueError, TypeError):
+        raise ValueError("timestamps_ms는 정수 리스트여야 합니다.")
+    if len(timestamps) != len(images):
+        raise ValueError("timestamps_ms와 frames의 개수가 다릅니다.")
+    return FrameBurst(images, timestamps)
+
+
+def validate_user_id(user_id):
+    """
+    사용자 ID 형식 검사
+    Args:
+        user_id (str): 사용자 ID
+    Returns:
+        str: 검사한 사용자 ID
+    Raises:
+        ValueError: 영문/숫자/_/- 1~64자가 아닌 경우
+    """
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.fullmatch(user_id):
+        raise ValueError("user_id는 영문, 숫자, _, - 1~64자여야 합니다.")
+    return user_id
+
+
+def decode_burst(burst):
+    """
+    프레임 묶음 디코딩
+    Args:
+        burst (FrameBurst): 프레임 묶음
+    Returns:
+        list: (BGR 프레임, 타임스탬프 ms) 리스트
+    Raises:
+        ValueError: 이미지로 디코딩할 수 없는 프레임이 있는 경우
+    """
+    frames = []
+    for index, (data, timestamp_ms) in enumerate(zip(burst.images, burst.timestamps_ms)):
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"{index}번 프레임을 이미지로 디코딩할 수 없습니다.")
+        frames.append((image, timestamp_ms))
+    return frames
+
+
+class LockedMatcher:
+    """
+    등록과 조회가 동시에 일어나는 서비스용 매처
+    - FaceMatcher는 등록 시 행렬을 다시 만들므로 조회와 등록을 같은 잠금으로 직렬화
+    - FaceAuthEngine의 matcher/identifier로 그대로 사용
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.lock = threading.Lock()
+
+    def __contains__(self, user_id):
+        with self.lock:
+            return user_id in self.matcher.user_rows
+
+    def __len__(self):
+        return len(self.matcher)
+
+    def add(self, encoding, name):
+        with self.lock:
+            self.matcher.add(encoding, name)
+
+    def verify(self, user_id, probe, tolerance=None):
+        with self.lock:
+            return self.matcher.verify(user_id, probe, tolerance)
+
+    def best_match(self, probe, tolerance=None):
+        with self.lock:
+            return self.matcher.best_match(probe, tolerance)
+
+
+class AuthService:
+    """
+    화면 없는 얼굴/제스처 등록·인증 서비스
+    - 서버 카메라 대신 클라이언트가 올린 프레임(한 장 또는 짧은 묶음)을 기존 엔진에 그대로 넣음
+    - 요청은 workers개 스레드 풀에서 처리하고, 처리 중 + 대기 중 요청이 workers + max_queue를 넘으면 바로 거절
+    - 검출기/인식기는 프로세스 전역 모델 풀, dlib 인코딩은 배치 스케줄러/프로세스 풀을 공유
+    - 요청별 대기/처리 시간과 거절/시간 초과 수 집계
+    """
+
+    def __init__(self, faces_dir='registered_faces', gesture_db_path='./gesture_auth.db',
+                 model_path='gesture_recognizer.task', workers=4, max_queue=32, request_timeout=30.0,
+                 max_wait=2.0, audit=None, executor=None, batcher=None):
+        """
+        Args:
+            faces_dir (str): 등록 얼굴 이미지 디렉토리
+            gesture_db_path (str): 제스처 데이터베이스 경로 (users 테이블, 3단계)
+            model_path (str): 제스처 인식 모델 파일 경로
+            workers (int): 동시에 처리할 요청 수 (검출기/인식기 풀 크기와 같게 맞춤)
+            max_queue (int): 처리를 기다릴 수 있는 최대 요청 수
+            request_timeout (float): 요청 하나를 기다릴 최대 시간 (초)
+            max_wait (float): 품질 기준을 넘는 프레임이 없을 때 최대 대기 시간 (프레임 타임스탬프 기준, 초)
+            audit (AuditLog, optional): 등록/인증 시도 기록 (기본값: 프로세스 전역 감사 로그)
+            executor (EncodingExecutor, optional): dlib 인코딩 프로세스 풀 (기본값: 프로세스 전역 실행기)
+            batcher (EncodingBatcher, optional): 인코딩 배치 스케줄러 (기본값: 프로세스 전역, 배치 대기 SERVICE_BATCH_MS)
+        """
+        os.makedirs(faces_dir, exist_ok=True)
+        self.faces_dir = faces_dir
+        self.workers = workers
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+        self.max_wait = max_wait
+        self.audit = audit if audit is not None else get_audit_log()
+        self.executor = executor if executor is not None else get_encoding_executor()
+        self.batcher = batcher if batcher is not None else get_encoding_batcher(SERVICE_BATCH_MS)
+
+        if self.executor is not None:
+            store = FaceTemplateStore(faces_dir, encoder=self.executor.submit_file)
+        else:
+            store = FaceTemplateStore(faces_dir)
+        encodings, names = store.sync()
+        self.matcher = LockedMatcher(FaceMatcher(encodings, names, tolerance=0.4))
+        self.gesture_store = UserGestureStore(gesture_db_path)
+        self.face_detectors = face_detector_pool(model_selection=0, min_detection_confidence=0.8,
+                                                 max_size=workers)
+        self.gesture_recognizers = video_gesture_recognizer_pool(model_path, max_size=workers)
+
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='auth-worker')
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.active = 0  # 처리 중 + 대기 중 요청 수
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.enrolling = set()  # 등록 중인 ('face' | 'gesture', 사용자 ID) (중복 확인과 등록을 묶기 위해 self.lock으로 보호)
+        self.queue_wait_total = 0.0
+        self.service_total = 0.0
+
+    @property
+    def encoder(self):
+        # 엔진에 넘길 인코더 (배치 스케줄러 > 프로세스 풀 > 이 스레드)
+        if self.batcher is not None:
+            return self.batcher.encode
+        return self.executor.encode if self.executor is not None else encode_faces
+
+    def submit(self, handler, *args):
+        """
+        요청을 워커 풀에 넣음 (대기열이 가득 차면 기다리지 않고 거절)
+        Args:
+            handler (callable): 실행할 서비스 메서드
+            *args: 메서드 인자
+        Returns:
+            Future: 결과 dict를 돌려줄 Future
+        Raises:
+            queue.Full: 처리 중 + 대기 중 요청이 workers + max_queue개인 경우
+        """
+        with self.lock:
+            if self.active >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise queue.Full("요청 대기열이 가득 찼습니다.")
+            self.active += 1
+            self.submitted += 1
+        future = self.pool.submit(self._run, handler, args, time.perf_counter())
+        future.add_done_callback(self._release)
+        return future
+
+    def call(self, handler, *args):
+        """
+        요청을 넣고 결과를 기다림 (HTTP 요청 스레드에서 호출)
+        Raises:
+            queue.Full: 대기열이 가득 찬 경우
+            concurrent.futures.TimeoutError: request_timeout 안에 끝나지 않은 경우
+        """
+        future = self.submit(handler, *args)
+        try:
+            return future.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            with self.lock:
+                self.timed_out += 1
+            raise
+
+    def _run(self, handler, args, queued_at):
+        started = time.perf_counter()
+        try:
+            result = handler(*args)
+        finally:
+            finished = time.perf_counter()
+            with self.lock:
+                self.queue_wait_total += started - queued_at
+                self.service_total += finished - started
+        result['queue_ms'] = round((started - queued_at) * 1000, 1)
+        result['service_ms'] = round((finished - started) * 1000, 1)
+        return result
+
+    def _release(self, future):
+        with self.lock:
+            self.active -= 1
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def _run_face(self, mode, user_id, burst):
+        # 프레임을 타임스탬프 순서대로 넣고, 묶음이 끝나면 지금까지 본 가장 좋은 프레임으로 결정
+        frames = decode_burst(burst)
+        with self.face_detectors.lease() as detector:
+            engine = FaceAuthEngine(detector, mode=mode, matcher=self.matcher, user_id=user_id,
+                                    max_wait=self.max_wait, encoder=self.encoder)
+            for image, timestamp_ms in frames:
+                engine.process(image, now=timestamp_ms / 1000)
+                if engine.done:
+                    break
+            engine.finish()
+        return engine
+
+    def _record_face(self, action, subject, engine, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        stages = dict(engine.timings, frames=engine.frames)
+        decision = engine.decision or {'accepted': False, 'reason': 'no_face'}
+        self.audit.record('face', action, subject or decision.get('name'),
+                          SUCCESS if decision['accepted'] else FAILURE, decision.get('reason'), total_ms, stages)
+        return decision
+
+    def _face_path(self, user_id):
+        # 등록 이미지 경로 - 사용자 ID를 검사하고, 실제 경로가 faces_dir 바로 아래인지 확인
+        faces_dir = os.path.realpath(self.faces_dir)
+        path = os.path.realpath(os.path.join(faces_dir, f"{validate_user_id(user_id)}.jpg"))
+        if os.path.dirname(path) != faces_dir:
+            raise ValueError("user_id가 등록 디렉토리 밖을 가리킵니다.")
+        return path
+
+    def enroll_face(self, user_id, burst):
+        """
+        얼굴 등록 - 가장 좋은 프레임을 '{user_id}.jpg'로 저장하고 매처에 바로 추가
+        - 같은 사용자 ID의 등록이 동시에 들어오면 하나만 진행하고 나머지는 'exists'
+        Args:
+            user_id (str): 사용자 ID
+            burst (FrameBurst): 프레임 묶음
+        Returns:
+            dict: accepted, reason, frames, timings
+        Raises:
+            ValueError: 사용자 ID 형식이 잘못된 경우
+        """
+        path = self._face_path(user_id)
+        with self.lock:
+            if ('face', user_id) in self.enrolling or user_id in self.matcher:
+                return {'accepted': False, 'reason': 'exists'}
+            self.enrolling.add(('face', user_id))
+        try:
+            started = time.perf_counter()
+            engine = self._run_face('register', user_id, burst)
+            decision = self._record_face('register', user_id, engine, started)
+            if decision['accepted']:
+                cv2.imwrite(path, decision['frame'])
+                self.matcher.add(decision['encoding'], user_id)
+        finally:
+            with self.lock:
+                self.enrolling.discard(('face', user_id))
+        return {'accepted': decision['accepted'], 'reason': decision.get('reason'),
+                'frames': engine.frames, 'timings': engine.timings}
+
+    def verify_face(self, user_id, burst):
+        """
+        얼굴 인증 - user_id가 있으면 1:1 검증, 없으면 1:N 식별
+        Args:
+            user_id (str | None): 주장된 사용자 ID
+            burst (FrameBurst): 프레임 묶음
+        Returns:
+            dict: accepted, reason, name, distance, frames, timings
+        """
+        started = time.perf_counter()
+        engine = self._run_face('verify', user_id, burst)
+        decision = self._record_face('verify', user_id, engine, started)
+        distance = decision.get('distance')
+        return {'accepted': decision['accepted'], 'reason': decision.get('reason'), 'name': decision.get('name'),
+                'distance': None if distance is None else float(distance),
+                'frames': engine.frames, 'timings': engine.timings}
+
+    def _run_gestures(self, burst):
+        # 모든 프레임을 VIDEO 모드로 바로 인식하고, 프레임 타임스탬프를 시각으로 삼아 단계 진행
+        frames = decode_burst(burst)
+        engine = GestureSequenceEngine(steps=self.gesture_store.steps)
+        engine.start(now=frames[0][1] / 1000)
+        with self.gesture_recognizers.lease() as recognizer:
+            for image, timestamp_ms in frames:
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=engine.pipeline.to_rgb(image))
+                engine.on_result(recognizer.recognize(mp_image, timestamp_ms), None, timestamp_ms)
+                engine.update(engine.results.drain(), now=timestamp_ms / 1000)
+                if engine.done:
+                    break
+        return engine
+
+    def _record_gesture(self, action, user_id, outcome, reason, engine, started, **stages):
+        stages['steps_ms'] = [round(ms, 1) for ms in engine.step_ms]
+        self.audit.record('gesture', action, user_id, outcome, reason,
+                          (time.perf_counter() - started) * 1000, stages)
+        return {'accepted': outcome == SUCCESS, 'reason': reason, 'steps': engine.step}
+
+    @staticmethod
+    def _gesture_failure(engine):
+        # 결정 전에 묶음이 끝났으면 'incomplete', 인식하지 못한 단계가 있으면 'unrecognized_step'
+        return 'unrecognized_step' if engine.state == REJECTED else 'incomplete'
+
+    def enroll_gesture(self, user_id, burst):
+        """
+        제스처 시퀀스 등록
+        - 같은 사용자 ID의 등록이 동시에 들어오면 하나만 진행하고 나머지는 'exists' (save는 덮어쓰므로 먼저 예약)
+        Args:
+            user_id (str): 사용자 ID
+            burst (FrameBurst): 단계 수만큼의 제스처가 담긴 프레임 묶음
+        Returns:
+            dict: accepted, reason, steps
+        """
+        with self.lock:
+            if ('gesture', user_id) in self.enrolling:
+                return {'accepted': False, 'reason': 'exists'}
+            self.enrolling.add(('gesture', user_id))
+        try:
+            # 예약한 뒤에 확인하므로 확인과 저장 사이에 다른 등록이 끼어들 수 없음
+            if self.gesture_store.exists(user_id):
+                return {'accepted': False, 'reason': 'exists'}
+            started = time.perf_counter()
+            engine = self._run_gestures(burst)
+            if engine.state != ACCEPTED:
+                return self._record_gesture('register', user_id, FAILURE, self._gesture_failure(engine), engine,
+                                            started)
+            try:
+                self.gesture_store.save(user_id, engine.decision['gestures'])
+            except Exception:
+                self._record_gesture('register', user_id, ERROR, 'store', engine, started)
+                raise
+            return self._record_gesture('register', user_id, SUCCESS, None, engine, started)
+        finally:
+            with self.lock:
+                self.enrolling.discard(('gesture', user_id))
+
+    def verify_gesture(self, user_id, burst):
+        """
+        제스처 시퀀스 인증 (입력한 제스처는 응답에 담지 않음)
+        Args:
+            user_id (str): 사용자 ID
+            burst (FrameBurst): 프레임 묶음
+        Returns:
+            dict: accepted, reason, steps, name
+        """
+        started = time.perf_counter()
+        engine = self._run_gestures(burst)
+        if engine.state != ACCEPTED:
+            return self._record_gesture('verify', user_id, FAILURE, self._gesture_failure(engine), engine, started)
+        try:
+            matched, label = self.gesture_store.verify(user_id, engine.decision['gestures'])
+        except Exception:
+            self._record_gesture('verify', user_id, ERROR, 'store', engine, started)
+            raise
+        if matched is None:
+            return self._record_gesture('verify', user_id, FAILURE, 'unknown_subject', engine, started)
+        if not matched:
+            return self._record_gesture('verify', user_id, FAILURE, 'mismatch', engine, started)
+        result = self._record_gesture('verify', user_id, SUCCESS, None, engine, started)
+        result['name'] = label
+        return result
+
+    def stats(self):
+        """
+        Returns:
+            dict: 처리 중/대기 중 요청 수, 요청/거절/완료/실패/시간 초과 수, 평균 대기/처리 시간(ms), 처리량
+        """
+        with self.lock:
+            finished = self.completed + self.failed
+            elapsed = time.monotonic() - self.started_at
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'active': self.active,
+                'queued': max(0, self.active - self.workers),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timed_out': self.timed_out,
+                'avg_queue_ms': self.queue_wait_total / finished * 1000 if finished else 0.0,
+                'avg_service_ms': self.service_total / finished * 1000 if finished else 0.0,
+                'requests_per_sec': finished / elapsed if elapsed > 0 else 0.0,
+                'enrolled_faces': len(self.matcher),
+            }
+
+    def close(self):
+        """
+        처리 중인 요청을 마치고 워커 종료
+        """
+        self.pool.shutdown(wait=True)
+
+
+class AuthRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP 엔드포인트
+    - POST /face/enroll?user_id=, /face/verify[?user_id=], /gesture/enroll?user_id=, /gesture/verify?user_id=
+      (본문: JPEG/PNG 한 장 또는 JSON 프레임 묶음, fps 쿼리로 타임스탬프 없는 묶음의 간격 지정)
+    - GET /health, /stats
+    - 대기열이 가득 차면 503 + Retry-After, 시간 초과는 504, 이미 등록된 사용자는 409, 잘못된 user_id는 400
+    """
+
+    protocol_version = 'HTTP/1.1'
+    routes = {
+        '/face/enroll': ('enroll_face', True),
+        '/face/verify': ('verify_face', False),
+        '/gesture/enroll': ('enroll_gesture', True),
+        '/gesture/verify': ('verify_gesture', True),
+    }
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif path == '/stats':
+            self.send_json(200, self.server.service.stats())
+        else:
+            self.send_json(404, {'error': 'not_found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        route = self.routes.get(url.path)
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # 음수면 rfile.read(-1)이 keep-alive 연결에서 끝없이 기다림
+            self.close_connection = True
+            self.send_json(400, {'error': 'Content-Length가 잘못되었습니다.'})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_json(413, {'error': 'body_too_large'})
+            return
+        body = self.rfile.read(length)
+        if route is None:
+            self.send_json(404, {'error': 'not_found'})
+            return
+
+        method, needs_user = route
+        params = parse_qs(url.query)
+        user_id = params.get('user_id', [None])[0]
+        if needs_user and not user_id:
+            self.send_json(400, {'error': 'user_id가 필요합니다.'})
+            return
+
+        service = self.server.service
+        try:
+            if user_id is not None:
+                validate_user_id(user_id)
+            fps = float(params.get('fps', [DEFAULT_FPS])[0])
+            burst = parse_burst(self.headers.get('Content-Type'), body, fps)
+            result = service.call(getattr(service, method), user_id, burst)
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+        except queue.Full:
+            self.send_json(503, {'error': 'busy'}, {'Retry-After': '1'})
+        except FutureTimeoutError:
+            self.send_json(504, {'error': 'timeout'})
+        except Exception as e:
+            self.send_json(500, {'error': str(e)})
+        else:
+            self.send_json(409 if result.get('reason') == 'exists' else 200, result)
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 부하 테스트 중 요청마다 stderr에 쓰지 않도록 access_log가 켜진 경우만 출력
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+def make_server(service, host='127.0.0.1', port=8080, access_log=False):
+    """
+    서비스를 감싼 HTTP 서버 생성 (연결마다 스레드 하나, 실제 처리는 서비스 워커 풀)
+    Args:
+        service (AuthService): 등록/인증 서비스
+        host (str): 바인딩 주소
+        port (int): 포트 (0이면 임의 포트)
+        access_log (bool): 요청마다 접근 로그 출력 여부
+    Returns:
+        ThreadingHTTPServer: 서버 (serve_forever로 실행)
+    """
+    server = ThreadingHTTPServer((host, port), AuthRequestHandler)
+    server.service = service
+    server.access_log = access_log
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴/제스처 등록·인증 HTTP 서비스")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=4, help="동시에 처리할 요청 수")
+    parser.add_argument('--max-queue', type=int, default=32, help="처리를 기다릴 수 있는 최대 요청 수")
+    parser.add_argument('--timeout', type=float, default=30.0, help="요청 하나를 기다릴 최대 시간 (초)")
+    parser.add_argument('--faces-dir', default='registered_faces')
+    parser.add_argument('--db', default='./gesture_auth.db', help="제스처 데이터베이스 경로")
+    parser.add_argument('--model', default='gesture_recognizer.task', help="제스처 인식 모델 파일 경로")
+    parser.add_argument('--access-log', action='store_true')
+    args = parser.parse_args()
+
+    service = AuthService(args.faces_dir, args.db, args.model, workers=args.workers, max_queue=args.max_queue,
+                          request_timeout=args.timeout)
+    server = make_server(service, args.host, args.port, args.access_log)
+    print(f"listening on http://{args.host}:{server.server_address[1]} "
+          f"({args.workers} workers, queue {args.max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+근사 최근접 이웃 인덱스 벤치마크
+- 합성 얼굴 템플릿(신원별 중심 + 잡음)으로 IVF-Flat과 정밀 매처(FaceMatcher)를 비교
+- nprobe별 recall@1과 질의당 지연 시간(p50/p99)을 출력
+
+실행 예:
+    python bench_ann.py --sizes 100000 1000000 --nprobe 1 4 8 16 32
+"""
+import argparse
+import time
+import numpy as np
+from ann_index import IVFFlatIndex
+from face_matcher import FaceMatcher, ENCODING_DIM
+
+
+def make_templates(count, rng, templates_per_identity=4, spread=0.15):
+    """
+    합성 템플릿 생성 - 신원마다 무작위 중심을 두고 그 주변에 템플릿 배치
+    Returns:
+        numpy.ndarray: (count, 128) float32
+    """
+    identities = max(1, count // templates_per_identity)
+    centers = rng.normal(scale=0.1, size=(identities, ENCODING_DIM)).astype(np.float32)
+    labels = rng.integers(0, identities, count)
+    noise = rng.normal(scale=spread / np.sqrt(ENCODING_DIM), size=(count, ENCODING_DIM)).astype(np.float32)
+    return centers[labels] + noise
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+def time_queries(search, queries):
+    """
+    질의를 하나씩 실행하며 지연 시간 측정
+    Returns:
+        tuple: (결과 리스트, 질의별 소요 시간 배열)
+    """
+    results = []
+    latencies = np.empty(len(queries))
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies[i] = time.perf_counter() - start
+    return results, latencies
+
+
+def run(size, args, rng):
+    data = make_templates(size, rng)
+    names = [str(i) for i in range(size)]
+    picks = rng.integers(0, size, args.queries)
+    queries = data[picks] + rng.normal(scale=0.05 / np.sqrt(ENCODING_DIM),
+                                       size=(args.queries, ENCODING_DIM)).astype(np.float32)
+
+    matcher = FaceMatcher(data, names)
+    exact, exact_latency = time_queries(lambda q: matcher.identify(q, k=1)[0][0], queries)
+    print(f"\n[{size:,} templates] exact: p50 {percentile_ms(exact_latency, 50):.2f} ms, "
+          f"p99 {percentile_ms(exact_latency, 99):.2f} ms")
+
+    nlist = args.nlist or int(4 * np.sqrt(size))
+    index = IVFFlatIndex(nlist=nlist, train_threshold=size + 1)
+    start = time.perf_counter()
+    index.add_many(data, names)
+    index.train(iterations=args.iterations)
+    print(f"  IVF nlist={nlist}: build {time.perf_counter() - start:.1f} s")
+
+    for nprobe in args.nprobe:
+        approx, latency = time_queries(lambda q: index.search(q, k=1, nprobe=nprobe)[0], queries)
+        hits = sum(1 for got, want in zip(approx, exact) if len(got) and names[got[0]] == want)
+        print(f"  nprobe={nprobe:<4d} recall@1 {hits / len(queries):.4f}  "
+              f"p50 {percentile_ms(latency, 50):.2f} ms  p99 {percentile_ms(latency, 99):.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF-Flat vs 정밀 매처 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--nlist', type=int, default=None, help="기본값: 4 * sqrt(N)")
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        run(size, args, rng)
+
+
+if __name__ == '__main__':
+    main()
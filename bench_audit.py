@@ -0,0 +1,134 @@
+"""
+감사 로그 벤치마크
+- 인증 경로에서 기록 한 건에 드는 시간: 버퍼형(AuditLog.record) vs 이벤트마다 동기 INSERT+커밋
+- 백그라운드 배치 기록 처리량 (이벤트/초)
+- 시간별 성공률/지연 조회: 집계 테이블(AuditLog.hourly) vs 원본 행 GROUP BY
+
+실행 예:
+    python bench_audit.py --events 50000 --threads 1 4
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+from audit import AuditLog, INSERT_EVENT_SQL, SUCCESS, FAILURE
+from db import ConnectionPool
+
+RAW_HOURLY_SQL = """
+    SELECT CAST(ts / 3600 AS INTEGER) * 3600 AS hour, kind, action, COUNT(*),
+           SUM(outcome = 'success'), AVG(total_ms), MAX(total_ms)
+    FROM auth_events WHERE ts >= ? GROUP BY hour, kind, action
+"""
+
+
+def make_events(count, seed):
+    rng = np.random.default_rng(seed)
+    kinds = ['face', 'gesture', 'file_gesture']
+    events = []
+    for i in range(count):
+        success = rng.random() < 0.8
+        events.append((kinds[i % 3], 'verify', f"user_{rng.integers(1000)}", SUCCESS if success else FAILURE,
+                       None if success else 'mismatch', float(rng.gamma(4.0, 500.0)),
+                       {'steps_ms': [float(x) for x in rng.gamma(4.0, 150.0, size=3)]}))
+    return events
+
+
+def timed_threads(threads, work):
+    latencies = [[] for _ in range(threads)]
+    workers = [threading.Thread(target=work, args=(i, latencies[i])) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, np.concatenate([np.asarray(values) for values in latencies]) * 1e6
+
+
+def bench_record(directory, threads, events):
+    log = AuditLog(os.path.join(directory, f'buffered_{threads}.db'))
+    per_thread = len(events) // threads
+
+    def work(index, latencies):
+        for event in events[index * per_thread:(index + 1) * per_thread]:
+            start = time.perf_counter()
+            log.record(*event)
+            latencies.append(time.perf_counter() - start)
+
+    elapsed, samples = timed_threads(threads, work)
+    start = time.perf_counter()
+    log.close()
+    drain = time.perf_counter() - start
+    stats = log.stats()
+    print(f"  buffered {threads:2d} threads  record p50 {np.percentile(samples, 50):6.2f} us  "
+          f"p99 {np.percentile(samples, 99):6.2f} us  ({threads * per_thread / elapsed:9.0f} events/s)  "
+          f"flushes {stats['flushes']}  avg batch {stats['avg_flush_ms']:.1f} ms  final drain {drain * 1000:.1f} ms")
+
+
+def bench_sync(directory, threads, events):
+    # 인증 요청 스레드에서 바로 INSERT하고 커밋하는 방식
+    path = os.path.join(directory, f'sync_{threads}.db')
+    AuditLog(path).close()
+    pool = ConnectionPool(path)
+    per_thread = len(events) // threads
+
+    def work(index, latencies):
+        for kind, action, subject, outcome, reason, total_ms, stages in events[index * per_thread:(index + 1) * per_thread]:
+            start = time.perf_counter()
+            with pool.transaction() as conn:
+                conn.execute(INSERT_EVENT_SQL, (time.time(), kind, action, subject, outcome, reason, total_ms,
+                                                str(stages)))
+            latencies.append(time.perf_counter() - start)
+
+    elapsed, samples = timed_threads(threads, work)
+    print(f"  sync     {threads:2d} threads  record p50 {np.percentile(samples, 50):6.2f} us  "
+          f"p99 {np.percentile(samples, 99):6.2f} us  ({threads * per_thread / elapsed:9.0f} events/s)")
+    pool.close()
+
+
+def bench_query(directory, rows, hours):
+    # 지난 hours시간에 고르게 퍼진 rows개 이벤트를 기록해 두고 조회 비용 비교
+    log = AuditLog(os.path.join(directory, 'query.db'), flush_interval=3600)
+    events = make_events(rows, 1)
+    now = time.time()
+    timestamps = now - np.random.default_rng(2).random(rows) * hours * 3600
+    for ts, event in zip(timestamps, events):
+        log.buffer.append((float(ts), *event))
+    start = time.perf_counter()
+    log.flush()
+    flush_elapsed = time.perf_counter() - start
+
+    since = now - hours * 3600
+    start = time.perf_counter()
+    rollup = log.hourly(since)
+    rollup_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    raw = log.pool.fetchall(RAW_HOURLY_SQL, (since,))
+    raw_ms = (time.perf_counter() - start) * 1000
+    print(f"  {rows} events over {hours}h: batch write {rows / flush_elapsed:9.0f} events/s")
+    print(f"  hourly success rate/latency  rollup {rollup_ms:7.2f} ms ({len(rollup)} rows)  "
+          f"raw scan {raw_ms:7.2f} ms ({len(raw)} rows)")
+    log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="버퍼형 감사 로그 vs 동기 기록")
+    parser.add_argument('--events', type=int, default=20000, help="기록 측정 이벤트 수")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--query-rows', type=int, default=500000, help="조회 측정용 이벤트 수")
+    parser.add_argument('--hours', type=int, default=24 * 7)
+    args = parser.parse_args()
+
+    events = make_events(args.events, 0)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{args.events} events")
+        for threads in args.threads:
+            bench_record(directory, threads, events)
+            bench_sync(directory, threads, events)
+        bench_query(directory, args.query_rows, args.hours)
+
+
+if __name__ == '__main__':
+    main()
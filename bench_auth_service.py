@@ -0,0 +1,147 @@
+"""
+HTTP 인증 서비스 부하 테스트
+- 여러 클라이언트 스레드가 동시에 프레임(한 장 또는 묶음)을 올려 등록/인증 엔드포인트 호출
+- 응답 상태별 개수(200/409/503/504 등), 처리량, 지연 p50/p99와 서버 /stats 출력
+- --serve면 같은 프로세스에서 서비스를 띄운 뒤 측정 (없으면 --url의 서버에 요청)
+
+실행 예:
+    python auth_service.py --workers 4 --max-queue 16
+    python bench_auth_service.py --endpoint /face/verify --source registered_faces --clients 32
+    python bench_auth_service.py --serve --endpoint /face/verify --source synthetic --burst 10 --clients 16
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+import cv2
+import numpy as np
+from frame_source import ImageDirectorySource, SyntheticSource
+
+
+def load_frames(source, count):
+    """
+    올릴 프레임을 JPEG 바이트로 미리 인코딩 (측정에서 클라이언트 인코딩 비용 제외)
+    """
+    frame_source = ImageDirectorySource(source) if os.path.isdir(source) else SyntheticSource(count=count)
+    frame_source.start()
+    frames = []
+    for frame in iter(frame_source.read_frame, None):
+        ok, encoded = cv2.imencode('.jpg', frame.image, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+        if ok:
+            frames.append(encoded.tobytes())
+        if len(frames) >= count:
+            break
+    frame_source.release()
+    return frames
+
+
+def build_body(frames, start, burst, fps):
+    # burst가 1이면 JPEG 한 장, 아니면 JSON 프레임 묶음
+    if burst == 1:
+        return 'image/jpeg', frames[start % len(frames)]
+    chunk = [frames[(start + i) % len(frames)] for i in range(burst)]
+    payload = {
+        'frames': [base64.b64encode(data).decode('ascii') for data in chunk],
+        'timestamps_ms': [int(i * 1000 / fps) for i in range(burst)],
+    }
+    return 'application/json', json.dumps(payload).encode('ascii')
+
+
+def run(url, endpoint, frames, clients, requests, burst, fps, user):
+    parsed = urlparse(url)
+    statuses = [Counter() for _ in range(clients)]
+    latencies = [[] for _ in range(clients)]
+
+    def client(index):
+        # 클라이언트마다 연결 하나를 유지 (keep-alive)
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=120)
+        for i in range(requests):
+            content_type, body = build_body(frames, index * requests + i, burst, fps)
+            user_id = user.format(client=index, request=i) if user else None
+            path = endpoint + (f"?user_id={user_id}" if user_id else '')
+            start = time.perf_counter()
+            try:
+                connection.request('POST', path, body, {'Content-Type': content_type})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=120)
+                status = 'error'
+            latencies[index].append(time.perf_counter() - start)
+            statuses[index][status] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(statuses, Counter()), np.concatenate([np.asarray(values) for values in latencies]) * 1000
+
+
+def fetch_stats(url):
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
+    connection.request('GET', '/stats')
+    stats = json.loads(connection.getresponse().read())
+    connection.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 인증 서비스 동시 요청 부하 테스트")
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--endpoint', default='/face/verify',
+                        choices=['/face/enroll', '/face/verify', '/gesture/enroll', '/gesture/verify'])
+    parser.add_argument('--source', default='synthetic', help="이미지 디렉토리 또는 synthetic")
+    parser.add_argument('--clients', type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument('--requests', type=int, default=10, help="클라이언트당 요청 수")
+    parser.add_argument('--burst', type=int, default=1, help="요청당 프레임 수")
+    parser.add_argument('--fps', type=float, default=15.0, help="프레임 묶음 타임스탬프 간격")
+    parser.add_argument('--user', default=None,
+                        help="user_id 형식 (예: 'load-{client}-{request}', 없으면 1:N 식별)")
+    parser.add_argument('--serve', action='store_true', help="같은 프로세스에서 서비스 실행")
+    parser.add_argument('--workers', type=int, default=4, help="--serve일 때 서비스 워커 수")
+    parser.add_argument('--max-queue', type=int, default=16, help="--serve일 때 대기열 크기")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.serve:
+        from auth_service import AuthService, make_server
+        service = AuthService(workers=args.workers, max_queue=args.max_queue)
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    frames = load_frames(args.source, max(args.burst, 30))
+    print(f"{args.endpoint}: {args.clients} clients x {args.requests} requests, {args.burst} frame(s)/request, "
+          f"{len(frames[0]) // 1024} KiB/frame")
+    elapsed, statuses, samples = run(url, args.endpoint, frames, args.clients, args.requests, args.burst,
+                                     args.fps, args.user)
+    ok = statuses.get(200, 0) + statuses.get(409, 0)
+    print(f"  {args.clients * args.requests / elapsed:7.1f} req/s offered-and-answered, "
+          f"{ok / elapsed:7.1f} req/s served  p50 {np.percentile(samples, 50):8.1f} ms  "
+          f"p99 {np.percentile(samples, 99):8.1f} ms")
+    print(f"  status {dict(sorted(statuses.items(), key=str))}")
+    stats = fetch_stats(url)
+    print(f"  server: avg queue {stats['avg_queue_ms']:.1f} ms, avg service {stats['avg_service_ms']:.1f} ms, "
+          f"rejected {stats['rejected']}, timed out {stats['timed_out']}")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
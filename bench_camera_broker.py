@@ -0,0 +1,98 @@
+"""
+카메라 브로커 벤치마크
+- 단계 전환 비용: 장치를 직접 열고 닫을 때와 브로커를 구독/해지할 때 첫 프레임까지 걸리는 시간 비교
+- 동시 구독: 해상도/FPS가 다른 구독자 프로세스 여러 개가 같은 장치에서 받은 FPS, 프레임 나이, 건너뛴 프레임 수
+- 카메라가 없으면 --device synthetic (브로커가 합성 프레임을 실시간으로 공급)
+
+실행 예:
+    python bench_camera_broker.py --device synthetic --consumers 640x480@30 320x240@15 160x120@5
+    python bench_camera_broker.py --device 0 --switches 5 --seconds 10
+"""
+import argparse
+import multiprocessing
+import time
+import numpy as np
+from camera_broker import BrokerCapture, connect_broker
+from frame_source import ThreadedCapture
+
+
+def parse_consumer(spec):
+    # '320x240@15' -> (320, 240, 15.0), 'native@30' -> (None, None, 30.0)
+    size, _, fps = spec.partition('@')
+    width, height = (None, None) if size == 'native' else (int(value) for value in size.lower().split('x'))
+    return width, height, float(fps) if fps else None
+
+
+def first_frame_ms(open_capture):
+    # 캡처를 열어 첫 프레임을 받을 때까지 걸린 시간 (ms)
+    start = time.perf_counter()
+    capture = open_capture()
+    frame = capture.read_frame(timeout=5.0) if capture.isOpened() else None
+    elapsed = (time.perf_counter() - start) * 1000
+    capture.release()
+    return elapsed if frame is not None else float('nan')
+
+
+def consume(device, width, height, fps, seconds, results):
+    # 구독자 프로세스 하나 - seconds초 동안 읽고 통계를 돌려줌
+    capture = BrokerCapture(device, width, height, fps).start()
+    shape = None
+    deadline = time.monotonic() + seconds
+    while capture.isOpened() and time.monotonic() < deadline:
+        frame = capture.read_frame()
+        if frame is not None:
+            shape = frame.image.shape
+    stats = capture.stats()
+    capture.release()
+    results.put((width, height, fps, shape, stats, seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카메라 브로커 단계 전환 비용과 동시 구독 성능")
+    parser.add_argument('--device', default='synthetic', help="카메라 번호, 비디오 파일 경로 또는 synthetic")
+    parser.add_argument('--consumers', nargs='+', default=['native@30', '320x240@15', '320x240@15', '160x120@5'],
+                        help="구독자별 WxH@FPS (native는 원본 해상도)")
+    parser.add_argument('--seconds', type=float, default=5.0, help="동시 구독 측정 시간 (초)")
+    parser.add_argument('--switches', type=int, default=3, help="단계 전환(열기/닫기) 반복 횟수")
+    args = parser.parse_args()
+    device = int(args.device) if args.device.isdigit() else args.device
+
+    # 단계 전환: 직접 열기는 카메라 번호일 때만 의미 있음
+    if isinstance(device, int):
+        direct = [first_frame_ms(lambda: ThreadedCapture(device).start()) for _ in range(args.switches)]
+        print(f"direct open -> first frame  avg {np.nanmean(direct):7.1f} ms")
+    cold = first_frame_ms(lambda: BrokerCapture(device).start())
+    # 브로커를 붙잡아 두는 구독자 하나 (다른 페이지가 카메라를 쓰는 상황)
+    holder = BrokerCapture(device).start()
+    warm = [first_frame_ms(lambda: BrokerCapture(device).start()) for _ in range(args.switches)]
+    print(f"broker cold start -> first frame   {cold:7.1f} ms")
+    print(f"broker attach -> first frame  avg {np.nanmean(warm):7.1f} ms")
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    consumers = [parse_consumer(spec) for spec in args.consumers]
+    processes = [context.Process(target=consume, args=(device, width, height, fps, args.seconds, results))
+                 for width, height, fps in consumers]
+    for process in processes:
+        process.start()
+    print(f"{len(processes)} concurrent consumers for {args.seconds:g} s")
+    for _ in processes:
+        width, height, fps, shape, stats, seconds = results.get()
+        size = f"{shape[1]}x{shape[0]}" if shape else '-'
+        requested = f"{fps:g}" if fps else 'all'
+        print(f"  {size:>9} @ {requested:>3} fps  delivered {stats['delivered'] / seconds:5.1f} fps  "
+              f"age avg {stats['avg_age_ms']:5.1f} ms  skipped {stats['skipped']:4d}  attach {stats['attach_ms']:5.1f} ms")
+    for process in processes:
+        process.join()
+
+    connection = connect_broker(device, spawn=False)
+    connection.send(('stats',))
+    _, stats = connection.recv()
+    connection.close()
+    holder.release()
+    print(f"broker: capture {stats['capture_fps']:.1f} fps, device opened {stats['opened']} time(s), "
+          f"avg open {stats['avg_open_ms']:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+얼굴 + 제스처 동시 인증 벤치마크
+- 순차: 얼굴 인증을 끝까지 진행하고 카메라를 다시 연 뒤(--reopen-ms) 제스처 인증 시작 (기존 로그인 흐름)
+- 동시: 같은 캡처 루프에서 제스처를 입력하는 동안 얼굴 작업 스레드가 얼굴을 인증
+- 두 방식의 2단계 인증 총 시간과 얼굴/제스처 결정 시각, 손 소유 확인 집계 출력
+- 모델 대신 합성 검출기/인식기/인코더 사용 (인식기는 LIVE_STREAM처럼 별도 스레드에서 콜백,
+  제스처는 입력 시작부터의 시간표로 결정, --foreign-hand면 얼굴과 크기가 맞지 않는 손을 돌려줌)
+
+실행 예:
+    python bench_combined_auth.py --runs 3
+    python bench_combined_auth.py --encode-ms 150 --reopen-ms 500
+    python bench_combined_auth.py --foreign-hand
+"""
+import argparse
+import queue
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+from auth_engine import CombinedAuthEngine, FaceAuthEngine, GestureSequenceEngine, ACCEPTED
+from face_matcher import FaceMatcher
+from frame_source import SyntheticSource
+
+# 합성 사용자가 순서대로 취하는 제스처
+GESTURES = ['Victory', 'Open_Palm', 'Thumb_Up']
+
+
+class SyntheticDetector:
+    """
+    프레임 가운데 얼굴 하나를 돌려주는 합성 검출기
+    """
+
+    def __init__(self, cost_ms):
+        self.cost = cost_ms / 1000
+        box = SimpleNamespace(xmin=0.3, ymin=0.15, width=0.35, height=0.5)
+        self.results = SimpleNamespace(detections=[
+            SimpleNamespace(location_data=SimpleNamespace(relative_bounding_box=box), score=[0.99])])
+
+    def process(self, rgb_frame):
+        time.sleep(self.cost)
+        return self.results
+
+
+class SyntheticRecognizer:
+    """
+    LIVE_STREAM 인식기 흉내 - 작업 스레드에서 cost_ms 뒤 listener 호출
+    - 제스처는 begin()으로 정한 입력 시작 시각부터 hold초 유지, gap초 손을 내리는 시간표로 결정
+    """
+
+    def __init__(self, cost_ms, hold, gap, palm):
+        self.cost = cost_ms / 1000
+        self.hold = hold
+        self.gap = gap
+        self.listener = None
+        self.started_ms = None
+        # 손목은 얼굴 아래, 중지 뿌리는 손목 위 palm(프레임 높이 비율)만큼
+        wrist = SimpleNamespace(x=0.45, y=0.85)
+        middle = SimpleNamespace(x=0.45, y=0.85 - palm)
+        self.landmarks = [wrist] * 9 + [middle] + [wrist] * 11
+        self.queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def begin(self, started_ms):
+        self.started_ms = started_ms
+
+    def recognize_async(self, image, timestamp_ms):
+        self.queue.put(timestamp_ms)
+
+    def _run(self):
+        while True:
+            timestamp_ms = self.queue.get()
+            time.sleep(self.cost)
+            step, offset = divmod((timestamp_ms - self.started_ms) / 1000, self.hold + self.gap) \
+                if self.started_ms is not None else (len(GESTURES), 0.0)
+            if offset >= self.hold or step >= len(GESTURES):
+                result = SimpleNamespace(gestures=[], hand_landmarks=[])
+            else:
+                top = SimpleNamespace(category_name=GESTURES[int(step)], score=0.9)
+                result = SimpleNamespace(gestures=[[top]], hand_landmarks=[self.landmarks])
+            self.listener(result, None, timestamp_ms)
+
+
+def make_face_engine(args, matcher):
+    encoding = matcher.matrix[0].astype(np.float64)
+
+    def encoder(rgb_frame, detections):
+        time.sleep(args.encode_ms / 1000)
+        return [encoding]
+
+    return FaceAuthEngine(SyntheticDetector(args.detect_ms), mode='verify', matcher=matcher, user_id='bench',
+                          encoder=encoder)
+
+
+def run_sequential(args, source, matcher):
+    # 얼굴 인증을 끝까지 진행한 뒤 카메라를 다시 열고 제스처 인증
+    started = time.monotonic()
+    face = make_face_engine(args, matcher)
+    while not face.done:
+        face.process(source.read_frame().image)
+    face_at = time.monotonic() - started
+    time.sleep(args.reopen_ms / 1000)
+
+    recognizer = SyntheticRecognizer(args.infer_ms, args.hold, args.gap, args.palm)
+    gesture = GestureSequenceEngine(recognizer, steps=len(GESTURES), inference_size=(320, 240))
+    gesture.start()
+    recognizer.begin(int(time.monotonic() * 1000))
+    while not gesture.done:
+        captured = source.read_frame()
+        gesture.process(captured.image, int(captured.timestamp * 1000))
+    total = time.monotonic() - started
+    accepted = face.decision['accepted'] and gesture.state == ACCEPTED
+    return total, face_at, total, accepted, None
+
+
+def run_combined(args, source, matcher):
+    # 같은 프레임으로 얼굴 인증과 제스처 입력을 동시에 진행
+    started = time.monotonic()
+    recognizer = SyntheticRecognizer(args.infer_ms, args.hold, args.gap, args.palm)
+    gesture = GestureSequenceEngine(recognizer, steps=len(GESTURES), inference_size=(320, 240))
+    engine = CombinedAuthEngine(make_face_engine(args, matcher), gesture)
+    engine.start()
+    recognizer.begin(int(time.monotonic() * 1000))
+    face_at = gesture_at = None
+    while not engine.done:
+        captured = source.read_frame()
+        engine.process(captured.image, int(captured.timestamp * 1000))
+        if face_at is None and engine.face.done:
+            face_at = time.monotonic() - started
+        if gesture_at is None and gesture.done:
+            gesture_at = time.monotonic() - started
+    total = time.monotonic() - started
+    engine.close()
+    return total, face_at, gesture_at, engine.state == ACCEPTED, engine.decision
+
+
+def main():
+    parser = argparse.ArgumentParser(description="순차 vs 동시 얼굴 + 제스처 인증 총 시간")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--fps', type=float, default=30.0, help="합성 카메라 FPS")
+    parser.add_argument('--detect-ms', type=float, default=8.0, help="합성 얼굴 검출 비용 (ms)")
+    parser.add_argument('--encode-ms', type=float, default=120.0, help="합성 얼굴 인코딩 비용 (ms)")
+    parser.add_argument('--infer-ms', type=float, default=15.0, help="합성 제스처 인식 비용 (ms)")
+    parser.add_argument('--reopen-ms', type=float, default=300.0, help="순차 방식의 카메라 재시작 비용 (ms)")
+    parser.add_argument('--hold', type=float, default=0.8, help="제스처 유지 시간 (초)")
+    parser.add_argument('--gap', type=float, default=0.4, help="제스처 사이 손을 내리는 시간 (초)")
+    parser.add_argument('--palm', type=float, default=0.25, help="손바닥 길이 (프레임 높이 비율)")
+    parser.add_argument('--foreign-hand', action='store_true', help="얼굴과 크기가 맞지 않는 손 (다른 사람 손)")
+    args = parser.parse_args()
+    if args.foreign_hand:
+        args.palm = 0.04
+
+    matcher = FaceMatcher([np.random.default_rng(1).normal(0, 0.1, 128)], ['bench'])
+    source = SyntheticSource(count=1 << 30, fps=args.fps, realtime=True, loop=True).start()
+    print(f"{args.runs} runs, encode {args.encode_ms:g} ms, reopen {args.reopen_ms:g} ms, "
+          f"gesture hold {args.hold:g} s + gap {args.gap:g} s")
+    for name, run in (('sequential', run_sequential), ('combined', run_combined)):
+        results = [run(args, source, matcher) for _ in range(args.runs)]
+        totals, faces, gestures = (np.asarray([r[i] for r in results]) for i in range(3))
+        accepted = sum(1 for r in results if r[3])
+        print(f"  {name:>10}: total {totals.mean():5.2f} s  face decided {faces.mean():5.2f} s  "
+              f"gestures done {gestures.mean():5.2f} s  accepted {accepted}/{args.runs}")
+        decision = results[-1][4]
+        if decision is not None:
+            print(f"  {'':>10}  reason {decision['reason']}  binding {decision['binding']}")
+    source.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+SQLite 접근 방식 벤치마크
+- 이전 방식: 쿼리마다 sqlite3.connect/close (rollback journal)
+- 새 방식: 스레드별 연결 풀 + WAL + 문장 캐시 (db.ConnectionPool)
+- 여러 스레드가 조회/저장을 섞어 실행할 때의 초당 처리 수 비교
+
+실행 예:
+    python bench_db.py --threads 1 4 8 --ops 2000 --write-ratio 0.1
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import numpy as np
+from db import ConnectionPool
+
+SELECT_SQL = "SELECT username, gesture_1, gesture_2, gesture_3 FROM users WHERE id = ?"
+UPDATE_SQL = "UPDATE users SET gesture_1 = ?, gesture_2 = ?, gesture_3 = ? WHERE id = ?"
+
+
+def create_database(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE users (id TEXT PRIMARY KEY, username TEXT,
+                    gesture_1 TEXT, gesture_2 TEXT, gesture_3 TEXT)""")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)",
+                     [(f"user_{i}", f"name_{i}", 'Victory', 'Thumb_Up', 'Open_Palm') for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+
+def legacy_op(path, user_id, write):
+    conn = sqlite3.connect(path, timeout=30.0)
+    cursor = conn.cursor()
+    if write:
+        cursor.execute(UPDATE_SQL, ('Victory', 'Thumb_Up', 'ILoveYou', user_id))
+        conn.commit()
+    else:
+        cursor.execute(SELECT_SQL, (user_id,))
+        cursor.fetchone()
+    conn.close()
+
+
+def pooled_op(pool, user_id, write):
+    if write:
+        with pool.transaction() as conn:
+            conn.execute(UPDATE_SQL, ('Victory', 'Thumb_Up', 'ILoveYou', user_id))
+    else:
+        pool.fetchone(SELECT_SQL, (user_id,))
+
+
+def run(label, op, threads, ops, rows, write_ratio):
+    latencies = [[] for _ in range(threads)]
+
+    def worker(index):
+        rng = np.random.default_rng(index)
+        for _ in range(ops):
+            user_id = f"user_{rng.integers(rows)}"
+            start = time.perf_counter()
+            op(user_id, rng.random() < write_ratio)
+            latencies[index].append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    samples = np.concatenate([np.asarray(values) for values in latencies]) * 1000
+    print(f"  {label:<8s} {threads:2d} threads  {threads * ops / elapsed:9.0f} ops/s  "
+          f"p50 {np.percentile(samples, 50):7.3f} ms  p99 {np.percentile(samples, 99):7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쿼리마다 연결 vs 연결 풀(WAL) 비교")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--ops', type=int, default=2000, help="스레드당 쿼리 수")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, 'legacy.db')
+        pooled_path = os.path.join(directory, 'pooled.db')
+        create_database(legacy_path, args.rows)
+        create_database(pooled_path, args.rows)
+        pool = ConnectionPool(pooled_path)
+
+        print(f"{args.rows} rows, {args.ops} ops/thread, write ratio {args.write_ratio}")
+        for threads in args.threads:
+            run("legacy", lambda user_id, write: legacy_op(legacy_path, user_id, write),
+                threads, args.ops, args.rows, args.write_ratio)
+            run("pooled", lambda user_id, write: pooled_op(pool, user_id, write),
+                threads, args.ops, args.rows, args.write_ratio)
+        print(f"  pool {pool.stats()}")
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+얼굴 인코딩 마이크로 배치 벤치마크
+- 여러 세션이 무작위 간격(포아송)으로 인코딩을 요청할 때 배치 대기 시간/최대 배치 크기별 처리량과 지연 비교
+- 배치 크기 1 = 요청마다 인코딩 (기준선)
+- --encoder synthetic: dlib 없이 '배치당 고정 비용 + 얼굴당 비용' 모델로 측정
+
+실행 예:
+    python bench_encode_batch.py --sessions 24 --rate 150 --delays 0 2 5 10
+    python bench_encode_batch.py --encoder synthetic --fixed-ms 12 --per-item-ms 3 --workers 2
+"""
+import argparse
+import os
+import threading
+import time
+import numpy as np
+from encode_batcher import EncodingBatcher
+from encode_executor import EncodingExecutor, dlib_encode, dlib_encode_batch
+from frame_source import SyntheticSource
+
+# 합성 인코더 비용 (워커 프로세스에도 전달되도록 환경 변수로 공유)
+FIXED_ENV = 'BENCH_BATCH_FIXED_MS'
+PER_ITEM_ENV = 'BENCH_BATCH_PER_ITEM_MS'
+
+
+def synthetic_encode_batch(frames, locations_list):
+    """
+    dlib 대신 쓰는 합성 배치 인코더 - 배치당 고정 비용 + 프레임당 비용만큼 CPU 사용
+    """
+    cost = float(os.environ.get(FIXED_ENV, '12')) + float(os.environ.get(PER_ITEM_ENV, '3')) * len(frames)
+    deadline = time.thread_time() + cost / 1000
+    value = 0
+    while time.thread_time() < deadline:
+        for i in range(1000):
+            value = (value * 31 + i) & 0xFFFF
+    return [[np.full(128, value / 0xFFFF)] for _ in frames]
+
+
+def synthetic_encode(rgb_frame, face_locations):
+    return synthetic_encode_batch([rgb_frame], [face_locations])[0]
+
+
+def run(batcher, frames, locations, sessions, requests, rate, seed):
+    latencies = [[] for _ in range(sessions)]
+
+    def session(index):
+        rng = np.random.default_rng(seed + index)
+        for i in range(requests):
+            # 세션마다 평균 rate/sessions 간격으로 요청 (응답을 받은 뒤 다음 요청)
+            time.sleep(rng.exponential(sessions / rate))
+            start = time.perf_counter()
+            batcher.submit(frames[(index + i) % len(frames)], locations).result()
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, np.concatenate([np.asarray(values) for values in latencies]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마이크로 배치 대기 시간별 처리량/지연")
+    parser.add_argument('--encoder', choices=['dlib', 'synthetic'], default='dlib')
+    parser.add_argument('--fixed-ms', type=float, default=12.0, help="합성 인코더 배치당 고정 비용 (ms)")
+    parser.add_argument('--per-item-ms', type=float, default=3.0, help="합성 인코더 프레임당 비용 (ms)")
+    parser.add_argument('--sessions', type=int, default=24)
+    parser.add_argument('--requests', type=int, default=20, help="세션당 요청 수")
+    parser.add_argument('--rate', type=float, default=150.0, help="전체 요청 도착률 (요청/초)")
+    parser.add_argument('--delays', type=float, nargs='+', default=[0, 2, 5, 10], help="배치 대기 시간 (ms)")
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=0, help="배치를 실행할 워커 프로세스 수 (0이면 스케줄러 스레드)")
+    args = parser.parse_args()
+
+    os.environ[FIXED_ENV] = str(args.fixed_ms)
+    os.environ[PER_ITEM_ENV] = str(args.per_item_ms)
+    if args.encoder == 'synthetic':
+        encoder, batch_encoder = synthetic_encode, synthetic_encode_batch
+    else:
+        encoder, batch_encoder = dlib_encode, dlib_encode_batch
+    executor = EncodingExecutor(args.workers, encoder=encoder, batch_encoder=batch_encoder) if args.workers else None
+
+    source = SyntheticSource(count=8, realtime=False)
+    source.start()
+    frames = [frame.image[:, :, ::-1].copy() for frame in iter(lambda: source.read_frame(), None)]
+    height, width = frames[0].shape[:2]
+    locations = [(height // 4, width * 3 // 4, height * 3 // 4, width // 4)]
+
+    print(f"{args.sessions} sessions x {args.requests} requests, {args.rate:.0f} req/s offered, "
+          f"{args.encoder} encoder, {'workers x' + str(args.workers) if executor else 'scheduler thread'}")
+    configs = [(1, 0.0)] + [(args.max_batch, delay) for delay in args.delays]
+    for max_batch, delay in configs:
+        batcher = EncodingBatcher(batch_encoder, executor=executor, max_batch=max_batch, max_delay_ms=delay)
+        elapsed, samples = run(batcher, frames, locations, args.sessions, args.requests, args.rate, 0)
+        stats = batcher.stats()
+        batcher.close()
+        label = "unbatched" if max_batch == 1 else f"batch<={stats['max_batch']} {delay:g}ms"
+        print(f"  {label:<16s} {args.sessions * args.requests / elapsed:6.1f} req/s  "
+              f"p50 {np.percentile(samples, 50):6.1f} ms  p99 {np.percentile(samples, 99):6.1f} ms  "
+              f"avg batch {stats['avg_batch']:4.1f}  added wait {stats['avg_wait_ms']:5.1f} ms  "
+              f"batch {stats['avg_batch_ms']:5.1f} ms")
+    if executor is not None:
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
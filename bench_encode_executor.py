@@ -0,0 +1,104 @@
+"""
+프로세스 풀 얼굴 인코딩 벤치마크
+- 여러 세션 스레드가 동시에 인코딩할 때: 스레드 안에서 직접 실행 vs EncodingExecutor(워커 수별)
+- 세션 처리량(인코딩/초), 요청 지연 p50/p99, 워커별 사용률 출력
+- --encoder synthetic: dlib 없이 GIL을 잡고 도는 고정 비용 인코더로 확장성만 측정
+
+실행 예:
+    python bench_encode_executor.py --sessions 8 --requests 20 --workers 1 2 4 8
+    python bench_encode_executor.py --encoder synthetic --cost-ms 30
+"""
+import argparse
+import os
+import threading
+import time
+import numpy as np
+from encode_executor import EncodingExecutor, dlib_encode
+from frame_source import SyntheticSource
+
+# 합성 인코더 비용 (워커 프로세스에도 전달되도록 환경 변수로 공유)
+COST_ENV = 'BENCH_ENCODE_COST_MS'
+
+
+def synthetic_encode(rgb_frame, face_locations):
+    """
+    dlib 대신 쓰는 합성 인코더 - 파이썬 루프로 GIL을 잡은 채 일정 CPU 시간 사용
+    (벽시계가 아니라 스레드 CPU 시간 기준이라 GIL 경합이 그대로 드러남)
+    """
+    deadline = time.thread_time() + float(os.environ.get(COST_ENV, '30')) / 1000
+    value = int(rgb_frame[0, 0, 0])
+    while time.thread_time() < deadline:
+        for i in range(1000):
+            value = (value * 31 + i) & 0xFFFF
+    return [np.full(128, value / 0xFFFF)]
+
+
+def run_sessions(sessions, requests, frames, locations, encode):
+    latencies = [[] for _ in range(sessions)]
+
+    def session(index):
+        for i in range(requests):
+            frame = frames[(index + i) % len(frames)]
+            start = time.perf_counter()
+            encode(frame, locations)
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, np.concatenate([np.asarray(values) for values in latencies]) * 1000
+
+
+def report(label, sessions, requests, elapsed, samples):
+    print(f"  {label:<14s} {sessions * requests / elapsed:7.1f} encodes/s  "
+          f"p50 {np.percentile(samples, 50):7.1f} ms  p99 {np.percentile(samples, 99):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 스레드 인코딩 vs 프로세스 풀 인코딩")
+    parser.add_argument('--encoder', choices=['dlib', 'synthetic'], default='dlib')
+    parser.add_argument('--cost-ms', type=float, default=30.0, help="합성 인코더 한 번의 비용 (ms)")
+    parser.add_argument('--sessions', type=int, default=8, help="동시에 인증하는 세션 수")
+    parser.add_argument('--requests', type=int, default=20, help="세션당 인코딩 수")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--size', type=int, nargs=2, default=[640, 480], metavar=('WIDTH', 'HEIGHT'))
+    args = parser.parse_args()
+
+    os.environ[COST_ENV] = str(args.cost_ms)
+    encoder = synthetic_encode if args.encoder == 'synthetic' else dlib_encode
+    source = SyntheticSource(count=8, size=tuple(args.size), realtime=False)
+    source.start()
+    frames = [frame.image[:, :, ::-1].copy() for frame in iter(lambda: source.read_frame(), None)]
+    width, height = args.size
+    # 화면 가운데 얼굴 박스 (top, right, bottom, left)
+    locations = [(height // 4, width * 3 // 4, height * 3 // 4, width // 4)]
+
+    print(f"{args.sessions} sessions x {args.requests} encodes, {args.encoder} encoder, "
+          f"{width}x{height}, {os.cpu_count()} cores")
+    elapsed, samples = run_sessions(args.sessions, args.requests, frames, locations, encoder)
+    report("in-thread", args.sessions, args.requests, elapsed, samples)
+
+    for workers in sorted(set(args.workers)):
+        executor = EncodingExecutor(workers, encoder=encoder)
+        # 워커 기동/모델 로딩은 측정에서 제외
+        for future in [executor.submit(frames[0], locations) for _ in range(workers * 2)]:
+            future.result()
+        executor.reset_stats()
+
+        elapsed, samples = run_sessions(args.sessions, args.requests, frames, locations,
+                                        lambda frame, boxes: executor.submit(frame, boxes).result())
+        report(f"pool x{workers}", args.sessions, args.requests, elapsed, samples)
+        stats = executor.stats()
+        utilization = " ".join(f"{worker['utilization']:.0%}/{worker['tasks']}"
+                               for worker in stats['per_worker'].values())
+        print(f"    queue wait {stats['avg_queue_wait_ms']:.1f} ms  encode {stats['avg_encode_ms']:.1f} ms  "
+              f"pickled {stats['pickled']}  worker util/tasks: {utilization}")
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
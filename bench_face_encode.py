@@ -0,0 +1,90 @@
+"""
+얼굴 인코딩 지연 시간 벤치마크
+- MediaPipe 검출 박스를 그대로 넘길 때와 dlib HOG로 다시 검출할 때의 프레임당 인코딩 시간 비교
+- 입력: 이미지 디렉토리 또는 동영상 파일 (기본값: registered_faces)
+
+실행 예:
+    python bench_face_encode.py --source registered_faces
+    python bench_face_encode.py --source sample.mp4 --frames 200
+"""
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from face import encode_faces, mp_face_detection, REGISTERED_FACES_DIR
+
+
+def read_frames(source, limit):
+    """
+    이미지 디렉토리나 동영상 파일에서 BGR 프레임 읽기
+    Returns:
+        list: BGR 프레임 리스트
+    """
+    frames = []
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if filename.endswith(('.jpg', '.png')):
+                frame = cv2.imread(os.path.join(source, filename))
+                if frame is not None:
+                    frames.append(frame)
+            if len(frames) >= limit:
+                break
+    else:
+        capture = cv2.VideoCapture(source)
+        while len(frames) < limit:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frames.append(frame)
+        capture.release()
+    return frames
+
+
+def summarize(label, samples):
+    samples = np.asarray(samples) * 1000
+    print(f"  {label:<22s} mean {samples.mean():7.2f} ms  p50 {np.percentile(samples, 50):7.2f} ms  "
+          f"p99 {np.percentile(samples, 99):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaPipe 박스 재사용 여부에 따른 인코딩 시간 비교")
+    parser.add_argument('--source', default=REGISTERED_FACES_DIR, help="이미지 디렉토리 또는 동영상 파일")
+    parser.add_argument('--frames', type=int, default=100)
+    args = parser.parse_args()
+
+    frames = read_frames(args.source, args.frames)
+    handoff_times = []
+    dlib_times = []
+    detect_times = []
+
+    with mp_face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.8) as face_detection:
+        for frame in frames:
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            start = time.perf_counter()
+            results = face_detection.process(rgb_frame)
+            detect_times.append(time.perf_counter() - start)
+            if not results.detections:
+                continue
+
+            start = time.perf_counter()
+            encode_faces(rgb_frame, results.detections)
+            handoff_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            encode_faces(rgb_frame)
+            dlib_times.append(time.perf_counter() - start)
+
+    if not handoff_times:
+        print("얼굴이 감지된 프레임이 없습니다.")
+        return
+
+    print(f"{len(frames)}개 프레임 중 {len(handoff_times)}개에서 얼굴 감지")
+    summarize("MediaPipe detect", detect_times)
+    summarize("encode (MediaPipe box)", handoff_times)
+    summarize("encode (dlib HOG)", dlib_times)
+    print(f"  speedup x{np.mean(dlib_times) / np.mean(handoff_times):.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+제스처 캡처 루프 프레임 변환 마이크로 벤치마크
+- 이전 방식: 320x240 캡처 -> 640x480 확대 -> cvtColor (프레임마다 새 배열) -> 확대 프레임에 글자/표시
+- 새 방식: 원본 해상도에서 재사용 버퍼로 cvtColor, 확대는 표시용 버퍼에만
+- 프레임당 소요 시간(ms)과 tracemalloc 기준 새로 할당된 바이트/배열 수를 출력
+
+실행 예:
+    python bench_gesture_pipeline.py --frames 2000 --capture 320x240 --display 640x480
+"""
+import argparse
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from frame_pipeline import FramePipeline
+
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def legacy_step(frame, display_size):
+    frame = cv2.resize(frame, display_size)
+    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    cv2.putText(frame, "Detected: Victory", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    return image_rgb, frame
+
+
+def pipeline_step(pipeline, frame):
+    image_rgb = pipeline.to_rgb(frame)
+    display_frame = pipeline.for_display(frame)
+    cv2.putText(display_frame, "Detected: Victory", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    return image_rgb, display_frame
+
+
+def measure(label, step, frames):
+    # 워밍업 (버퍼 최초 할당 제외)
+    for frame in frames[:10]:
+        step(frame)
+
+    start = time.perf_counter()
+    for frame in frames:
+        image_rgb, _ = step(frame)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    allocated = 0
+    blocks = 0
+    for frame in frames[:200]:
+        before = tracemalloc.take_snapshot()
+        result = step(frame)
+        after = tracemalloc.take_snapshot()
+        stats = after.compare_to(before, 'filename')
+        allocated += sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+        blocks += sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+        del result
+    tracemalloc.stop()
+    sampled = min(200, len(frames))
+
+    print(f"  {label:<10s} {elapsed / len(frames) * 1000:7.3f} ms/frame  "
+          f"{allocated / sampled / 1024:9.1f} KiB/frame  {blocks / sampled:6.1f} allocs/frame  "
+          f"inference input {image_rgb.shape[1]}x{image_rgb.shape[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제스처 루프 프레임 변환 비용 비교")
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--capture', type=parse_size, default=(320, 240))
+    parser.add_argument('--display', type=parse_size, default=(640, 480))
+    args = parser.parse_args()
+
+    width, height = args.capture
+    rng = np.random.default_rng(0)
+    # 카메라처럼 매 프레임 새 배열이 들어오는 상황을 흉내내기 위해 몇 장을 돌려 사용
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    print(f"capture {width}x{height}, display {args.display[0]}x{args.display[1]}, {args.frames} frames")
+    measure("legacy", lambda frame: legacy_step(frame, args.display), frames)
+    pipeline = FramePipeline(display_size=args.display)
+    measure("pipeline", lambda frame: pipeline_step(pipeline, frame), frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+해시 제스처 비밀 검증 벤치마크
+- 큰 users(3단계)/files(4단계) 테이블에 솔트+키 해시 비밀을 채운 뒤 GestureStore.verify 처리량 측정
+- 검증 한 번 = 기본 키로 한 행 조회 + BLAKE2b 키 해시 한 번 + 상수 시간 비교
+- 비교용 이전 방식: 쿼리마다 연결을 열고 평문 gesture 컬럼을 읽어 zip/sum으로 비교
+
+실행 예:
+    python bench_gesture_secret.py --rows 200000 --ops 200000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import numpy as np
+from gesture_store import FileGestureStore, UserGestureStore, seal_gestures
+
+GESTURES = ['Closed_Fist', 'Open_Palm', 'Pointing_Up', 'Thumb_Down', 'Thumb_Up', 'Victory', 'ILoveYou']
+
+
+def random_sequences(rng, count, steps):
+    indices = rng.integers(len(GESTURES), size=(count, steps))
+    return [[GESTURES[i] for i in row] for row in indices]
+
+
+def populate(store, rows, rng):
+    # 저장소 save를 행마다 호출하면 채우는 시간이 길어지므로 한 트랜잭션으로 일괄 삽입
+    keys = [f"{store.table}_{i}" for i in range(rows)]
+    sequences = random_sequences(rng, rows, store.steps)
+    with store.pool.transaction() as conn:
+        conn.executemany(store.save_sql, [(key, *seal_gestures(store.key, sequence))
+                                          for key, sequence in zip(keys, sequences)])
+    return keys, sequences
+
+
+def bench_verify(label, store, keys, sequences, ops, rng):
+    picks = rng.integers(len(keys), size=ops)
+    wrong = rng.random(ops) < 0.5
+    inputs = []
+    for index, flip in zip(picks, wrong):
+        sequence = list(sequences[index])
+        if flip:
+            sequence[-1] = GESTURES[(GESTURES.index(sequence[-1]) + 1) % len(GESTURES)]
+        inputs.append((keys[index], sequence, not flip))
+
+    # 처리량은 타이머 호출 없이, 지연 분포는 별도 표본으로 측정
+    verify = store.verify
+    start = time.perf_counter()
+    correct = 0
+    for key, sequence, expected in inputs:
+        matched, _ = verify(key, sequence)
+        correct += matched == expected
+    elapsed = time.perf_counter() - start
+
+    # 같은 키로 행만 읽는 비용 (verify가 그 위에 더하는 해시/비교 비용을 가늠하는 기준)
+    fetchone = store.pool.fetchone
+    start = time.perf_counter()
+    for key, _, _ in inputs:
+        fetchone(store.verify_sql, (key,))
+    fetch_elapsed = time.perf_counter() - start
+
+    samples = []
+    for key, sequence, _ in inputs[:min(ops, 20000)]:
+        begin = time.perf_counter()
+        verify(key, sequence)
+        samples.append(time.perf_counter() - begin)
+    samples = np.asarray(samples) * 1e6
+
+    print(f"  {label:<14s} verify {ops / elapsed:9.0f} ops/s  p50 {np.percentile(samples, 50):6.1f} us  "
+          f"p99 {np.percentile(samples, 99):6.1f} us  correct {correct / ops:.1%}  "
+          f"(row fetch only {ops / fetch_elapsed:9.0f} ops/s)")
+
+
+def bench_legacy(path, steps, rows, ops, rng):
+    # 이전 verify_gestures와 같은 방식 (쿼리마다 connect/close, 평문 컬럼 비교)
+    columns = ", ".join(f"gesture_{i}" for i in range(1, steps + 1))
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE legacy (id TEXT PRIMARY KEY, {columns.replace(',', ' TEXT,')} TEXT)")
+    sequences = random_sequences(rng, rows, steps)
+    conn.executemany(f"INSERT INTO legacy VALUES (?{', ?' * steps})",
+                     [(f"legacy_{i}", *sequence) for i, sequence in enumerate(sequences)])
+    conn.commit()
+    conn.close()
+
+    picks = rng.integers(rows, size=ops)
+    start = time.perf_counter()
+    for index in picks:
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {columns} FROM legacy WHERE id = ?", (f"legacy_{index}",))
+        stored = cursor.fetchone()
+        conn.close()
+        sum(1 for a, b in zip(stored, sequences[index]) if a == b) == steps
+    elapsed = time.perf_counter() - start
+    print(f"  {'legacy (' + str(steps) + ')':<14s} verify {ops / elapsed:9.0f} ops/s  (connect per query, plaintext)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="해시 제스처 비밀 검증 처리량")
+    parser.add_argument('--rows', type=int, default=200000, help="테이블별 행 수")
+    parser.add_argument('--ops', type=int, default=200000, help="검증 횟수")
+    parser.add_argument('--legacy-ops', type=int, default=5000, help="이전 방식 검증 횟수 (0이면 생략)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        uses = [
+            ("login (3)", UserGestureStore(os.path.join(directory, 'gesture_auth.db'))),
+            ("file lock (4)", FileGestureStore(os.path.join(directory, 'fpwd.db'))),
+        ]
+        print(f"{args.rows} rows per table, {args.ops} verifies")
+        for label, store in uses:
+            start = time.perf_counter()
+            keys, sequences = populate(store, args.rows, rng)
+            print(f"  {label:<14s} populate {time.perf_counter() - start:6.2f} s")
+            bench_verify(label, store, keys, sequences, args.ops, rng)
+        if args.legacy_ops:
+            bench_legacy(os.path.join(directory, 'legacy.db'), 3, args.rows, args.legacy_ops, rng)
+        for _, store in uses:
+            store.pool.close()
+
+
+if __name__ == '__main__':
+    main()
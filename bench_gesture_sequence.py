@@ -0,0 +1,121 @@
+"""
+제스처 시퀀스 엔진/저장소 벤치마크 (로그인 3단계 vs 파일 잠금 4단계)
+- 두 용도가 같은 엔진(GestureSequenceEngine)과 같은 저장소 코드(GestureStore)를 쓰므로
+  단계 수 외에는 차이가 없어야 함
+- 엔진: 가상 시계 기준으로 사용자를 흉내낸 결과 스트림(노이즈 포함)을 넣어
+  결과당 처리 시간, 결정까지의 가상 시간, 입력한 시퀀스를 그대로 확정한 비율 측정
+- 저장소: 임시 DB에 저장/검증 초당 처리 수 측정
+
+실행 예:
+    python bench_gesture_sequence.py --sessions 200 --result-hz 30 --noise 0.05
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from auth_engine import GestureSequenceEngine, ACCEPTED
+from gesture_buffer import GestureResult
+from gesture_store import UserGestureStore, FileGestureStore
+
+GESTURES = ['Closed_Fist', 'Open_Palm', 'Pointing_Up', 'Thumb_Down', 'Thumb_Up', 'Victory', 'ILoveYou']
+
+
+def simulate(rng, engine, sequence, result_hz, reaction, noise, limit=30.0):
+    """
+    사용자가 단계 완료를 본 뒤 reaction초 후 다음 제스처로 바꾸는 결과 스트림을 엔진에 넣음
+    Returns:
+        tuple: (처리한 결과 수, 결정까지의 가상 시간(초), 엔진 처리에 걸린 실제 시간(초))
+    """
+    interval = 1.0 / result_hz
+    now = 0.0
+    target = 0
+    switch_at = None
+    processed = 0
+    cpu = 0.0
+    engine.start(now=now)
+    while not engine.done and now < limit:
+        now += interval
+        if switch_at is not None and now >= switch_at:
+            target, switch_at = engine.step, None
+
+        if rng.random() < noise:
+            record = GestureResult(int(now * 1000), None, 0.0)
+        else:
+            gesture = sequence[min(target, len(sequence) - 1)]
+            record = GestureResult(int(now * 1000), gesture, float(rng.uniform(0.6, 1.0)))
+
+        step = engine.step
+        start = time.perf_counter()
+        engine.update([record], now=now)
+        cpu += time.perf_counter() - start
+        processed += 1
+        if engine.step != step:
+            switch_at = now + reaction
+    return processed, now, cpu
+
+
+def bench_engine(label, steps, args, rng):
+    per_result = []
+    decision_times = []
+    accepted = 0
+    for _ in range(args.sessions):
+        sequence = [str(gesture) for gesture in rng.choice(GESTURES, steps)]
+        engine = GestureSequenceEngine(steps=steps)
+        processed, elapsed, cpu = simulate(rng, engine, sequence, args.result_hz, args.reaction, args.noise)
+
+        per_result.append(cpu / processed)
+        if engine.done:
+            decision_times.append(elapsed)
+        accepted += engine.state == ACCEPTED and engine.decision['gestures'] == sequence
+
+    per_result = np.asarray(per_result) * 1e6
+    decision = np.asarray(decision_times) if decision_times else np.zeros(1)
+    print(f"  {label:<14s} engine  {per_result.mean():6.2f} us/result  "
+          f"decision p50 {np.percentile(decision, 50):5.2f} s  p99 {np.percentile(decision, 99):5.2f} s  "
+          f"correct {accepted}/{args.sessions}")
+
+
+def bench_store(label, store, args, rng):
+    steps = store.steps
+    keys = [f"key_{i}" for i in range(args.records)]
+    sequences = [[str(gesture) for gesture in rng.choice(GESTURES, steps)] for _ in keys]
+
+    start = time.perf_counter()
+    for key, sequence in zip(keys, sequences):
+        store.save(key, sequence)
+    save_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key, sequence in zip(keys, sequences):
+        store.verify(key, sequence)
+    verify_elapsed = time.perf_counter() - start
+
+    print(f"  {label:<14s} store   save {args.records / save_elapsed:9.0f} ops/s  "
+          f"verify {args.records / verify_elapsed:9.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="3단계/4단계 제스처 시퀀스 처리 비용 비교")
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--result-hz', type=float, default=30.0, help="초당 인식 결과 수")
+    parser.add_argument('--reaction', type=float, default=0.4, help="단계 완료 후 다음 제스처로 바꾸기까지 시간 (초)")
+    parser.add_argument('--noise', type=float, default=0.05, help="인식 실패 결과 비율")
+    parser.add_argument('--records', type=int, default=1000, help="저장소 측정 행 수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        uses = [
+            ("login (3)", UserGestureStore(os.path.join(directory, 'gesture_auth.db'))),
+            ("file lock (4)", FileGestureStore(os.path.join(directory, 'fpwd.db'))),
+        ]
+        print(f"{args.sessions} sessions, {args.result_hz:.0f} results/s, reaction {args.reaction}s, noise {args.noise}")
+        for label, store in uses:
+            bench_engine(label, store.steps, args, rng)
+        for label, store in uses:
+            bench_store(label, store, args, rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+카메라 없는 종단간 처리량 벤치마크
+- 비디오 파일, 이미지 디렉토리, 합성 프레임을 인증 엔진(얼굴/제스처)에 그대로 흘려 보냄
+- 최대한 빠르게(기본) 또는 --realtime으로 실제 FPS에 맞춰 공급
+- 실행별 결정까지 걸린 시간(time-to-decision), 처리 FPS, 결과를 출력
+- Streamlit 페이지 없이 UI와 무관한 엔진(auth_engine)을 직접 구동
+
+실행 예:
+    python bench_pipeline.py --mode face --source sample.mp4 --user alice
+    python bench_pipeline.py --mode face --source registered_faces --repeat 5
+    python bench_pipeline.py --mode gesture --source gestures.mp4 --realtime
+    python bench_pipeline.py --mode face --source synthetic --frames 600
+"""
+import argparse
+import os
+import time
+import numpy as np
+from frame_source import VideoFileSource, ImageDirectorySource, SyntheticSource
+
+
+def build_source(args):
+    """
+    인자에 맞는 오프라인 프레임 소스 생성 (실행마다 새로 만듦)
+    """
+    if args.source == 'synthetic':
+        return SyntheticSource(count=args.frames, size=args.size, fps=args.fps or 30.0,
+                               realtime=args.realtime, image=args.image).start()
+    if os.path.isdir(args.source):
+        return ImageDirectorySource(args.source, fps=args.fps or 30.0, realtime=args.realtime).start()
+    return VideoFileSource(args.source, fps=args.fps, realtime=args.realtime).start()
+
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def drive(engine, source, process):
+    """
+    소스가 끝나거나 엔진이 결정할 때까지 프레임을 넣음
+    Returns:
+        tuple: (결정 dict 또는 None, 처리한 프레임 수)
+    """
+    frames = 0
+    try:
+        while not engine.done:
+            captured = source.read_frame()
+            if captured is None:
+                break
+            process(captured)
+            frames += 1
+    finally:
+        source.release()
+    return engine.decision, frames
+
+
+def run_face(args):
+    # Streamlit 페이지 대신 UI와 무관한 엔진을 직접 구동
+    from face_store import FaceTemplateStore
+    from face_matcher import FaceMatcher
+    from model_pool import face_detector_pool
+    from auth_engine import FaceAuthEngine
+
+    encodings, names = FaceTemplateStore(args.faces_dir or 'registered_faces').sync()
+    matcher = FaceMatcher(encodings, names)
+    identifier = matcher
+    if args.ann:
+        from ann_index import IVFFlatIndex
+        identifier = IVFFlatIndex()
+        identifier.add_many(encodings, names)
+    pool = face_detector_pool(model_selection=0, min_detection_confidence=0.8)
+
+    def run(source):
+        with pool.lease() as detector:
+            engine = FaceAuthEngine(detector, matcher=matcher, identifier=identifier, user_id=args.user)
+            return drive(engine, source, lambda captured: engine.process(captured.image))
+
+    return run
+
+
+def run_gesture(args):
+    from model_pool import gesture_recognizer_pool
+    from auth_engine import GestureSequenceEngine
+
+    pool = gesture_recognizer_pool(args.model)
+
+    def run(source):
+        with pool.lease() as recognizer:
+            engine = GestureSequenceEngine(recognizer, steps=args.steps)
+            engine.start()
+            return drive(engine, source,
+                         lambda captured: engine.process(captured.image, int(captured.timestamp * 1000)))
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 프레임 소스로 인증 루프 처리량 측정")
+    parser.add_argument('--mode', choices=['face', 'gesture'], default='face')
+    parser.add_argument('--source', default='synthetic', help="비디오 파일, 이미지 디렉토리 또는 synthetic")
+    parser.add_argument('--user', default=None, help="주장된 사용자 ID (없으면 1:N 식별)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--realtime', action='store_true', help="--fps(또는 파일 FPS)에 맞춰 공급")
+    parser.add_argument('--fps', type=float, default=None)
+    parser.add_argument('--frames', type=int, default=300, help="합성 프레임 수")
+    parser.add_argument('--size', type=parse_size, default=(640, 480), help="합성 프레임 크기")
+    parser.add_argument('--image', default=None, help="합성 프레임 기준 이미지")
+    parser.add_argument('--faces-dir', default=None)
+    parser.add_argument('--ann', action='store_true', help="1:N 식별에 근사 인덱스 사용")
+    parser.add_argument('--model', default='gesture_recognizer.task')
+    parser.add_argument('--steps', type=int, default=3, help="제스처 단계 수")
+    args = parser.parse_args()
+
+    run = run_face(args) if args.mode == 'face' else run_gesture(args)
+
+    decision_times = []
+    frame_rates = []
+    print(f"mode {args.mode}, source {args.source}, {'realtime' if args.realtime else 'as fast as possible'}")
+    for attempt in range(args.repeat):
+        source = build_source(args)
+        start = time.perf_counter()
+        decision, frames = run(source)
+        elapsed = time.perf_counter() - start
+        result = decision['accepted'] if decision else None
+        decision_times.append(elapsed)
+        frame_rates.append(frames / elapsed if elapsed > 0 else 0.0)
+        print(f"  run {attempt + 1}: result {result!s:<5s} {frames:5d} frames  "
+              f"{elapsed * 1000:9.1f} ms to decision  {frame_rates[-1]:7.1f} frames/s")
+
+    decision_ms = np.asarray(decision_times) * 1000
+    print(f"  time-to-decision p50 {np.percentile(decision_ms, 50):9.1f} ms  p99 {np.percentile(decision_ms, 99):9.1f} ms  "
+          f"throughput mean {np.mean(frame_rates):7.1f} frames/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+asyncio 세션 다중화 벤치마크
+- 한 프로세스에서 인증 세션 수백 개를 동시에 열고, 세션마다 fps에 맞춰 프레임을 공급
+- 세션 수를 늘려도 스레드 수는 추론 스레드 수로 고정되는지, 이벤트 루프 지연(lag)과 결정까지 걸린 시간이 어떻게 변하는지 측정
+- 모델 대신 합성 검출기/인식기/인코더 사용 (네이티브 추론처럼 GIL을 놓는 대기로 비용 흉내)
+
+실행 예:
+    python bench_session_manager.py --mode gesture --sessions 100 200 400 --threads 8
+    python bench_session_manager.py --mode face --sessions 200 --infer-ms 6 --encode-ms 25
+"""
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+from face_matcher import FaceMatcher
+from frame_source import Frame
+from gesture_store import UserGestureStore
+from model_pool import ModelPool
+from session_manager import SessionManager, FINISHED
+
+# 합성 제스처 순서 (프레임 첫 픽셀 값으로 구분)
+GESTURES = ['Victory', 'Open_Palm', 'Thumb_Up']
+
+
+class SyntheticRecognizer:
+    """
+    프레임 첫 픽셀 값으로 제스처를 돌려주는 합성 인식기
+    """
+
+    def __init__(self, cost_ms):
+        self.cost = cost_ms / 1000
+
+    def recognize(self, image, timestamp_ms=None):
+        time.sleep(self.cost)
+        value = int(image.numpy_view()[0, 0, 0])
+        if value == 0:
+            return SimpleNamespace(gestures=[])
+        return SimpleNamespace(gestures=[[SimpleNamespace(category_name=GESTURES[value - 1], score=0.9)]])
+
+
+class SyntheticDetector:
+    """
+    프레임 가운데 얼굴 하나를 돌려주는 합성 검출기
+    """
+
+    def __init__(self, cost_ms):
+        self.cost = cost_ms / 1000
+        box = SimpleNamespace(xmin=0.3, ymin=0.25, width=0.4, height=0.5)
+        self.results = SimpleNamespace(detections=[
+            SimpleNamespace(location_data=SimpleNamespace(relative_bounding_box=box), score=[0.99])])
+
+    def process(self, rgb_frame):
+        time.sleep(self.cost)
+        return self.results
+
+
+def make_frames(size):
+    # 제스처별 프레임 (첫 픽셀 = 제스처 번호, 0은 손 없음)과 얼굴 프레임 (선명한 무늬)
+    width, height = size
+    gesture_frames = []
+    for value in range(len(GESTURES) + 1):
+        image = np.full((height, width, 3), 128, dtype=np.uint8)
+        image[0, 0] = value
+        gesture_frames.append(image)
+    rng = np.random.default_rng(0)
+    face_frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return gesture_frames, face_frame
+
+
+async def feed_session(session, args, gesture_frames, face_frame):
+    # 세션 하나에 fps에 맞춰 프레임 공급 (제스처마다 hold초 유지 후 gap초 손을 내림)
+    interval = 1.0 / args.fps
+    started = time.monotonic()
+    index = 0
+    while not session.feed.closed:
+        now = time.monotonic()
+        elapsed = now - started
+        if args.mode == 'face':
+            image = face_frame
+        else:
+            step, offset = divmod(elapsed, args.hold + args.gap)
+            image = gesture_frames[0 if offset >= args.hold else int(step) % len(GESTURES) + 1]
+        session.feed._put(Frame(image, now, index))
+        index += 1
+        await asyncio.sleep(max(0.0, started + index * interval - time.monotonic()))
+
+
+async def run(args, count, gesture_frames, face_frame, store, matcher):
+    recognizers = ModelPool(lambda: SyntheticRecognizer(args.infer_ms), max_size=args.threads)
+    detectors = ModelPool(lambda: SyntheticDetector(args.infer_ms), max_size=args.threads)
+    encoding = matcher.matrix[0].astype(np.float64)
+
+    def encoder(rgb_frame, detections):
+        time.sleep(args.encode_ms / 1000)
+        return [encoding]
+
+    manager = SessionManager(inference_threads=args.threads, max_sessions=count, session_timeout=args.timeout,
+                             face_detectors=detectors, gesture_recognizers=recognizers, encoder=encoder,
+                             audit=SimpleNamespace(record=lambda *a, **k: None)).attach()
+    peak_threads = threading.active_count()
+    feeders = []
+    sessions = []
+    for i in range(count):
+        if args.mode == 'face':
+            session = manager.open_face_session(user_id='bench', matcher=matcher)
+        else:
+            session = manager.open_gesture_session(store, user_id='bench')
+        sessions.append(session)
+        feeders.append(asyncio.ensure_future(feed_session(session, args, gesture_frames, face_frame)))
+        # 세션 시작 시각을 ramp초에 걸쳐 분산
+        await asyncio.sleep(args.ramp / count)
+        peak_threads = max(peak_threads, threading.active_count())
+
+    while manager.sessions:
+        await asyncio.sleep(0.2)
+        peak_threads = max(peak_threads, threading.active_count())
+    await asyncio.gather(*feeders)
+    stats = manager.stats()
+    await manager.aclose()
+
+    decided = [session for session in sessions if session.state == FINISHED]
+    decision_ms = np.asarray([(s.finished_at - s.started_at) * 1000 for s in decided]) if decided else np.zeros(1)
+    accepted = sum(1 for session in sessions if session.accepted)
+    frames = sum(session.frames for session in sessions)
+    dropped = sum(session.feed.dropped for session in sessions)
+    lag = stats['loop_lag_ms']
+    print(f"  {count:4d} sessions  {accepted:4d} accepted  decision p50 {np.percentile(decision_ms, 50):7.0f} ms "
+          f"p99 {np.percentile(decision_ms, 99):7.0f} ms  frames {frames} (dropped {dropped})  "
+          f"loop lag avg {lag['avg']:5.1f} p99 {lag['p99']:5.1f} max {lag['max']:6.1f} ms  "
+          f"threads {peak_threads}  infer {stats['avg_inference_ms']:5.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 수별 이벤트 루프 지연/결정 시간/스레드 수")
+    parser.add_argument('--mode', choices=['face', 'gesture'], default='gesture')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--threads', type=int, default=8, help="추론 스레드 수")
+    parser.add_argument('--fps', type=float, default=10.0, help="세션별 프레임 공급 FPS")
+    parser.add_argument('--infer-ms', type=float, default=4.0, help="합성 검출/인식 비용 (ms)")
+    parser.add_argument('--encode-ms', type=float, default=20.0, help="합성 얼굴 인코딩 비용 (ms)")
+    parser.add_argument('--hold', type=float, default=1.0, help="제스처 유지 시간 (초)")
+    parser.add_argument('--gap', type=float, default=0.5, help="제스처 사이 손을 내리는 시간 (초)")
+    parser.add_argument('--ramp', type=float, default=2.0, help="세션 시작을 분산할 시간 (초)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="세션 시간 제한 (초)")
+    parser.add_argument('--size', default='320x240', help="프레임 크기")
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    gesture_frames, face_frame = make_frames((width, height))
+    directory = tempfile.mkdtemp()
+    store = UserGestureStore(os.path.join(directory, 'bench.db'))
+    store.save('bench', GESTURES)
+    matcher = FaceMatcher([np.random.default_rng(1).normal(0, 0.1, 128)], ['bench'])
+
+    print(f"{args.mode} sessions, {args.threads} inference threads, {args.fps:.0f} fps per session, "
+          f"{args.infer_ms:g} ms inference")
+    for count in args.sessions:
+        asyncio.run(run(args, count, gesture_frames, face_frame, store, matcher))
+    print(f"  max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
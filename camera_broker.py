@@ -0,0 +1,657 @@
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+import cv2
+import numpy as np
+from frame_source import Frame, SyntheticSource, VideoFileSource
+
+# 브로커 연결 인증 키 (같은 컴퓨터의 Unix 소켓만 사용)
+AUTHKEY = b'deepguard-camera'
+# 링 헤더: [최신 순번, height, width, channels, 슬롯 수, 닫힘 여부, 예약, 예약]
+HEADER_WORDS = 8
+LATEST, HEIGHT, WIDTH, CHANNELS, SLOTS, CLOSED = range(6)
+# 프레임 데이터 시작 위치 정렬 (캐시 라인)
+ALIGNMENT = 64
+
+
+def broker_address(device):
+    """
+    장치별 브로커 Unix 소켓 경로
+    Args:
+        device (int | str): 카메라 번호, 비디오 파일 경로 또는 'synthetic'
+    Returns:
+        str: 소켓 경로
+    """
+    return os.path.join(tempfile.gettempdir(), f"deepguard-camera-{re.sub(r'[^0-9A-Za-z]+', '_', str(device))}.sock")
+
+
+def attach_segment(name):
+    """
+    다른 프로세스가 만든 공유 메모리에 연결
+    - 연결만 한 프로세스가 끝날 때 resource_tracker가 세그먼트를 지우지 않도록 추적하지 않음
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12 이하에는 track 인자가 없음
+        from multiprocessing import resource_tracker
+        segment = SharedMemory(name=name)
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+class FrameRing:
+    """
+    공유 메모리 프레임 링 (브로커 하나가 쓰고 여러 프로세스가 읽음)
+    - 헤더에 최신 순번과 프레임 shape, 슬롯별로 순번/캡처 시각을 둠
+    - 쓰는 동안 슬롯 순번을 -1로 두므로 읽는 쪽은 순번이 맞는 슬롯만 사용 (덮어쓰기 중인 프레임 구분)
+    - 순번 n의 프레임은 슬롯 n % slots에 있고, 다음 slots - 1 프레임 동안 유지
+    """
+
+    def __init__(self, segment, shape, slots, owner):
+        self.segment = segment
+        self.shape = tuple(int(size) for size in shape)
+        self.slots = int(slots)
+        self.owner = owner
+        offset = HEADER_WORDS * 8
+        self.header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=segment.buf)
+        self.seqs = np.ndarray((self.slots,), dtype=np.int64, buffer=segment.buf, offset=offset)
+        self.stamps = np.ndarray((self.slots,), dtype=np.float64, buffer=segment.buf, offset=offset + 8 * self.slots)
+        data_offset = -(-(offset + 16 * self.slots) // ALIGNMENT) * ALIGNMENT
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=segment.buf, offset=data_offset)
+
+    @classmethod
+    def create(cls, shape, slots=4):
+        """
+        새 링 생성 (브로커에서 호출)
+        Args:
+            shape (tuple): 프레임 (height, width, channels)
+            slots (int): 슬롯 수
+        Returns:
+            FrameRing: 링
+        """
+        data_offset = -(-(HEADER_WORDS * 8 + 16 * slots) // ALIGNMENT) * ALIGNMENT
+        segment = SharedMemory(create=True, size=data_offset + slots * int(np.prod(shape)))
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=segment.buf)
+        header[:] = 0
+        header[HEIGHT:SLOTS + 1] = (*shape, slots)
+        del header
+        ring = cls(segment, shape, slots, owner=True)
+        ring.seqs[:] = -1
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        """
+        브로커가 만든 링에 연결 (구독자에서 호출)
+        Args:
+            name (str): 공유 메모리 이름
+        Returns:
+            FrameRing: 링
+        """
+        segment = attach_segment(name)
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=segment.buf)
+        shape, slots = tuple(header[HEIGHT:CHANNELS + 1]), int(header[SLOTS])
+        del header
+        return cls(segment, shape, slots, owner=False)
+
+    @property
+    def name(self):
+        return self.segment.name
+
+    @property
+    def latest(self):
+        return int(self.header[LATEST])
+
+    @property
+    def closed(self):
+        return bool(self.header[CLOSED])
+
+    def begin(self):
+        """
+        다음 프레임을 쓸 슬롯 (브로커 전용)
+        Returns:
+            tuple: (순번, 슬롯 배열)
+        """
+        seq = self.latest + 1
+        index = seq % self.slots
+        self.seqs[index] = -1
+        return seq, self.frames[index]
+
+    def commit(self, seq, timestamp):
+        """
+        슬롯 기록 완료 표시 후 최신 순번 갱신 (브로커 전용)
+        """
+        index = seq % self.slots
+        self.stamps[index] = timestamp
+        self.seqs[index] = seq
+        self.header[LATEST] = seq
+
+    def read(self, seq):
+        """
+        순번 seq의 프레임 (복사 없이 슬롯을 그대로 가리킴)
+        Returns:
+            tuple | None: (프레임, 캡처 시각) (이미 덮어썼거나 쓰는 중이면 None)
+        """
+        index = seq % self.slots
+        if self.seqs[index] != seq:
+            return None
+        return self.frames[index], float(self.stamps[index])
+
+    def valid(self, seq):
+        """
+        순번 seq의 프레임이 아직 덮어써지지 않았는지 여부
+        """
+        return self.seqs[seq % self.slots] == seq
+
+    def mark_closed(self):
+        self.header[CLOSED] = 1
+
+    def close(self):
+        # 배열 참조를 먼저 놓아야 공유 메모리를 닫을 수 있음
+        # (구독자가 아직 프레임을 들고 있으면 닫지 않고 프로세스 종료 시 해제)
+        self.header = self.seqs = self.stamps = self.frames = None
+        try:
+            self.segment.close()
+        except BufferError:
+            pass
+        if self.owner:
+            self.segment.unlink()
+
+
+class CameraBroker:
+    """
+    카메라 장치를 혼자 여는 브로커 (별도 프로세스에서 실행)
+    - 구독 해상도마다 공유 메모리 링 하나 - 캡처한 프레임을 해상도별로 한 번만 줄여 슬롯에 바로 기록
+    - 구독자는 Unix 소켓으로 구독/해지만 주고받고, 프레임은 공유 메모리에서 복사 없이 읽음
+    - 연결이 끊기면 그 구독자의 구독을 해지하고, 아무도 쓰지 않는 링은 지움
+    - 구독자가 없으면 idle_timeout 뒤 장치를 닫음 (페이지 단계 전환처럼 잠깐 비는 동안은 열어 둠)
+    """
+
+    def __init__(self, device=0, address=None, width=None, height=None, fps=None, slots=4, idle_timeout=5.0,
+                 exit_when_idle=False):
+        """
+        Args:
+            device (int | str): 카메라 번호, 비디오 파일 경로 또는 'synthetic'
+            address (str, optional): Unix 소켓 경로 (기본값: broker_address(device))
+            width (int, optional): 장치에 요청할 캡처 너비
+            height (int, optional): 장치에 요청할 캡처 높이
+            fps (int, optional): 장치에 요청할 캡처 FPS
+            slots (int): 링 슬롯 수 (구독자가 프레임을 들고 있을 수 있는 시간 = slots - 1 프레임)
+            idle_timeout (float): 구독자가 없을 때 장치를 열어 둘 시간 (초)
+            exit_when_idle (bool): 장치를 닫을 때 브로커도 종료할지 여부 (connect_broker가 띄운 브로커)
+        """
+        self.device = device
+        self.address = address or broker_address(device)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.slots = slots
+        self.idle_timeout = idle_timeout
+        self.exit_when_idle = exit_when_idle
+        self.condition = threading.Condition()
+        self.capture = None
+        self.native_shape = None
+        self.streams = {}  # (width, height) -> [FrameRing, 구독 수]
+        self.idle_since = time.monotonic()
+        self.running = False
+        self.listener = None
+        self.captured = 0
+        self.opened = 0
+        self.open_seconds = 0.0
+        self.started_at = time.monotonic()
+
+    def _open_device(self):
+        # 장치를 열고 첫 프레임으로 원본 해상도 확인 (condition 잠금 안에서 호출)
+        start = time.perf_counter()
+        if self.device == 'synthetic':
+            capture = SyntheticSource(count=1 << 62, size=(self.width or 640, self.height or 480),
+                                      fps=self.fps or 30.0, realtime=True, loop=True).start()
+        elif isinstance(self.device, str) and not self.device.isdigit():
+            capture = VideoFileSource(self.device, fps=self.fps, realtime=True, loop=True).start()
+        else:
+            capture = cv2.VideoCapture(int(self.device))
+            if self.width:
+                capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            if self.height:
+                capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            if self.fps:
+                capture.set(cv2.CAP_PROP_FPS, self.fps)
+        ret, image = capture.read() if capture.isOpened() else (False, None)
+        if not ret:
+            capture.release()
+            raise RuntimeError(f"카메라 장치를 열 수 없습니다: {self.device}")
+        self.capture = capture
+        self.native_shape = image.shape
+        self.opened += 1
+        self.open_seconds += time.perf_counter() - start
+
+    def _close_device(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+    def subscribe(self, width=None, height=None):
+        """
+        해상도 구독 (한쪽만 주면 원본 비율 유지, 둘 다 없으면 원본 해상도)
+        Returns:
+            FrameRing: 해당 해상도 링
+        Raises:
+            RuntimeError: 장치를 열 수 없는 경우
+        """
+        with self.condition:
+            if self.capture is None:
+                self._open_device()
+            native_height, native_width = self.native_shape[:2]
+            if width and not height:
+                height = round(native_height * width / native_width)
+            elif height and not width:
+                width = round(native_width * height / native_height)
+            key = (int(width or native_width), int(height or native_height))
+            stream = self.streams.get(key)
+            if stream is None:
+                stream = self.streams[key] = [FrameRing.create((key[1], key[0], self.native_shape[2]), self.slots), 0]
+            stream[1] += 1
+            self.condition.notify_all()
+            return key, stream[0]
+
+    def unsubscribe(self, key, ring):
+        """
+        구독 해지 - 구독한 링이 지금 그 해상도의 링일 때만 구독 수를 줄임
+        (장치가 끊겨 링이 지워진 뒤 같은 해상도를 새로 구독한 링은 건드리지 않음)
+        Args:
+            key (tuple): subscribe가 돌려준 (width, height)
+            ring (FrameRing): subscribe가 돌려준 링
+        """
+        with self.condition:
+            stream = self.streams.get(key)
+            if stream is None or stream[0] is not ring:
+                return
+            stream[1] -= 1
+            if stream[1] <= 0:
+                del self.streams[key]
+                stream[0].mark_closed()
+                stream[0].close()
+            if not self.streams:
+                self.idle_since = time.monotonic()
+                self.condition.notify_all()
+
+    def _capture_loop(self):
+        while self.running:
+            with self.condition:
+                # 구독자가 없으면 기다리고, idle_timeout이 지나면 장치를 닫음
+                while self.running and not self.streams:
+                    idle = time.monotonic() - self.idle_since
+                    if idle >= self.idle_timeout and (self.capture is not None or self.exit_when_idle):
+                        self._close_device()
+                        if self.exit_when_idle:
+                            self.running = False
+                            break
+                    timeout = max(0.05, self.idle_timeout - idle)
+                    self.condition.wait(timeout if self.capture is not None or self.exit_when_idle else None)
+                if not self.running:
+                    break
+                capture = self.capture
+
+            ret, image = capture.read()
+            timestamp = time.monotonic()
+            with self.condition:
+                if not ret:
+                    # 장치가 끊기면 구독자에게 알리고 링을 지운 뒤 다음 구독 때 다시 열기
+                    # (이미 연결된 구독자는 자기 매핑으로 닫힘 표시를 읽으므로 unlink해도 되고,
+                    #  나중에 오는 해지는 링이 달라 새 구독에 영향 없음)
+                    for ring, _ in self.streams.values():
+                        ring.mark_closed()
+                        ring.close()
+                    self._close_device()
+                    self.streams = {}
+                    self.idle_since = timestamp
+                    continue
+                native = (image.shape[1], image.shape[0])
+                for key, (ring, _) in self.streams.items():
+                    seq, slot = ring.begin()
+                    if key == native:
+                        np.copyto(slot, image)
+                    else:
+                        cv2.resize(image, key, dst=slot, interpolation=cv2.INTER_AREA)
+                    ring.commit(seq, timestamp)
+                self.captured += 1
+        if self.exit_when_idle and self.listener is not None:
+            # accept에서 대기 중인 serve_forever를 깨워 종료
+            try:
+                Client(self.address, family='AF_UNIX', authkey=AUTHKEY).close()
+            except OSError:
+                pass
+
+    def _serve(self, connection):
+        # 구독자 연결 하나 - ('subscribe', width, height) / ('stats',) 요청 처리, 끊기면 구독 해지
+        subscriptions = []  # (해상도, 구독한 링)
+        try:
+            while True:
+                request = connection.recv()
+                if request[0] == 'subscribe':
+                    try:
+                        key, ring = self.subscribe(request[1], request[2])
+                    except RuntimeError as e:
+                        connection.send(('error', str(e)))
+                        continue
+                    subscriptions.append((key, ring))
+                    connection.send(('ok', ring.name))
+                elif request[0] == 'stats':
+                    connection.send(('ok', self.stats()))
+                else:
+                    connection.send(('error', f"알 수 없는 요청: {request[0]}"))
+        except (EOFError, OSError):
+            pass
+        finally:
+            for key, ring in subscriptions:
+                self.unsubscribe(key, ring)
+            connection.close()
+
+    def serve_forever(self):
+        """
+        소켓을 열고 구독 요청 처리 (close 또는 SIGTERM까지)
+        """
+        if os.path.exists(self.address):
+            # 이미 브로커가 돌고 있으면 종료, 아니면 이전 프로세스가 남긴 소켓 파일 정리
+            try:
+                Client(self.address, family='AF_UNIX', authkey=AUTHKEY).close()
+                return
+            except OSError:
+                os.unlink(self.address)
+        self.listener = Listener(self.address, family='AF_UNIX', authkey=AUTHKEY)
+        self.running = True
+        threading.Thread(target=self._capture_loop, name='camera-broker-capture', daemon=True).start()
+        try:
+            while self.running:
+                try:
+                    connection = self.listener.accept()
+                except (OSError, EOFError):
+                    if not self.running:
+                        break
+                    continue
+                threading.Thread(target=self._serve, args=(connection,), name='camera-broker-client',
+                                 daemon=True).start()
+        finally:
+            self.close()
+
+    def stats(self):
+        """
+        Returns:
+            dict: 캡처 프레임 수/FPS, 구독 해상도별 구독 수, 장치 열기 횟수와 평균 열기 시간(ms)
+        """
+        with self.condition:
+            elapsed = time.monotonic() - self.started_at
+            return {
+                'captured': self.captured,
+                'capture_fps': self.captured / elapsed if elapsed > 0 else 0.0,
+                'streams': {f"{width}x{height}": count for (width, height), (_, count) in self.streams.items()},
+                'device_open': self.capture is not None,
+                'opened': self.opened,
+                'avg_open_ms': self.open_seconds / self.opened * 1000 if self.opened else 0.0,
+            }
+
+    def close(self):
+        """
+        장치를 닫고 링과 소켓 정리
+        """
+        with self.condition:
+            self.running = False
+            for ring, _ in self.streams.values():
+                ring.mark_closed()
+                ring.close()
+            self.streams = {}
+            self._close_device()
+            self.condition.notify_all()
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+
+
+def run_broker(device=0, address=None, width=None, height=None, fps=None, slots=4, idle_timeout=5.0,
+               exit_when_idle=False):
+    """
+    브로커 프로세스 진입점 (SIGTERM을 받으면 링/소켓을 정리하고 종료)
+    """
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    CameraBroker(device, address, width, height, fps, slots, idle_timeout, exit_when_idle).serve_forever()
+
+
+_spawned = {}
+_spawned_lock = threading.Lock()
+
+
+def connect_broker(device=0, address=None, spawn=True, timeout=5.0, idle_timeout=5.0):
+    """
+    브로커에 연결 (없으면 spawn=True일 때 브로커 프로세스를 띄움)
+    - 띄운 브로커는 이 프로세스와 분리된 세션에서 실행되어 이 프로세스가 끝나도 다른 구독자에게 계속 공급하고,
+      구독자가 모두 떠난 뒤 idle_timeout이 지나면 스스로 종료
+    Args:
+        device (int | str): 카메라 번호, 비디오 파일 경로 또는 'synthetic'
+        address (str, optional): Unix 소켓 경로
+        spawn (bool): 브로커가 없으면 띄울지 여부
+        timeout (float): 띄운 브로커에 연결될 때까지 기다릴 최대 시간 (초)
+        idle_timeout (float): 띄울 브로커의 idle_timeout (초)
+    Returns:
+        multiprocessing.connection.Connection: 브로커 연결
+    Raises:
+        OSError: 브로커가 없고 spawn=False인 경우
+        TimeoutError: 띄운 브로커에 timeout 안에 연결하지 못한 경우
+    """
+    address = address or broker_address(device)
+    try:
+        return Client(address, family='AF_UNIX', authkey=AUTHKEY)
+    except OSError:
+        if not spawn:
+            raise
+
+    with _spawned_lock:
+        process = _spawned.get(address)
+        if process is None or process.poll() is not None:
+            command = [sys.executable, os.path.abspath(__file__), '--device', str(device), '--address', address,
+                       '--idle-timeout', str(idle_timeout), '--exit-when-idle']
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, start_new_session=True)
+            _spawned[address] = process
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, family='AF_UNIX', authkey=AUTHKEY)
+        except OSError:
+            if time.monotonic() >= deadline or process.poll() is not None:
+                raise TimeoutError(f"카메라 브로커에 연결할 수 없습니다: {address}")
+            time.sleep(0.02)
+
+
+class BrokerCapture:
+    """
+    브로커가 공유 메모리에 올리는 프레임을 읽는 프레임 소스 (ThreadedCapture와 같은 인터페이스)
+    - 장치를 직접 열지 않으므로 여러 페이지/프로세스가 같은 카메라를 동시에 사용
+    - 해상도(width/height)별로 브로커가 한 번 줄여 둔 링을 구독하고, fps는 읽는 쪽에서 간격을 맞춤
+    - 프레임은 공유 메모리 슬롯을 그대로 가리킴 (이후 slots - 1 프레임 동안 유효, 더 오래 들고 있으려면 copy=True)
+    """
+
+    def __init__(self, device=0, width=None, height=None, fps=None, address=None, copy=False, spawn=True,
+                 poll_interval=0.002):
+        """
+        Args:
+            device (int | str): 카메라 번호, 비디오 파일 경로 또는 'synthetic'
+            width (int, optional): 받을 프레임 너비 (없으면 원본)
+            height (int, optional): 받을 프레임 높이 (없으면 원본)
+            fps (float, optional): 받을 최대 FPS (없으면 캡처되는 대로)
+            address (str, optional): 브로커 Unix 소켓 경로
+            copy (bool): 프레임을 복사해서 돌려줄지 여부
+            spawn (bool): 브로커가 없으면 자식 프로세스로 시작할지 여부
+            poll_interval (float): 새 프레임 확인 간격 (초)
+        """
+        self.device = device
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.address = address
+        self.copy = copy
+        self.spawn = spawn
+        self.poll_interval = poll_interval
+        self.min_interval = 1.0 / fps if fps else 0.0
+        self.connection = None
+        self.ring = None
+        self.running = False
+        self.first_seq = 0
+        self.last_seq = 0
+        self.last_delivered_at = None
+        self.delivered = 0
+        self.skipped = 0
+        self.age_total = 0.0
+        self.last_age = 0.0
+        self.attach_seconds = 0.0
+        self.started_at = None
+
+    def start(self):
+        """
+        브로커에 연결해 해상도 구독
+        Returns:
+            BrokerCapture: 자기 자신 (장치를 열 수 없으면 isOpened()가 False)
+        """
+        start = time.perf_counter()
+        self.started_at = time.monotonic()
+        try:
+            self.connection = connect_broker(self.device, self.address, self.spawn)
+            self.connection.send(('subscribe', self.width, self.height))
+            status, value = self.connection.recv()
+            if status != 'ok':
+                raise RuntimeError(value)
+            self.ring = FrameRing.attach(value)
+        except (OSError, EOFError, RuntimeError, TimeoutError):
+            self.release()
+            return self
+        # 이미 공급 중인 링이면 가장 최근 프레임부터 바로 전달 (단계 전환 때 다음 캡처를 기다리지 않음)
+        self.first_seq = self.last_seq = max(0, self.ring.latest - 1)
+        self.running = True
+        self.attach_seconds = time.perf_counter() - start
+        return self
+
+    def read_frame(self, timeout=1.0):
+        """
+        아직 받지 않은 가장 최근 프레임을 기다려 반환
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        Returns:
+            Frame | None: 프레임 (브로커가 장치를 닫았거나 시간 초과면 None)
+        """
+        if not self.running:
+            return None
+        deadline = time.monotonic() + timeout
+        if self.last_delivered_at is not None and self.min_interval:
+            # 구독 FPS에 맞춰 다음 전달 시각까지 대기
+            wait = min(self.last_delivered_at + self.min_interval, deadline) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+        while True:
+            ring = self.ring
+            if ring.closed:
+                self.running = False
+                return None
+            seq = ring.latest
+            if seq > self.last_seq:
+                slot = ring.read(seq)
+                if slot is not None:
+                    image, timestamp = slot
+                    if self.copy:
+                        image = image.copy()
+                    if not self.copy or ring.valid(seq):
+                        self.skipped += seq - self.last_seq - 1
+                        self.last_seq = seq
+                        now = time.monotonic()
+                        self.last_delivered_at = now
+                        self.delivered += 1
+                        self.last_age = now - timestamp
+                        self.age_total += self.last_age
+                        return Frame(image, timestamp, seq)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+    def read(self):
+        """
+        cv2.VideoCapture.read와 같은 형식
+        Returns:
+            tuple: (성공 여부, BGR 프레임)
+        """
+        frame = self.read_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def isOpened(self):
+        return self.running
+
+    def set(self, prop, value):
+        # 장치 설정은 브로커가 소유하므로 구독자는 바꾸지 않음
+        return False
+
+    def release(self):
+        """
+        구독 해지 (장치는 브로커가 idle_timeout 뒤 닫음)
+        """
+        self.running = False
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def stats(self):
+        """
+        Returns:
+            dict: ThreadedCapture.stats와 같은 형식 + 구독 연결 시간(ms)
+        """
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        captured = self.last_seq - self.first_seq
+        return {
+            'captured': captured,
+            'delivered': self.delivered,
+            'skipped': self.skipped,
+            'capture_fps': captured / elapsed if elapsed > 0 else 0.0,
+            'last_age_ms': self.last_age * 1000,
+            'avg_age_ms': self.age_total / self.delivered * 1000 if self.delivered else 0.0,
+            'attach_ms': self.attach_seconds * 1000,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카메라 공유 메모리 브로커")
+    parser.add_argument('--device', default='0', help="카메라 번호, 비디오 파일 경로 또는 synthetic")
+    parser.add_argument('--address', default=None, help="Unix 소켓 경로 (기본값: 장치별 임시 경로)")
+    parser.add_argument('--width', type=int, default=None)
+    parser.add_argument('--height', type=int, default=None)
+    parser.add_argument('--fps', type=int, default=None)
+    parser.add_argument('--slots', type=int, default=4)
+    parser.add_argument('--idle-timeout', type=float, default=5.0, help="구독자가 없을 때 장치를 열어 둘 시간 (초)")
+    parser.add_argument('--exit-when-idle', action='store_true', help="장치를 닫을 때 브로커도 종료")
+    args = parser.parse_args()
+
+    device = int(args.device) if args.device.isdigit() else args.device
+    address = args.address or broker_address(device)
+    print(f"camera broker for {device} on {address}", flush=True)
+    run_broker(device, address, args.width, args.height, args.fps, args.slots, args.idle_timeout,
+               args.exit_when_idle)
+
+
+if __name__ == '__main__':
+    main()
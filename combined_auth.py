@@ -0,0 +1,138 @@
+import streamlit as st
+import cv2
+import time
+from face import FaceAuthentication, REGISTERED_FACES_DIR, record_face_attempt
+from gesture_auth import GestureAuthSystem
+from frame_pipeline import FramePipeline
+from preview import PreviewChannel
+from model_pool import face_detector_pool, gesture_recognizer_pool, read_model
+from frame_source import open_source
+from auth_engine import CombinedAuthEngine, FaceAuthEngine, GestureSequenceEngine, ACCEPTED, REJECTED, show_event
+from audit import FAILURE, ERROR
+
+
+class CombinedAuthentication:
+    """
+    얼굴 인증과 제스처 인증을 카메라 하나로 동시에 진행하는 로그인
+    - 얼굴 인증 후 카메라를 닫고 제스처 인증을 새로 시작하는 대신, 제스처를 취하는 동안 같은 프레임으로 얼굴을 인증
+    - 얼굴 매칭/인코더는 FaceAuthentication, 제스처 저장소/확정 정책/감사 기록은 GestureAuthSystem 설정을 그대로 사용
+    """
+
+    def __init__(self, faces_dir=REGISTERED_FACES_DIR, db_path="./gesture_auth.db",
+                 model_path='gesture_recognizer.task', capture_fps=30, inference_size=(320, 240),
+                 display_size=(640, 480), audit=None, executor=None, batcher=None, face=None, gesture=None):
+        """
+        Args:
+            faces_dir (str): 등록 얼굴 디렉토리 (face가 없을 때 사용)
+            db_path (str): 제스처 데이터베이스 경로 (gesture가 없을 때 사용)
+            model_path (str): 제스처 인식 모델 파일 경로 (gesture가 없을 때 사용)
+            capture_fps (int): 요청할 카메라 FPS
+            inference_size (tuple): 제스처 인식용 (width, height) (얼굴은 캡처 해상도 그대로 사용)
+            display_size (tuple): 화면 표시용 (width, height)
+            audit (AuditLog, optional): 인증 시도 기록 (기본값: 프로세스 전역 감사 로그)
+            executor (EncodingExecutor, optional): 얼굴 인코딩 프로세스 풀
+            batcher (EncodingBatcher, optional): 얼굴 인코딩 배치 스케줄러
+            face (FaceAuthentication, optional): 얼굴 인증 설정 (기본값: faces_dir로 생성)
+            gesture (GestureAuthSystem, optional): 제스처 인증 설정 (기본값: db_path로 생성)
+        """
+        self.face = face or FaceAuthentication(faces_dir, audit=audit, executor=executor, batcher=batcher)
+        self.gesture = gesture or GestureAuthSystem(db_path, inference_size=inference_size, model_path=model_path,
+                                                    capture_fps=capture_fps, display_size=display_size, audit=audit)
+        self.capture_fps = capture_fps
+        self.display_size = display_size
+        self.decision = None  # 마지막 세션의 결정 (얼굴 결정, 제스처, 손 소유 확인 집계)
+        self.stream_stats = None  # 마지막 세션의 프레임 제출 통계
+        self.preview_stats = None  # 마지막 세션의 미리보기 전송 통계
+        self.capture_stats = None  # 마지막 세션의 캡처 통계 (FPS, 프레임 나이, 건너뛴 프레임)
+
+    def authenticate(self, user_id, stframe=None, source=None):
+        """
+        얼굴 + 제스처 동시 인증
+        Args:
+            user_id (str): 주장된 사용자 ID (얼굴 1:1 검증과 제스처 검증에 사용)
+            stframe (optional): 프레임을 표시할 Streamlit placeholder
+            source (optional): 프레임 소스 (카메라 번호, 비디오/이미지 디렉토리 경로, 'synthetic' 또는 소스 객체)
+        Returns:
+            bool: 두 인증 모두 성공하고 제스처 손이 인증한 얼굴의 손이면 True
+        """
+        try:
+            read_model(self.gesture.model_path)
+        except FileNotFoundError:
+            st.error("제스처 인식 모델 파일을 찾을 수 없습니다.")
+            return False
+
+        st.info("카메라를 바라본 채로 제스처를 순서대로 취해주세요. 얼굴은 제스처를 입력하는 동안 함께 인증됩니다.")
+        stframe = stframe if stframe is not None else st.empty()
+        face_placeholder = st.empty()  # 얼굴 인증 결과 표시 영역
+        status_placeholder = st.empty()  # 제스처 진행/최종 결과 표시 영역
+        # 카메라 하나를 두 엔진이 함께 사용 (얼굴 품질을 위해 캡처 해상도는 줄이지 않고, 제스처 인식만 축소)
+        video_capture = open_source(source, fps=self.capture_fps)
+        preview = PreviewChannel(stframe)
+        pipeline = FramePipeline(display_size=self.display_size)
+
+        detectors = face_detector_pool(model_selection=0, min_detection_confidence=0.8)
+        with detectors.lease() as detector, gesture_recognizer_pool(self.gesture.model_path).lease() as recognizer:
+            face_engine = FaceAuthEngine(detector, mode='verify', matcher=self.face.matcher,
+                                         identifier=self.face.identifier, user_id=user_id,
+                                         reuse_detections=self.face.reuse_detections, max_wait=self.face.max_wait,
+                                         encoder=self.face.encoder)
+            gesture_engine = GestureSequenceEngine(recognizer, steps=self.gesture.steps,
+                                                   commit_policy=self.gesture.commit_policy,
+                                                   inference_size=self.gesture.inference_size,
+                                                   results=self.gesture.gesture_results)
+            engine = CombinedAuthEngine(face_engine, gesture_engine)
+            started = time.perf_counter()
+            self.gesture.start_time = time.time()
+            for event in engine.start(self.gesture.start_time):
+                show_event(event, status_placeholder)
+
+            try:
+                while video_capture.isOpened() and not engine.done:
+                    captured = video_capture.read_frame()
+                    if captured is None:
+                        st.error("카메라에서 프레임을 읽을 수 없습니다.")
+                        break
+                    frame = captured.image
+
+                    for event in engine.process(frame, int(captured.timestamp * 1000)):
+                        show_event(event, face_placeholder if event.kind.startswith('face_') else status_placeholder)
+
+                    display_frame = pipeline.for_display(frame)
+                    if self.gesture.current_gesture:
+                        cv2.putText(display_frame, f"Detected: {self.gesture.current_gesture}",
+                                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    preview.publish(display_frame)
+
+            except Exception as e:
+                st.error(f"동시 인증 중 오류 발생: {str(e)}")
+                self.gesture.record_attempt('verify', user_id, ERROR, 'exception', gesture_engine)
+                return False
+            finally:
+                # 얼굴 작업 스레드가 검출기를 다 쓴 뒤에 반납
+                engine.close()
+                self.capture_stats = video_capture.stats()
+                video_capture.release()
+                stframe.empty()
+                self.stream_stats = engine.stats()
+                self.preview_stats = preview.stats()
+
+        self.decision = engine.decision
+        # 제스처 쪽 결정으로 먼저 끝났으면 얼굴은 결정 전이므로 카메라 오류로 남기지 않음
+        if face_engine.done or not engine.done:
+            record_face_attempt(self.face.audit, 'verify', user_id, face_engine, started)
+
+        if engine.state == ACCEPTED:
+            result = self.gesture.verify_gestures(user_id, engine.decision['gestures'], gesture_engine)
+            status_placeholder.info(result)
+            return "성공" in result
+        if engine.state == REJECTED:
+            reason = engine.decision['reason']
+            if reason == 'hand_not_owned':
+                self.gesture.record_attempt('verify', user_id, FAILURE, reason, gesture_engine,
+                                            binding=engine.decision['binding'])
+            elif reason == 'unrecognized_step':
+                self.gesture.record_attempt('verify', user_id, FAILURE, reason, gesture_engine)
+        else:
+            # 결정 전에 카메라가 끊김
+            self.gesture.record_attempt('verify', user_id, ERROR, 'camera', gesture_engine)
+        return False
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# 연결마다 적용할 PRAGMA
+# - WAL: 읽기와 쓰기가 서로를 막지 않아 동시 세션이 파일 잠금에 줄 서지 않음
+# - synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 손상되지 않음 (전원 장애 시 마지막 커밋만 유실 가능)
+# - cache_size 음수: KiB 단위 페이지 캐시 크기
+DEFAULT_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -8192),
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', 5000),
+)
+
+# 연결별로 재사용할 준비된 문장(prepared statement) 수
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionPool:
+    """
+    SQLite 스레드별 연결 풀
+    - 스레드마다 연결을 하나씩 열어 계속 재사용 (쿼리마다 connect/close 하지 않음)
+    - 같은 연결에서 같은 SQL 문자열은 sqlite3 문장 캐시로 다시 파싱하지 않음
+    - 종료된 스레드(예: Streamlit 재실행)의 연결은 회수해 새 스레드에 넘겨줌
+    - 연결을 열 때 WAL/동기화/캐시 PRAGMA를 한 번만 적용
+    """
+
+    def __init__(self, db_path, pragmas=DEFAULT_PRAGMAS, statement_cache_size=STATEMENT_CACHE_SIZE):
+        """
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            pragmas (tuple): 연결마다 적용할 (이름, 값) 목록
+            statement_cache_size (int): 연결별 문장 캐시 크기
+        """
+        self.db_path = db_path
+        self.pragmas = pragmas
+        self.statement_cache_size = statement_cache_size
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.owners = {}  # 스레드 -> 연결
+        self.idle = []  # 종료된 스레드에서 회수한 연결
+        self.opened = 0
+        self.reclaimed = 0
+        self.closed = False
+
+    def _connect(self):
+        # 회수한 연결을 다른 스레드에서 쓰므로 check_same_thread는 끔 (한 번에 한 스레드만 사용)
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False,
+                               cached_statements=self.statement_cache_size)
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        self.opened += 1
+        return conn
+
+    def _reclaim(self):
+        for thread, conn in list(self.owners.items()):
+            if not thread.is_alive():
+                del self.owners[thread]
+                self.idle.append(conn)
+                self.reclaimed += 1
+
+    def connection(self):
+        """
+        현재 스레드의 연결 (닫지 말 것)
+        Returns:
+            sqlite3.Connection: 연결
+        """
+        conn = getattr(self.local, 'connection', None)
+        if conn is not None:
+            return conn
+
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("연결 풀이 닫혔습니다.")
+            self._reclaim()
+            conn = self.idle.pop() if self.idle else self._connect()
+            self.owners[threading.current_thread()] = conn
+        self.local.connection = conn
+        return conn
+
+    def execute(self, sql, params=()):
+        """
+        쿼리 실행 (자동 커밋하지 않음 - 쓰기는 transaction 안에서 실행)
+        Returns:
+            sqlite3.Cursor: 커서
+        """
+        return self.connection().execute(sql, params)
+
+    def fetchone(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchone()
+
+    def fetchall(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        """
+        블록이 정상 종료하면 커밋, 예외면 롤백
+        """
+        conn = self.connection()
+        with conn:
+            yield conn
+
+    def close(self):
+        """
+        모든 연결 닫기 (다른 스레드가 사용 중이 아닐 때 호출)
+        """
+        with self.lock:
+            self.closed = True
+            for conn in list(self.owners.values()) + self.idle:
+                conn.close()
+            self.owners.clear()
+            self.idle = []
+
+    def stats(self):
+        """
+        Returns:
+            dict: 연 연결 수, 사용 중/유휴 연결 수, 회수 횟수
+        """
+        with self.lock:
+            return {
+                'opened': self.opened,
+                'in_use': len(self.owners),
+                'idle': len(self.idle),
+                'reclaimed': self.reclaimed,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path):
+    """
+    데이터베이스 파일별 프로세스 전역 연결 풀
+    Args:
+        db_path (str): SQLite 데이터베이스 파일 경로
+    Returns:
+        ConnectionPool: 연결 풀
+    """
+    path = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None or pool.closed:
+            pool = ConnectionPool(path)
+            _pools[path] = pool
+        return pool
+
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def migrate(db_path, migrations):
+    """
+    PRAGMA user_version 기준 스키마 마이그레이션 (프로세스당 파일별 한 번만 실행)
+    - migrations[i]를 적용하면 user_version이 i + 1이 됨
+    - 각 단계는 BEGIN IMMEDIATE 트랜잭션 안에서 실행되고, 실패하면 그 단계 전체를 롤백
+    - 여러 프로세스가 동시에 시작해도 잠금을 잡은 뒤 버전을 다시 읽으므로 한 번만 적용
+    - 이미 최신이면 PRAGMA 한 번만 읽고 끝남 (재실행마다 테이블 구조를 조사하지 않음)
+    - SQL로 표현할 수 없는 데이터 변환은 연결을 받는 함수로 단계에 넣을 수 있음
+    Args:
+        db_path (str): SQLite 데이터베이스 파일 경로
+        migrations (list): 단계별 SQL 문(또는 conn을 받는 함수) 튜플 목록 (순서대로 적용)
+    Returns:
+        int: 적용 후 스키마 버전
+    """
+    path = os.path.abspath(db_path)
+    key = (path, len(migrations))
+    if key in _migrated:
+        return len(migrations)
+
+    with _migrate_lock:
+        if key in _migrated:
+            return len(migrations)
+
+        conn = get_pool(path).connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        while version < len(migrations):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < len(migrations):
+                    for statement in migrations[version]:
+                        if callable(statement):
+                            statement(conn)
+                        else:
+                            conn.execute(statement)
+                    version += 1
+                    conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        _migrated.add(key)
+        return version
@@ -0,0 +1,220 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from encode_executor import dlib_encode_batch, get_encoding_executor
+
+# 배치 대기 시간 환경 변수 (ms, 0이면 배치 없이 요청마다 인코딩)
+BATCH_WINDOW_ENV = 'FACE_ENCODE_BATCH_MS'
+# 동시 요청이 많은 곳(HTTP 서비스, 세션 관리자)에서 쓰는 배치 대기 시간 (ms)
+SERVICE_BATCH_MS = 5
+# 최대 배치 크기 환경 변수
+BATCH_SIZE_ENV = 'FACE_ENCODE_BATCH_SIZE'
+
+
+class EncodingBatcher:
+    """
+    얼굴 인코딩 마이크로 배치 스케줄러
+    - 동시에 들어온 인코딩 요청을 max_delay_ms(첫 요청 기준) 또는 max_batch개까지 모아 배치 인코딩 한 번으로 처리
+    - 결과는 요청별 Future로 나눠 돌려줌
+    - executor가 있으면 배치를 워커 프로세스에 넘기고 바로 다음 배치를 모음 (여러 배치가 동시에 처리됨)
+    - max_delay_ms를 늘리면 배치가 커져 처리량이 늘고, 줄이면 추가 지연이 줄어듦 (configure로 실행 중 조정)
+    - 배치 크기 분포, 배치 대기(추가 지연), 배치 처리 시간 집계 (배치 스레드와 결과 스레드가 함께 갱신하므로 condition 안에서)
+    """
+
+    def __init__(self, batch_encoder=dlib_encode_batch, executor=None, max_batch=8, max_delay_ms=5.0):
+        """
+        Args:
+            batch_encoder (callable): (프레임 리스트, 박스 리스트) -> 프레임별 인코딩 리스트 (executor가 없을 때 사용)
+            executor (EncodingExecutor, optional): 배치를 실행할 프로세스 풀 (submit_batch 사용)
+            max_batch (int): 최대 배치 크기 (executor가 있으면 공유 메모리 슬롯 수 이하로 제한)
+            max_delay_ms (float): 첫 요청 이후 배치를 모으는 최대 시간 (ms)
+        """
+        self.batch_encoder = batch_encoder
+        self.executor = executor
+        self.condition = threading.Condition()
+        self.pending = deque()  # (프레임, 박스, Future, 요청 시각)
+        self.closed = False
+        self.configure(max_batch, max_delay_ms)
+
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.batches = 0
+        self.full_batches = 0  # 크기가 차서 보낸 배치 수 (나머지는 대기 시간 만료)
+        self.batch_sizes = {}  # 배치 크기 -> 횟수
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.encode_total = 0.0
+        self.thread = threading.Thread(target=self._run, name='encode-batcher', daemon=True)
+        self.thread.start()
+
+    def configure(self, max_batch=None, max_delay_ms=None):
+        """
+        처리량/지연 균형 조정
+        Args:
+            max_batch (int, optional): 최대 배치 크기
+            max_delay_ms (float, optional): 배치를 모으는 최대 시간 (ms)
+        """
+        with self.condition:
+            if max_batch is not None:
+                if self.executor is not None:
+                    max_batch = min(max_batch, len(self.executor.slots))
+                self.max_batch = max(1, max_batch)
+            if max_delay_ms is not None:
+                self.max_delay = max_delay_ms / 1000
+            self.condition.notify()
+
+    def submit(self, rgb_frame, face_locations=None):
+        """
+        인코딩 요청 (배치에 넣고 바로 반환)
+        Args:
+            rgb_frame (numpy.ndarray): RGB 프레임
+            face_locations (list, optional): (top, right, bottom, left) 박스 (없으면 HOG로 검출)
+        Returns:
+            Future: 얼굴 인코딩 리스트를 돌려줄 Future
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("배치 스케줄러가 종료되었습니다.")
+            self.pending.append((rgb_frame, face_locations, future, time.monotonic()))
+            self.requests += 1
+            self.condition.notify()
+        return future
+
+    def encode(self, rgb_frame, detections=None):
+        """
+        동기 인코딩 (FaceAuthEngine의 encoder와 같은 형식)
+        Args:
+            rgb_frame (numpy.ndarray): RGB 프레임
+            detections (list, optional): MediaPipe detections (있으면 그 박스를 그대로 사용)
+        Returns:
+            list: 얼굴 인코딩 리스트
+        """
+        from auth_engine import detections_to_face_locations
+        face_locations = detections_to_face_locations(detections, rgb_frame.shape) if detections else None
+        return self.submit(rgb_frame, face_locations).result()
+
+    def _collect(self):
+        # 첫 요청을 기다린 뒤, 배치가 차거나 첫 요청 기준 max_delay가 지날 때까지 모음
+        with self.condition:
+            while not self.pending and not self.closed:
+                self.condition.wait()
+            if not self.pending:
+                return None
+            deadline = self.pending[0][3] + self.max_delay
+            while len(self.pending) < self.max_batch and not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            batch = [self.pending.popleft() for _ in range(min(self.max_batch, len(self.pending)))]
+            if len(batch) == self.max_batch:
+                self.full_batches += 1
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            dispatched = time.monotonic()
+            waits = [dispatched - requested for _, _, _, requested in batch]
+            with self.condition:
+                self.batches += 1
+                self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+                self.wait_total += sum(waits)
+                self.wait_max = max(self.wait_max, max(waits))
+
+            frames = [frame for frame, _, _, _ in batch]
+            locations_list = [face_locations for _, face_locations, _, _ in batch]
+            futures = [future for _, _, future, _ in batch]
+            try:
+                if self.executor is not None:
+                    inner = self.executor.submit_batch(frames, locations_list)
+                    inner.add_done_callback(lambda done, futures=futures: self._fan_out(done, futures, dispatched))
+                else:
+                    result = Future()
+                    try:
+                        result.set_result(self.batch_encoder(frames, locations_list))
+                    except Exception as e:
+                        result.set_exception(e)
+                    self._fan_out(result, futures, dispatched)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+
+    def _fan_out(self, done, futures, dispatched):
+        # 배치 결과를 요청별 Future로 나눔 (executor 결과 스레드에서도 호출)
+        with self.condition:
+            self.encode_total += time.monotonic() - dispatched
+        try:
+            results = done.result()
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, encodings in zip(futures, results):
+            future.set_result(encodings)
+
+    def stats(self):
+        """
+        Returns:
+            dict: 요청/배치 수, 평균 배치 크기, 배치 크기 분포, 평균/최대 배치 대기(추가 지연 ms), 평균 배치 처리 시간(ms)
+        """
+        with self.condition:
+            elapsed = time.monotonic() - self.started_at
+            batched = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'full_batches': self.full_batches,
+                'avg_batch': batched / self.batches if self.batches else 0.0,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'avg_wait_ms': self.wait_total / batched * 1000 if batched else 0.0,
+                'max_wait_ms': self.wait_max * 1000,
+                'avg_batch_ms': self.encode_total / self.batches * 1000 if self.batches else 0.0,
+                'requests_per_sec': batched / elapsed if elapsed > 0 else 0.0,
+                'max_batch': self.max_batch,
+                'max_delay_ms': self.max_delay * 1000,
+            }
+
+    def close(self):
+        """
+        남은 요청을 처리하고 스레드 종료
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join(timeout=5.0)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_encoding_batcher(default_ms=0):
+    """
+    프로세스 전역 배치 스케줄러 (Streamlit 재실행/세션 간에 공유)
+    - FACE_ENCODE_BATCH_MS (기본값 default_ms, 0이면 사용하지 않음), FACE_ENCODE_BATCH_SIZE (기본값 8)
+    - 단일 사용자 화면은 배치로 얻는 것이 없으므로 기본은 꺼짐, 동시 요청을 받는 곳만 SERVICE_BATCH_MS로 켬
+    - 프로세스 전역 인코딩 실행기가 있으면 배치를 워커 프로세스에서 실행
+    Args:
+        default_ms (float): 환경 변수가 없을 때의 배치 대기 시간 (ms)
+    Returns:
+        EncodingBatcher | None: 배치 스케줄러 (0이면 None)
+    """
+    global _batcher
+    window_ms = float(os.environ.get(BATCH_WINDOW_ENV, default_ms))
+    if window_ms <= 0:
+        return None
+    with _batcher_lock:
+        if _batcher is None or _batcher.closed:
+            _batcher = EncodingBatcher(executor=get_encoding_executor(),
+                                       max_batch=int(os.environ.get(BATCH_SIZE_ENV, '8')),
+                                       max_delay_ms=window_ms)
+            atexit.register(_batcher.close)
+        return _batcher
@@ -0,0 +1,390 @@
+import atexit
+import os
+import queue
+import threading
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# 워커 수 환경 변수 (0이면 프로세스 풀 없이 호출한 스레드에서 인코딩)
+WORKERS_ENV = 'FACE_ENCODE_WORKERS'
+# 기본 워커 수 (워커마다 공유 메모리 슬롯 2개 - 코어 수만큼 늘리면 작은 /dev/shm에서 부족해짐)
+DEFAULT_WORKERS = 2
+# 공유 메모리 슬롯 하나에 담을 수 있는 최대 프레임 (height, width, channels) - 더 크면 직렬화로 전달
+SLOT_SHAPE = (1080, 1920, 3)
+
+
+def dlib_encode(rgb_frame, face_locations):
+    """
+    기본 인코더 - face_recognition(dlib)으로 얼굴 인코딩 계산
+    Args:
+        rgb_frame (numpy.ndarray): RGB 프레임
+        face_locations (list | None): (top, right, bottom, left) 박스 (None이면 HOG로 검출)
+    Returns:
+        list: 얼굴 인코딩 리스트
+    """
+    import face_recognition
+    if face_locations is None:
+        face_locations = face_recognition.face_locations(rgb_frame)
+    return face_recognition.face_encodings(rgb_frame, face_locations)
+
+
+def dlib_encode_batch(frames, locations_list):
+    """
+    기본 배치 인코더 - 여러 프레임의 얼굴을 dlib 배치 API 한 번으로 인코딩
+    - 랜드마크는 프레임마다 구하고, 128차원 descriptor는 compute_face_descriptor(이미지 리스트) 한 번으로 계산
+    - 배치 API가 없는 dlib 버전이거나 face_recognition 내부 함수(_raw_face_landmarks, face_encoder)가 없으면
+      프레임별 face_encodings로 대체
+    Args:
+        frames (list): RGB 프레임 리스트
+        locations_list (list): 프레임별 (top, right, bottom, left) 박스 리스트 (None이면 HOG로 검출)
+    Returns:
+        list: 프레임별 얼굴 인코딩 리스트
+    """
+    import dlib
+    import face_recognition
+    from face_recognition import api
+
+    raw_face_landmarks = getattr(api, '_raw_face_landmarks', None)
+    face_encoder = getattr(api, 'face_encoder', None)
+    if raw_face_landmarks is None or face_encoder is None:
+        return [dlib_encode(frame, face_locations) for frame, face_locations in zip(frames, locations_list)]
+
+    try:
+        landmarks = []
+        for frame, face_locations in zip(frames, locations_list):
+            if face_locations is None:
+                face_locations = face_recognition.face_locations(frame)
+            landmarks.append(dlib.full_object_detections(raw_face_landmarks(frame, face_locations, model='small')))
+        descriptors = face_encoder.compute_face_descriptor(list(frames), landmarks, 1)
+    except (TypeError, AttributeError, RuntimeError):
+        return [dlib_encode(frame, face_locations) for frame, face_locations in zip(frames, locations_list)]
+    return [[np.array(descriptor) for descriptor in per_frame] for per_frame in descriptors]
+
+
+def dlib_encode_file(path):
+    """
+    기본 파일 인코더 - 이미지 파일의 첫 번째 얼굴 인코딩 (face_store.encode_image_file과 동일)
+    """
+    from face_store import encode_image_file
+    return encode_image_file(path)
+
+
+# 워커 프로세스 전역 상태
+_worker_encoder = None
+_worker_batch_encoder = None
+_worker_segments = {}  # 슬롯 번호 -> (공유 메모리 이름, 연결된 SharedMemory) (워커 수명 동안 재사용)
+
+
+def _init_worker(encoder, batch_encoder):
+    # 워커 시작 시 한 번 실행 - 인코더 모듈(dlib 모델 포함)을 미리 불러 첫 요청 지연 제거
+    global _worker_encoder, _worker_batch_encoder
+    _worker_encoder = encoder
+    _worker_batch_encoder = batch_encoder
+    if encoder is dlib_encode:
+        import face_recognition  # noqa: F401
+
+
+def _shared_frame(index, name, shape, dtype):
+    # 공유 메모리 슬롯의 프레임을 복사 없이 바라보는 배열
+    # 슬롯이 더 큰 프레임용으로 다시 만들어져 이름이 바뀌었으면 이전 연결을 닫음
+    cached = _worker_segments.get(index)
+    if cached is None or cached[0] != name:
+        if cached is not None:
+            cached[1].close()
+        cached = _worker_segments[index] = (name, SharedMemory(name=name))
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=cached[1].buf)
+
+
+def _encode_shared(index, name, shape, dtype, face_locations, queued_at):
+    started = time.time()
+    encodings = _worker_encoder(_shared_frame(index, name, shape, dtype), face_locations)
+    return os.getpid(), queued_at, started, time.time(), encodings
+
+
+def _encode_shared_batch(items, queued_at):
+    # items: (슬롯 번호, 슬롯 이름, shape, dtype, 박스) 리스트 - 배치 인코더 한 번으로 처리
+    # (슬롯에 담지 못한 프레임은 (None, 프레임 배열, None, None, 박스)로 직렬화해 전달)
+    started = time.time()
+    frames = [name if index is None else _shared_frame(index, name, shape, dtype)
+              for index, name, shape, dtype, _ in items]
+    encodings = _worker_batch_encoder(frames, [face_locations for _, _, _, _, face_locations in items])
+    return os.getpid(), queued_at, started, time.time(), encodings
+
+
+def _encode_array(frame, face_locations, queued_at):
+    # 슬롯보다 크거나 공유 메모리를 만들 수 없는 프레임은 배열을 직렬화해 전달
+    started = time.time()
+    encodings = _worker_encoder(frame, face_locations)
+    return os.getpid(), queued_at, started, time.time(), encodings
+
+
+def _encode_file(file_encoder, path, queued_at):
+    started = time.time()
+    encoding = file_encoder(path)
+    return os.getpid(), queued_at, started, time.time(), encoding
+
+
+class EncodingExecutor:
+    """
+    프로세스 풀 얼굴 인코딩 실행기
+    - dlib 인코딩을 워커 프로세스에서 실행해 GIL과 Streamlit 스크립트 스레드를 막지 않음
+    - 프레임은 공유 메모리 슬롯에 한 번 복사해 넘김 (배열 직렬화/파이프 전송 없음)
+    - 슬롯은 처음 쓸 때 실제 프레임 크기로 만들고, 더 큰 프레임이 오면 다시 만듦
+    - 공유 메모리를 만들 수 없으면 (/dev/shm 부족 등) 배열을 직렬화해 넘김
+    - 슬롯이 모두 사용 중이면 submit이 기다림 (동시 요청 수 제한)
+    - submit은 Future를 돌려주고, encode는 FaceAuthEngine의 encoder로 바로 쓸 수 있는 동기 버전
+    - 워커별 처리 건수/바쁜 시간으로 사용률 집계
+    """
+
+    def __init__(self, workers=None, slots=None, slot_shape=SLOT_SHAPE, encoder=dlib_encode,
+                 file_encoder=dlib_encode_file, batch_encoder=dlib_encode_batch, start_method='spawn'):
+        """
+        Args:
+            workers (int, optional): 워커 프로세스 수 (기본값: DEFAULT_WORKERS와 CPU 코어 수 중 작은 값)
+            slots (int, optional): 공유 메모리 슬롯 수 = 동시에 처리 중일 수 있는 프레임 수 (기본값: workers * 2)
+            slot_shape (tuple): 슬롯 하나에 담을 최대 프레임 shape (슬롯은 실제 프레임 크기로 만듦)
+            encoder (callable): 워커에서 실행할 (rgb_frame, face_locations) -> 인코딩 리스트 (모듈 최상위 함수)
+            file_encoder (callable): 워커에서 실행할 이미지 경로 -> 인코딩(또는 None) (모듈 최상위 함수)
+            batch_encoder (callable): 워커에서 실행할 (프레임 리스트, 박스 리스트) -> 프레임별 인코딩 리스트
+            start_method (str): 워커 시작 방식 (스레드가 도는 프로세스에서 fork하지 않도록 기본값 'spawn')
+        """
+        self.workers = workers or min(DEFAULT_WORKERS, os.cpu_count() or 1)
+        self.file_encoder = file_encoder
+        self.slot_bytes = int(np.prod(slot_shape))
+        self.slots = [None] * (slots or self.workers * 2)  # 처음 쓸 때 만듦
+        self.free = queue.Queue()
+        for index in range(len(self.slots)):
+            self.free.put(index)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        mp_context=multiprocessing.get_context(start_method),
+                                        initializer=_init_worker, initargs=(encoder, batch_encoder))
+
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.pickled = 0  # 슬롯보다 크거나 공유 메모리가 없어 직렬화로 보낸 프레임 수
+        self.shm_failed = 0  # 공유 메모리를 만들지 못한 횟수
+        self.queue_wait_total = 0.0
+        self.busy_total = 0.0
+        self.worker_stats = {}  # pid -> [처리 건수, 바쁜 시간(초)]
+        self.closed = False
+
+    def submit(self, rgb_frame, face_locations=None, timeout=None):
+        """
+        프레임 인코딩 요청
+        Args:
+            rgb_frame (numpy.ndarray): RGB 프레임
+            face_locations (list, optional): (top, right, bottom, left) 박스 (없으면 워커에서 HOG 검출)
+            timeout (float, optional): 빈 슬롯을 기다릴 최대 시간 (None이면 무한 대기)
+        Returns:
+            Future: 얼굴 인코딩 리스트를 돌려줄 Future
+        Raises:
+            queue.Empty: timeout 안에 빈 슬롯이 없는 경우
+        """
+        if self.closed:
+            raise RuntimeError("인코딩 실행기가 종료되었습니다.")
+
+        if rgb_frame.nbytes <= self.slot_bytes:
+            index = self.free.get(timeout=timeout)
+            segment = self._fill(index, rgb_frame)
+            if segment is not None:
+                inner = self.pool.submit(_encode_shared, index, segment.name, rgb_frame.shape,
+                                         rgb_frame.dtype.str, face_locations, time.time())
+                return self._chain(inner, [index])
+            self.free.put(index)
+
+        with self.lock:
+            self.pickled += 1
+        return self._chain(self.pool.submit(_encode_array, rgb_frame, face_locations, time.time()), [])
+
+    def submit_batch(self, frames, locations_list):
+        """
+        여러 프레임을 워커 한 곳에서 배치 인코더 한 번으로 처리 (EncodingBatcher용)
+        - 슬롯보다 크거나 슬롯 수를 넘거나 공유 메모리를 만들 수 없는 프레임은 그 프레임만 직렬화해 같은 배치로 전달
+        Args:
+            frames (list): RGB 프레임 리스트
+            locations_list (list): 프레임별 박스 리스트
+        Returns:
+            Future: 프레임별 얼굴 인코딩 리스트를 돌려줄 Future
+        """
+        if self.closed:
+            raise RuntimeError("인코딩 실행기가 종료되었습니다.")
+
+        indices = []
+        items = []
+        for frame, face_locations in zip(frames, locations_list):
+            if frame.nbytes <= self.slot_bytes and len(indices) < len(self.slots):
+                index = self.free.get()
+                segment = self._fill(index, frame)
+                if segment is not None:
+                    indices.append(index)
+                    items.append((index, segment.name, frame.shape, frame.dtype.str, face_locations))
+                    continue
+                self.free.put(index)
+            items.append((None, frame, None, None, face_locations))
+        if len(indices) < len(items):
+            with self.lock:
+                self.pickled += len(items) - len(indices)
+        return self._chain(self.pool.submit(_encode_shared_batch, items, time.time()), indices)
+
+    def submit_file(self, path):
+        """
+        이미지 파일 인코딩 요청 (경로만 넘기므로 공유 메모리를 쓰지 않음)
+        Args:
+            path (str): 이미지 파일 경로
+        Returns:
+            Future: 인코딩(얼굴이 없으면 None)을 돌려줄 Future
+        """
+        return self._chain(self.pool.submit(_encode_file, self.file_encoder, path, time.time()), [])
+
+    def encode(self, rgb_frame, detections=None):
+        """
+        동기 인코딩 (FaceAuthEngine의 encoder와 같은 형식)
+        - 결과를 기다리는 동안 GIL을 놓으므로 다른 세션 스레드는 계속 진행
+        Args:
+            rgb_frame (numpy.ndarray): RGB 프레임
+            detections (list, optional): MediaPipe detections (있으면 그 박스를 그대로 사용)
+        Returns:
+            list: 얼굴 인코딩 리스트
+        """
+        from auth_engine import detections_to_face_locations
+        face_locations = detections_to_face_locations(detections, rgb_frame.shape) if detections else None
+        return self.submit(rgb_frame, face_locations).result()
+
+    def _fill(self, index, rgb_frame):
+        # 슬롯에 프레임 복사 (슬롯이 없거나 작으면 프레임 크기로 새로 만듦, 만들 수 없으면 None)
+        segment = self.slots[index]
+        if segment is None or segment.size < rgb_frame.nbytes:
+            if segment is not None:
+                self.slots[index] = None
+                segment.close()
+                segment.unlink()
+            segment = self._allocate(rgb_frame.nbytes)
+            if segment is None:
+                return None
+            self.slots[index] = segment
+        view = np.ndarray(rgb_frame.shape, dtype=rgb_frame.dtype, buffer=segment.buf)
+        np.copyto(view, rgb_frame)
+        return segment
+
+    def _allocate(self, size):
+        # 공유 메모리 생성 - /dev/shm은 쓸 때 페이지를 잡으므로 (부족하면 SIGBUS) 미리 공간을 확보해 확인
+        try:
+            segment = SharedMemory(create=True, size=max(1, size))
+        except OSError:
+            with self.lock:
+                self.shm_failed += 1
+            return None
+        fd = getattr(segment, '_fd', -1)
+        if hasattr(os, 'posix_fallocate') and fd >= 0:
+            try:
+                os.posix_fallocate(fd, 0, segment.size)
+            except OSError:
+                segment.close()
+                segment.unlink()
+                with self.lock:
+                    self.shm_failed += 1
+                return None
+        return segment
+
+    def _chain(self, inner, indices):
+        with self.lock:
+            self.submitted += 1
+        outer = Future()
+        outer.set_running_or_notify_cancel()
+        inner.add_done_callback(lambda future: self._finish(future, outer, indices))
+        return outer
+
+    def _finish(self, inner, outer, indices):
+        # 워커 결과를 받는 스레드에서 호출 - 슬롯 반납 후 결과 전달
+        for index in indices:
+            self.free.put(index)
+        try:
+            pid, queued_at, started, finished, result = inner.result()
+        except Exception as e:
+            with self.lock:
+                self.failed += 1
+            outer.set_exception(e)
+            return
+
+        with self.lock:
+            self.completed += 1
+            self.queue_wait_total += max(0.0, started - queued_at)
+            self.busy_total += finished - started
+            worker = self.worker_stats.setdefault(pid, [0, 0.0])
+            worker[0] += 1
+            worker[1] += finished - started
+        outer.set_result(result)
+
+    def stats(self):
+        """
+        Returns:
+            dict: 요청/완료/실패 수, 처리 중인 슬롯 수, 평균 대기/인코딩 시간(ms), 워커별 처리 건수와 사용률
+        """
+        with self.lock:
+            elapsed = time.time() - self.started_at
+            return {
+                'workers': self.workers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'pickled': self.pickled,
+                'shm_failed': self.shm_failed,
+                'slots_in_use': len(self.slots) - self.free.qsize(),
+                'avg_queue_wait_ms': self.queue_wait_total / self.completed * 1000 if self.completed else 0.0,
+                'avg_encode_ms': self.busy_total / self.completed * 1000 if self.completed else 0.0,
+                'per_worker': {
+                    pid: {'tasks': tasks, 'utilization': busy / elapsed if elapsed > 0 else 0.0}
+                    for pid, (tasks, busy) in self.worker_stats.items()
+                },
+            }
+
+    def reset_stats(self):
+        """
+        사용률 집계를 지금부터 다시 시작 (워커 예열 후 측정용)
+        """
+        with self.lock:
+            self.started_at = time.time()
+            self.submitted = self.completed = self.failed = self.pickled = self.shm_failed = 0
+            self.queue_wait_total = self.busy_total = 0.0
+            self.worker_stats = {}
+
+    def shutdown(self):
+        """
+        워커를 종료하고 공유 메모리 해제
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.pool.shutdown(wait=True)
+        for segment in self.slots:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_encoding_executor():
+    """
+    프로세스 전역 인코딩 실행기 (Streamlit 재실행/세션 간에 공유)
+    - 워커 수는 FACE_ENCODE_WORKERS 환경 변수 (기본값: DEFAULT_WORKERS와 CPU 코어 수 중 작은 값, 0이면 사용하지 않음)
+    Returns:
+        EncodingExecutor | None: 실행기 (0이면 None - 호출한 스레드에서 인코딩)
+    """
+    global _executor
+    workers = int(os.environ.get(WORKERS_ENV, min(DEFAULT_WORKERS, os.cpu_count() or 1)))
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None or _executor.closed:
+            _executor = EncodingExecutor(workers)
+            atexit.register(_executor.shutdown)
+        return _executor
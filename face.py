@@ -1,158 +1,257 @@
-import streamlit as st
-import face_recognition
-import cv2
-import os
-import numpy as np
-from datetime import datetime
-from PIL import Image
-import mediapipe as mp
-import time
-
-# Mediapipe 초기화
-mp_face_detection = mp.solutions.face_detection
-
-# 등록된 얼굴 디렉토리
-REGISTERED_FACES_DIR = 'registered_faces'
-if not os.path.exists(REGISTERED_FACES_DIR):
-    os.makedirs(REGISTERED_FACES_DIR)
-
-
-class FaceRegister:
-    def __init__(self, save_dir=REGISTERED_FACES_DIR):
-        self.save_dir = save_dir
-
-    def register_face(self):
-        st.info("웹캠을 통해 얼굴을 등록합니다.")
-        video_capture = cv2.VideoCapture(0)
-        stframe = st.empty()
-        captured_frame = None
-        face_detected_time = None
-
-        with mp_face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.8) as face_detection:
-            while True:
-                ret, frame = video_capture.read()
-                if not ret:
-                    st.error("웹캠에 접근할 수 없습니다.")
-                    break
-
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = face_detection.process(rgb_frame)
-
-                if results.detections:
-                    if face_detected_time is None:
-                        face_detected_time = time.time()
-                        st.info("얼굴이 감지되었습니다. 2초 후에 캡처됩니다.")
-                    elif time.time() - face_detected_time > 2:
-                        captured_frame = frame.copy()
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        file_path = os.path.join(self.save_dir, f"face_{timestamp}.jpg")
-                        
-                        # 얼굴 인코딩 확인
-                        face_encodings = face_recognition.face_encodings(cv2.cvtColor(captured_frame, cv2.COLOR_BGR2RGB))
-                        if not face_encodings:
-                            st.warning("얼굴이 감지되지 않았습니다. 다시 시도하세요.")
-                            break
-                        
-                        cv2.imwrite(file_path, captured_frame)
-                        st.success("얼굴이 성공적으로 등록되었습니다!")
-                        break
-                else:
-                    face_detected_time = None
-
-                stframe.image(frame, channels="BGR", use_container_width=True)
-
-            video_capture.release()
-            cv2.destroyAllWindows()
-            stframe.empty()
-
-
-class FaceAuthentication:
-    def __init__(self, faces_dir=REGISTERED_FACES_DIR):
-        self.faces_dir = faces_dir
-        self.known_face_encodings, self.known_face_names = self.load_registered_faces()
-
-    def load_registered_faces(self):
-        known_face_encodings = []
-        known_face_names = []
-
-        for filename in os.listdir(self.faces_dir):
-            if filename.endswith(".jpg") or filename.endswith(".png"):
-                image_path = os.path.join(self.faces_dir, filename)
-                image = face_recognition.load_image_file(image_path)
-                encodings = face_recognition.face_encodings(image)
-
-                if encodings:
-                    known_face_encodings.append(encodings[0])
-                    known_face_names.append(os.path.splitext(filename)[0])
-                else:
-                    st.warning(f"{filename}에서 얼굴을 감지하지 못했습니다. 해당 파일을 건너뜁니다.")
-
-        return known_face_encodings, known_face_names
-
-    def authenticate_face(self):
-        st.info("웹캠을 통해 얼굴을 인증합니다.")
-        video_capture = cv2.VideoCapture(0)
-        stframe = st.empty()
-        authenticated = False
-        authentication_failed = False
-
-        with mp_face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.8) as face_detection:
-            face_detected_time = None
-
-            while True:
-                ret, frame = video_capture.read()
-                if not ret:
-                    st.warning("웹캠에 접근할 수 없습니다.")
-                    break
-
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = face_detection.process(rgb_frame)
-
-                if results.detections:
-                    if face_detected_time is None:
-                        face_detected_time = time.time()
-
-                    if time.time() - face_detected_time > 2:
-                        face_locations = face_recognition.face_locations(rgb_frame)
-                        face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-
-                        if not face_encodings:
-                            st.warning("얼굴이 감지되지 않았습니다. 다시 시도하세요.")
-                            if st.button("재인증"):
-                                authentication_failed = False
-                                face_detected_time = None
-                            break
-
-                        for face_encoding in face_encodings:
-                            matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=0.4)
-                            name = "Unknown"
-
-                            if True in matches:
-                                first_match_index = matches.index(True)
-                                name = self.known_face_names[first_match_index]
-                                st.success(f"인증 성공! 얼굴: {name}")
-                                authenticated = True
-                                break
-                            else:
-                                authentication_failed = True
-                                break
-                else:
-                    face_detected_time = None
-
-                stframe.image(frame, channels="BGR", use_container_width=True)
-
-                if authenticated:
-                    break
-
-                if authentication_failed:
-                    st.error("인증 실패! 등록된 얼굴이 없습니다.")
-                    if st.button("재인증"):
-                        authentication_failed = False
-                        face_detected_time = None
-                    break
-
-            video_capture.release()
-            cv2.destroyAllWindows()
-            stframe.empty()
-
-
+import streamlit as st
+import face_recognition
+import cv2
+import os
+import numpy as np
+from datetime import datetime
+from PIL import Image
+import mediapipe as mp
+import time
+from face_store import FaceTemplateStore
+from face_matcher import FaceMatcher
+from ann_index import IVFFlatIndex
+from model_pool import face_detector_pool
+from preview import PreviewChannel
+from frame_source import open_source
+from auth_engine import FaceAuthEngine, detections_to_face_locations, encode_faces, show_event
+from audit import get_audit_log, SUCCESS, FAILURE, ERROR
+from encode_executor import get_encoding_executor
+from encode_batcher import get_encoding_batcher
+
+# Mediapipe 초기화
+mp_face_detection = mp.solutions.face_detection
+
+# 등록된 얼굴 디렉토리
+REGISTERED_FACES_DIR = 'registered_faces'
+if not os.path.exists(REGISTERED_FACES_DIR):
+    os.makedirs(REGISTERED_FACES_DIR)
+
+# 대규모 1:N 식별용 근사 최근접 이웃 인덱스 파일
+FACE_INDEX_PATH = os.path.join(REGISTERED_FACES_DIR, '.face_ivf.npz')
+
+
+def record_face_attempt(audit, action, subject, engine, started):
+    """
+    얼굴 등록/인증 시도를 감사 로그에 기록 (결정 없이 끝났으면 카메라 오류로 기록)
+    Args:
+        audit (AuditLog): 감사 로그
+        action (str): 'register' 또는 'verify'
+        subject (str): 사용자 ID (없으면 1:N 식별 결과 이름)
+        engine (FaceAuthEngine): 시도를 처리한 엔진
+        started (float): 시도 시작 시각 (time.perf_counter 기준)
+    """
+    total_ms = (time.perf_counter() - started) * 1000
+    stages = dict(engine.timings, frames=engine.frames)
+    if not engine.done:
+        audit.record('face', action, subject, ERROR, 'camera', total_ms, stages)
+        return
+    decision = engine.decision
+    audit.record('face', action, subject or decision.get('name'), SUCCESS if decision['accepted'] else FAILURE,
+                 decision.get('reason'), total_ms, stages)
+
+
+class FaceRegister:
+    def __init__(self, save_dir=REGISTERED_FACES_DIR, index_path=FACE_INDEX_PATH, reuse_detections=True,
+                 max_wait=2.0, audit=None, executor=None, batcher=None):
+        self.save_dir = save_dir
+        self.index_path = index_path
+        # dlib 인코딩을 실행할 프로세스 풀 (기본값: 프로세스 전역 실행기, 워커 0개면 이 스레드에서 실행)
+        self.executor = executor if executor is not None else get_encoding_executor()
+        # 동시 세션의 인코딩 요청을 모아 한 번에 처리하는 배치 스케줄러 (기본값: 프로세스 전역, 대기 0ms면 사용 안 함)
+        self.batcher = batcher if batcher is not None else get_encoding_batcher()
+        # 등록 시도 기록 (기본값: 프로세스 전역 감사 로그)
+        self.audit = audit if audit is not None else get_audit_log()
+        # MediaPipe 검출 박스를 인코딩에 그대로 넘겨 dlib 재검출 생략
+        self.reuse_detections = reuse_detections
+        # 품질 기준을 넘는 프레임이 없을 때 최대 대기 시간 (초)
+        self.max_wait = max_wait
+        self.preview_stats = None  # 마지막 세션의 미리보기 전송 통계
+        self.capture_stats = None  # 마지막 세션의 캡처 통계 (FPS, 프레임 나이, 건너뛴 프레임)
+
+    @property
+    def encoder(self):
+        # 엔진에 넘길 인코더 (배치 스케줄러 > 프로세스 풀 > 이 스레드)
+        if self.batcher is not None:
+            return self.batcher.encode
+        return self.executor.encode if self.executor is not None else encode_faces
+
+    def add_to_index(self, name, encoding):
+        # 근사 인덱스가 이미 만들어져 있으면 그 얼굴만 증분 반영 (재등록이면 기존 인코딩 교체)
+        if self.index_path is None or not os.path.exists(self.index_path):
+            return
+        index = IVFFlatIndex.load(self.index_path)
+        index.replace(encoding, name)
+        index.save(self.index_path)
+
+    def register_face(self, user_id=None, stframe=None, source=None):
+        """
+        웹캠(또는 지정한 프레임 소스) 얼굴 등록
+        Args:
+            user_id (str, optional): 사용자 ID (있으면 '{user_id}.jpg'로 저장)
+            stframe (optional): 프레임을 표시할 Streamlit placeholder
+            source (optional): 프레임 소스 (카메라 번호, 비디오/이미지 디렉토리 경로, 'synthetic' 또는 소스 객체)
+        Returns:
+            bool: 등록 성공 여부
+        """
+        st.info("웹캠을 통해 얼굴을 등록합니다.")
+        # 카메라면 백그라운드 캡처 스레드에서 최신 프레임만 받음
+        video_capture = open_source(source)
+        stframe = stframe if stframe is not None else st.empty()
+        # 전송 FPS를 제한하고 JPEG로 압축해 보내는 미리보기 채널
+        preview = PreviewChannel(stframe)
+        # 검출/품질 선택/인코딩은 UI와 무관한 엔진이 처리하고, 여기서는 이벤트 표시와 저장만 수행
+        registered = False
+
+        # 프로세스 전역 풀에서 미리 초기화된 얼굴 검출기를 빌려 사용
+        with face_detector_pool(model_selection=0, min_detection_confidence=0.8).lease() as face_detection:
+            engine = FaceAuthEngine(face_detection, mode='register', reuse_detections=self.reuse_detections,
+                                    max_wait=self.max_wait, encoder=self.encoder)
+            started = time.perf_counter()
+            try:
+                while not engine.done:
+                    ret, frame = video_capture.read()
+                    if not ret:
+                        st.error("웹캠에 접근할 수 없습니다.")
+                        break
+
+                    for event in engine.process(frame):
+                        if event.kind == 'decision' and event.data['accepted']:
+                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                            file_name = f"{user_id}.jpg" if user_id else f"face_{timestamp}.jpg"
+                            file_path = os.path.join(self.save_dir, file_name)
+                            cv2.imwrite(file_path, event.data['frame'])
+                            self.add_to_index(os.path.splitext(file_name)[0], event.data['encoding'])
+                            registered = True
+                        show_event(event, st)
+
+                    if not engine.done:
+                        preview.publish(frame)
+
+                record_face_attempt(self.audit, 'register', user_id, engine, started)
+            finally:
+                # 예외가 나도 카메라(또는 브로커 구독)는 반드시 해제
+                self.capture_stats = video_capture.stats()
+                video_capture.release()
+                stframe.empty()
+                self.preview_stats = preview.stats()
+
+        return registered
+
+
+class FaceAuthentication:
+    def __init__(self, faces_dir=REGISTERED_FACES_DIR, use_ann=False, index_path=FACE_INDEX_PATH,
+                 reuse_detections=True, max_wait=2.0, audit=None, executor=None, batcher=None):
+        self.faces_dir = faces_dir
+        self.index_path = index_path
+        # dlib 인코딩을 실행할 프로세스 풀 (기본값: 프로세스 전역 실행기, 워커 0개면 이 스레드에서 실행)
+        self.executor = executor if executor is not None else get_encoding_executor()
+        # 동시 세션의 인코딩 요청을 모아 한 번에 처리하는 배치 스케줄러 (기본값: 프로세스 전역, 대기 0ms면 사용 안 함)
+        self.batcher = batcher if batcher is not None else get_encoding_batcher()
+        # 인증 시도 기록 (기본값: 프로세스 전역 감사 로그)
+        self.audit = audit if audit is not None else get_audit_log()
+        # MediaPipe 검출 박스를 인코딩에 그대로 넘겨 dlib 재검출 생략
+        self.reuse_detections = reuse_detections
+        # 품질 기준을 넘는 프레임이 없을 때 최대 대기 시간 (초)
+        self.max_wait = max_wait
+        self.preview_stats = None  # 마지막 세션의 미리보기 전송 통계
+        self.capture_stats = None  # 마지막 세션의 캡처 통계 (FPS, 프레임 나이, 건너뛴 프레임)
+        self.known_face_encodings, self.known_face_names = self.load_registered_faces()
+        # 등록 인코딩을 하나의 float32 행렬로 묶어 한 번에 거리 계산
+        self.matcher = FaceMatcher(self.known_face_encodings, self.known_face_names, tolerance=0.4)
+        # 1:N 식별기 - 등록 인원이 많으면 근사 인덱스로 교체
+        self.identifier = self.load_ann_index() if use_ann else self.matcher
+
+    @property
+    def encoder(self):
+        # 엔진에 넘길 인코더 (배치 스케줄러 > 프로세스 풀 > 이 스레드)
+        if self.batcher is not None:
+            return self.batcher.encode
+        return self.executor.encode if self.executor is not None else encode_faces
+
+    def load_registered_faces(self):
+        # 템플릿 캐시와 비교하여 새로 추가되거나 바뀐 이미지만 인코딩 (실행기가 있으면 워커들이 병렬로 인코딩)
+        if self.executor is not None:
+            store = FaceTemplateStore(self.faces_dir, encoder=self.executor.submit_file)
+        else:
+            store = FaceTemplateStore(self.faces_dir)
+        known_face_encodings, known_face_names = store.sync()
+
+        for filename in store.skipped:
+            st.warning(f"{filename}에서 얼굴을 감지하지 못했습니다. 해당 파일을 건너뜁니다.")
+
+        return known_face_encodings, known_face_names
+
+    def load_ann_index(self):
+        # 저장된 근사 인덱스를 불러와 등록 얼굴 템플릿과 동기화 (이름뿐 아니라 인코딩도 비교)
+        index = IVFFlatIndex.load(self.index_path) if os.path.exists(self.index_path) else None
+        known = dict(zip(self.known_face_names, self.known_face_encodings))
+        indexed = dict(zip(index.names, index.vectors_by_id())) if index is not None else {}
+
+        if index is None or len(indexed) != len(index.names) or set(indexed) - set(known):
+            # 처음 만들거나, 삭제된 얼굴 또는 같은 이름의 중복 인코딩이 있으면 전체 재구성
+            index = IVFFlatIndex(tolerance=0.4)
+            index.add_many(self.known_face_encodings, self.known_face_names)
+        else:
+            # 다시 인코딩된 얼굴은 교체하고 새 얼굴은 추가
+            changed = [name for name, vector in indexed.items() if not np.allclose(vector, known[name], atol=1e-5)]
+            missing = [name for name in known if name not in indexed]
+            if not changed and not missing:
+                return index
+            for name in changed:
+                index.remove(name)
+            index.add_many([known[name] for name in changed + missing], changed + missing)
+
+        index.save(self.index_path)
+        return index
+
+    def authenticate_face(self, user_id=None, stframe=None, source=None):
+        """
+        웹캠(또는 지정한 프레임 소스) 얼굴 인증
+        Args:
+            user_id (str, optional): 주장된 사용자 ID (있으면 해당 사용자 템플릿과만 1:1 비교)
+            stframe (optional): 프레임을 표시할 Streamlit placeholder
+            source (optional): 프레임 소스 (카메라 번호, 비디오/이미지 디렉토리 경로, 'synthetic' 또는 소스 객체)
+        Returns:
+            bool: 인증 성공 여부
+        """
+        st.info("웹캠을 통해 얼굴을 인증합니다.")
+        # 카메라면 백그라운드 캡처 스레드에서 최신 프레임만 받음
+        video_capture = open_source(source)
+        stframe = stframe if stframe is not None else st.empty()
+        # 전송 FPS를 제한하고 JPEG로 압축해 보내는 미리보기 채널
+        preview = PreviewChannel(stframe)
+        authenticated = False
+
+        # 프로세스 전역 풀에서 미리 초기화된 얼굴 검출기를 빌려 사용
+        with face_detector_pool(model_selection=0, min_detection_confidence=0.8).lease() as face_detection:
+            # 검출/품질 선택/인코딩/매칭은 UI와 무관한 엔진이 처리하고, 여기서는 이벤트 표시만 수행
+            engine = FaceAuthEngine(face_detection, mode='verify', matcher=self.matcher,
+                                    identifier=self.identifier, user_id=user_id,
+                                    reuse_detections=self.reuse_detections, max_wait=self.max_wait,
+                                    encoder=self.encoder)
+            started = time.perf_counter()
+            try:
+                while not engine.done:
+                    ret, frame = video_capture.read()
+                    if not ret:
+                        st.warning("웹캠에 접근할 수 없습니다.")
+                        break
+
+                    for event in engine.process(frame):
+                        show_event(event, st)
+
+                    preview.publish(frame)
+
+                if engine.done:
+                    authenticated = engine.decision['accepted']
+                record_face_attempt(self.audit, 'verify', user_id, engine, started)
+            finally:
+                # 예외가 나도 카메라(또는 브로커 구독)는 반드시 해제
+                self.capture_stats = video_capture.stats()
+                video_capture.release()
+                stframe.empty()
+                self.preview_stats = preview.stats()
+
+        return authenticated
+
+
@@ -0,0 +1,141 @@
+import numpy as np
+
+# 얼굴 인코딩 벡터 차원 (dlib ResNet)
+ENCODING_DIM = 128
+# 같은 사람으로 판단하는 최대 유클리드 거리
+DEFAULT_TOLERANCE = 0.4
+
+
+class FaceMatcher:
+    """
+    등록된 얼굴 인코딩을 하나의 연속된 float32 행렬로 보관하는 매처
+    - 1:N 식별: 프로브 하나당 한 번의 행렬 연산으로 전체 거리 계산 후 top-k 반환
+    - 1:1 검증: 주장된 사용자 ID의 템플릿 행만 비교
+    """
+
+    def __init__(self, encodings=(), names=(), tolerance=DEFAULT_TOLERANCE):
+        """
+        Args:
+            encodings (list): 128차원 얼굴 인코딩 리스트
+            names (list): 각 인코딩의 사용자 ID (등록 이미지 파일 이름)
+            tolerance (float): 일치로 판단하는 최대 거리
+        """
+        self.tolerance = tolerance
+        self.names = []
+        self.user_rows = {}  # 사용자 ID -> 행 인덱스 배열
+        self.matrix = np.empty((0, ENCODING_DIM), dtype=np.float32)
+        self.sq_norms = np.empty(0, dtype=np.float32)
+        self.add_many(encodings, names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add_many(self, encodings, names):
+        """
+        여러 인코딩을 한 번에 추가하고 행렬을 다시 구성
+        Args:
+            encodings (list): 얼굴 인코딩 리스트
+            names (list): 각 인코딩의 사용자 ID
+        """
+        names = list(names)
+        if not names:
+            return
+        new_rows = np.asarray(encodings, dtype=np.float32).reshape(len(names), ENCODING_DIM)
+
+        start = len(self.names)
+        self.matrix = np.ascontiguousarray(np.vstack([self.matrix, new_rows]))
+        self.sq_norms = np.concatenate([self.sq_norms, np.einsum('ij,ij->i', new_rows, new_rows)])
+        self.names.extend(names)
+
+        for offset, name in enumerate(names):
+            rows = self.user_rows.get(name)
+            row = np.array([start + offset])
+            self.user_rows[name] = row if rows is None else np.concatenate([rows, row])
+
+    def add(self, encoding, name):
+        """
+        인코딩 하나 추가 (얼굴 등록 직후 사용)
+        """
+        self.add_many([encoding], [name])
+
+    def distances(self, probes, rows=None):
+        """
+        프로브와 등록 템플릿 사이의 유클리드 거리 계산
+        ||a - b||^2 = ||a||^2 + ||b||^2 - 2ab 로 한 번의 행렬곱에 처리
+        Args:
+            probes (numpy.ndarray): (128,) 또는 (M, 128) 프로브 인코딩
+            rows (numpy.ndarray, optional): 비교할 템플릿 행 인덱스 (기본값: 전체)
+        Returns:
+            numpy.ndarray: (M, N) 거리 행렬
+        """
+        probes = np.asarray(probes, dtype=np.float32).reshape(-1, ENCODING_DIM)
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        sq_norms = self.sq_norms if rows is None else self.sq_norms[rows]
+
+        sq_dist = np.einsum('ij,ij->i', probes, probes)[:, None] + sq_norms[None, :]
+        sq_dist -= 2.0 * (probes @ matrix.T)
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        return np.sqrt(sq_dist, out=sq_dist)
+
+    def identify_batch(self, probes, k=1):
+        """
+        1:N 식별 - 여러 프로브에 대해 가까운 순서로 top-k 반환
+        Args:
+            probes (numpy.ndarray): (M, 128) 프로브 인코딩
+            k (int): 반환할 후보 수
+        Returns:
+            list: 프로브별 [(사용자 ID, 거리), ...] 리스트
+        """
+        probes = np.asarray(probes, dtype=np.float32).reshape(-1, ENCODING_DIM)
+        if not self.names:
+            return [[] for _ in range(len(probes))]
+
+        dist = self.distances(probes)
+        k = min(k, dist.shape[1])
+        # 전체 정렬 대신 argpartition으로 k개만 골라 정렬
+        top = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        top_dist = np.take_along_axis(dist, top, axis=1)
+        order = np.argsort(top_dist, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_dist = np.take_along_axis(top_dist, order, axis=1)
+
+        return [[(self.names[i], float(d)) for i, d in zip(row_idx, row_dist)]
+                for row_idx, row_dist in zip(top, top_dist)]
+
+    def identify(self, probe, k=1):
+        """
+        1:N 식별 - 프로브 하나에 대한 top-k
+        Returns:
+            list: [(사용자 ID, 거리), ...] (가까운 순)
+        """
+        return self.identify_batch(probe, k)[0]
+
+    def best_match(self, probe, tolerance=None):
+        """
+        가장 가까운 등록 얼굴이 허용 거리 안에 있으면 반환
+        Returns:
+            tuple: (사용자 ID 또는 None, 거리 또는 None)
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+        candidates = self.identify(probe, k=1)
+        if candidates and candidates[0][1] <= tolerance:
+            return candidates[0]
+        return None, candidates[0][1] if candidates else None
+
+    def verify(self, user_id, probe, tolerance=None):
+        """
+        1:1 검증 - 주장된 사용자 ID의 템플릿과만 비교
+        Args:
+            user_id (str): 사용자 ID
+            probe (numpy.ndarray): (128,) 프로브 인코딩
+            tolerance (float, optional): 일치로 판단하는 최대 거리
+        Returns:
+            tuple: (일치 여부, 최소 거리 또는 None)
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+        rows = self.user_rows.get(user_id)
+        if rows is None:
+            return False, None
+
+        distance = float(self.distances(probe, rows).min())
+        return distance <= tolerance, distance
@@ -0,0 +1,197 @@
+import os
+import hashlib
+import tempfile
+import numpy as np
+import face_recognition
+from face_matcher import ENCODING_DIM
+
+# 캐시 파일 이름 (등록 얼굴 디렉토리 안에 숨김 파일로 저장)
+TEMPLATE_CACHE_NAME = '.face_templates.npz'
+# 등록 이미지로 인정하는 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.png')
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    파일 내용의 SHA-1 해시 계산
+    Args:
+        path (str): 파일 경로
+        chunk_size (int): 한 번에 읽을 바이트 수
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_image_file(path):
+    """
+    이미지 파일에서 첫 번째 얼굴의 128차원 인코딩 추출
+    Args:
+        path (str): 이미지 파일 경로
+    Returns:
+        numpy.ndarray | None: 얼굴 인코딩 (얼굴이 없으면 None)
+    """
+    image = face_recognition.load_image_file(path)
+    encodings = face_recognition.face_encodings(image)
+    return encodings[0] if encodings else None
+
+
+class FaceTemplateStore:
+    """
+    등록 얼굴 이미지의 인코딩을 디스크에 보관하는 템플릿 저장소
+    - 파일 이름 + 수정 시각/크기로 변경 여부를 빠르게 판단
+    - 수정 시각만 바뀐 경우 내용 해시로 재확인
+    - 새로 추가되거나 내용이 바뀐 이미지만 다시 인코딩
+    """
+
+    def __init__(self, faces_dir, cache_path=None, encoder=encode_image_file):
+        """
+        Args:
+            faces_dir (str): 등록 얼굴 이미지 디렉토리
+            cache_path (str, optional): 캐시 파일 경로 (기본값: faces_dir/.face_templates.npz)
+            encoder (callable): 이미지 경로 -> 인코딩(또는 None) 함수
+                (Future를 돌려주면 변경된 파일을 모두 요청한 뒤 한꺼번에 결과를 받아 병렬로 인코딩)
+        """
+        self.faces_dir = faces_dir
+        self.cache_path = cache_path or os.path.join(faces_dir, TEMPLATE_CACHE_NAME)
+        self.encoder = encoder
+        # 파일 이름 -> 캐시 항목 (mtime_ns, size, digest, encoding 또는 None)
+        self.entries = {}
+        self.skipped = []  # 이번 동기화에서 얼굴을 찾지 못한 파일들
+        self.encoded_count = 0  # 이번 동기화에서 새로 인코딩한 파일 수
+
+    def load_cache(self):
+        """
+        캐시 파일을 한 번에 읽어 메모리에 적재
+        Returns:
+            dict: 파일 이름 -> 캐시 항목
+        """
+        entries = {}
+        if not os.path.exists(self.cache_path):
+            return entries
+
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                names = data['names']
+                mtimes = data['mtimes']
+                sizes = data['sizes']
+                digests = data['digests']
+                has_face = data['has_face']
+                encodings = data['encodings']
+        except (OSError, KeyError, ValueError):
+            # 손상된 캐시는 버리고 전체를 다시 인코딩
+            return entries
+
+        for i, name in enumerate(names.tolist()):
+            encoding = encodings[i].copy() if has_face[i] else None
+            entries[name] = (int(mtimes[i]), int(sizes[i]), str(digests[i]), encoding)
+        return entries
+
+    def save_cache(self):
+        """
+        메모리의 캐시 항목을 임시 파일에 기록한 뒤 원자적으로 교체
+        """
+        names = sorted(self.entries)
+        count = len(names)
+        mtimes = np.zeros(count, dtype=np.int64)
+        sizes = np.zeros(count, dtype=np.int64)
+        has_face = np.zeros(count, dtype=bool)
+        encodings = np.zeros((count, ENCODING_DIM), dtype=np.float64)
+        digests = []
+
+        for i, name in enumerate(names):
+            mtime_ns, size, digest, encoding = self.entries[name]
+            mtimes[i] = mtime_ns
+            sizes[i] = size
+            digests.append(digest)
+            if encoding is not None:
+                has_face[i] = True
+                encodings[i] = encoding
+
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(file,
+                         names=np.array(names, dtype=str),
+                         mtimes=mtimes,
+                         sizes=sizes,
+                         digests=np.array(digests, dtype=str),
+                         has_face=has_face,
+                         encodings=encodings)
+            os.replace(tmp_path, self.cache_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def sync(self):
+        """
+        디렉토리와 캐시를 비교하여 변경된 이미지만 다시 인코딩
+        Returns:
+            tuple: (인코딩 리스트, 이름 리스트)
+        """
+        cached = self.load_cache()
+        entries = {}
+        changed = False
+        self.skipped = []
+        self.encoded_count = 0
+        pending = []  # 인코딩 결과를 기다리는 (파일 이름, mtime_ns, size, digest, 결과)
+
+        for filename in sorted(os.listdir(self.faces_dir)):
+            if not filename.endswith(IMAGE_EXTENSIONS):
+                continue
+
+            image_path = os.path.join(self.faces_dir, filename)
+            stat = os.stat(image_path)
+            entry = cached.get(filename)
+
+            # 수정 시각과 크기가 같으면 해시 계산 없이 재사용
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                entries[filename] = entry
+                continue
+
+            # 시각만 바뀐 경우(복사, touch 등) 내용 해시로 재확인
+            digest = file_digest(image_path)
+            if entry and entry[2] == digest:
+                entries[filename] = (stat.st_mtime_ns, stat.st_size, digest, entry[3])
+            else:
+                pending.append((filename, stat.st_mtime_ns, stat.st_size, digest, self.encoder(image_path)))
+            changed = True
+
+        for filename, mtime_ns, size, digest, encoding in pending:
+            if hasattr(encoding, 'result'):
+                encoding = encoding.result()
+            entries[filename] = (mtime_ns, size, digest, encoding)
+            self.encoded_count += 1
+            if encoding is None:
+                self.skipped.append(filename)
+
+        # 삭제된 파일이 있으면 캐시도 갱신
+        if set(cached) - set(entries):
+            changed = True
+
+        self.entries = entries
+        if changed:
+            self.save_cache()
+
+        return self.templates()
+
+    def templates(self):
+        """
+        얼굴이 감지된 항목만 (인코딩, 이름) 리스트로 반환
+        Returns:
+            tuple: (인코딩 리스트, 이름 리스트)
+        """
+        known_face_encodings = []
+        known_face_names = []
+        for filename in sorted(self.entries):
+            encoding = self.entries[filename][3]
+            if encoding is not None:
+                known_face_encodings.append(encoding)
+                known_face_names.append(os.path.splitext(filename)[0])
+        return known_face_encodings, known_face_names
@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+
+
+class FramePipeline:
+    """
+    캡처 프레임을 인식용/표시용으로 변환하는 파이프라인
+    - 인식은 카메라 원본 해상도(또는 지정한 inference_size)에서 수행
+    - 확대는 화면 표시용으로만 수행
+    - cv2의 dst 인자로 미리 할당한 버퍼를 재사용하여 프레임마다 새 배열을 만들지 않음
+    - RGB 버퍼는 번갈아 사용하므로, 비동기 인식기가 이전 프레임을 처리하는 동안 덮어쓰지 않음
+    """
+
+    def __init__(self, inference_size=None, display_size=None, rgb_buffers=2):
+        """
+        Args:
+            inference_size (tuple, optional): 인식용 (width, height) (기본값: 원본 해상도)
+            display_size (tuple, optional): 표시용 (width, height) (기본값: 원본 해상도)
+            rgb_buffers (int): 번갈아 사용할 RGB 버퍼 수 (처리 중 프레임 수 + 1 이상)
+        """
+        self.inference_size = inference_size
+        self.display_size = display_size
+        self.rgb_buffer_count = rgb_buffers
+        self.rgb = []
+        self.rgb_index = 0
+        self.inference_bgr = None
+        self.display = None
+
+    @staticmethod
+    def _ensure(buffer, shape, dtype=np.uint8):
+        # 해상도가 바뀐 경우에만 다시 할당
+        if buffer is None or buffer.shape != shape:
+            return np.empty(shape, dtype=dtype)
+        return buffer
+
+    def to_rgb(self, frame):
+        """
+        인식용 RGB 프레임 (재사용 버퍼)
+        Args:
+            frame (numpy.ndarray): BGR 캡처 프레임
+        Returns:
+            numpy.ndarray: RGB 프레임 (다음 rgb_buffers번째 호출에서 덮어써짐)
+        """
+        source = frame
+        if self.inference_size and (frame.shape[1], frame.shape[0]) != tuple(self.inference_size):
+            width, height = self.inference_size
+            self.inference_bgr = self._ensure(self.inference_bgr, (height, width, 3))
+            source = cv2.resize(frame, (width, height), dst=self.inference_bgr, interpolation=cv2.INTER_AREA)
+
+        if len(self.rgb) < self.rgb_buffer_count:
+            self.rgb.append(None)
+        index = self.rgb_index
+        self.rgb[index] = self._ensure(self.rgb[index], source.shape)
+        self.rgb_index = (index + 1) % self.rgb_buffer_count
+        return cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self.rgb[index])
+
+    def for_display(self, frame):
+        """
+        표시용 BGR 프레임 (필요할 때만 확대, 재사용 버퍼)
+        Args:
+            frame (numpy.ndarray): BGR 캡처 프레임
+        Returns:
+            numpy.ndarray: 표시용 프레임 (글자를 그려도 원본 프레임은 그대로)
+        """
+        height, width = frame.shape[:2]
+        display_width, display_height = self.display_size or (width, height)
+        self.display = self._ensure(self.display, (display_height, display_width, 3))
+        if (display_width, display_height) == (width, height):
+            np.copyto(self.display, frame)
+            return self.display
+        return cv2.resize(frame, (display_width, display_height), dst=self.display, interpolation=cv2.INTER_LINEAR)
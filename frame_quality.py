@@ -0,0 +1,141 @@
+import time
+from collections import namedtuple
+import cv2
+import numpy as np
+
+# 프레임 품질 측정 결과
+FrameQuality = namedtuple('FrameQuality', ['score', 'sharpness', 'face_size', 'brightness', 'confidence'])
+# 인코딩에 넘길 후보 프레임
+FrameCandidate = namedtuple('FrameCandidate', ['frame', 'rgb_frame', 'detections', 'quality'])
+
+# 선명도 측정 시 얼굴 영역을 맞추는 크기 (얼굴 크기와 무관하게 비교하기 위함)
+SHARPNESS_PATCH_SIZE = (128, 128)
+
+
+class FrameQualityScorer:
+    """
+    MediaPipe 검출 결과를 이용한 가벼운 프레임 품질 점수
+    - 선명도: 얼굴 영역 라플라시안 분산
+    - 얼굴 크기: 검출 박스 너비(픽셀)
+    - 밝기: 얼굴 영역 평균 밝기
+    - 검출 신뢰도: MediaPipe detection score
+    각 항목을 기준값 대비 0~1로 정규화하여 곱한 값을 종합 점수로 사용
+    """
+
+    def __init__(self, min_sharpness=60.0, min_face_size=80, brightness_range=(60, 200), min_confidence=0.85):
+        """
+        Args:
+            min_sharpness (float): 최소 라플라시안 분산
+            min_face_size (int): 최소 얼굴 너비 (픽셀)
+            brightness_range (tuple): 허용 평균 밝기 범위 (0~255)
+            min_confidence (float): 최소 검출 신뢰도
+        """
+        self.min_sharpness = min_sharpness
+        self.min_face_size = min_face_size
+        self.brightness_range = brightness_range
+        self.min_confidence = min_confidence
+
+    def score(self, frame, detection):
+        """
+        가장 먼저 검출된 얼굴 기준으로 품질 측정
+        Args:
+            frame (numpy.ndarray): BGR 프레임
+            detection: MediaPipe detection
+        Returns:
+            FrameQuality: 종합 점수와 항목별 측정값
+        """
+        height, width = frame.shape[:2]
+        box = detection.location_data.relative_bounding_box
+        left = max(0, int(box.xmin * width))
+        top = max(0, int(box.ymin * height))
+        right = min(width, int((box.xmin + box.width) * width))
+        bottom = min(height, int((box.ymin + box.height) * height))
+        confidence = float(detection.score[0]) if detection.score else 0.0
+
+        face_size = right - left
+        if face_size <= 0 or bottom <= top:
+            return FrameQuality(0.0, 0.0, 0, 0.0, confidence)
+
+        # 얼굴 영역만 흑백으로 변환하여 계산 (전체 프레임 대비 비용이 작음)
+        face = cv2.cvtColor(frame[top:bottom, left:right], cv2.COLOR_BGR2GRAY)
+        brightness = float(face.mean())
+        patch = cv2.resize(face, SHARPNESS_PATCH_SIZE, interpolation=cv2.INTER_AREA)
+        sharpness = float(cv2.Laplacian(patch, cv2.CV_64F).var())
+
+        low, high = self.brightness_range
+        if brightness < low:
+            brightness_score = brightness / low
+        elif brightness > high:
+            brightness_score = (255.0 - brightness) / (255.0 - high)
+        else:
+            brightness_score = 1.0
+
+        components = np.clip([
+            sharpness / self.min_sharpness,
+            face_size / self.min_face_size,
+            brightness_score,
+            confidence / self.min_confidence,
+        ], 0.0, 1.0)
+        return FrameQuality(float(components.prod()), sharpness, face_size, brightness, confidence)
+
+
+class FrameQualityGate:
+    """
+    얼굴 검출 이후 품질 기준을 넘는 첫 프레임을 바로 선택하는 게이트
+    - 기준을 넘는 프레임이 나오면 즉시 반환 (고정 대기 시간 없음)
+    - max_wait가 지나면 그동안 본 가장 좋은 프레임을 반환
+    """
+
+    def __init__(self, scorer=None, threshold=0.9, max_wait=2.0):
+        """
+        Args:
+            scorer (FrameQualityScorer, optional): 품질 측정기
+            threshold (float): 즉시 선택할 종합 점수 기준 (0~1)
+            max_wait (float): 첫 검출 이후 최대 대기 시간 (초)
+        """
+        self.scorer = scorer or FrameQualityScorer()
+        self.threshold = threshold
+        self.max_wait = max_wait
+        self.reset()
+
+    def reset(self):
+        """
+        얼굴이 사라지면 대기 상태 초기화
+        """
+        self.started_at = None
+        self.best = None
+
+    @property
+    def started(self):
+        return self.started_at is not None
+
+    def update(self, frame, rgb_frame, detections, now=None):
+        """
+        새 프레임 평가
+        Args:
+            frame (numpy.ndarray): BGR 프레임
+            rgb_frame (numpy.ndarray): RGB 프레임 (인코딩용)
+            detections (list): MediaPipe detections
+            now (float, optional): 현재 시각 (기본값: time.time())
+        Returns:
+            FrameCandidate | None: 인코딩할 프레임 (아직 대기 중이면 None)
+        """
+        now = time.time() if now is None else now
+        if self.started_at is None:
+            self.started_at = now
+
+        quality = self.scorer.score(frame, detections[0])
+        if quality.score >= self.threshold:
+            candidate = FrameCandidate(frame, rgb_frame, detections, quality)
+            self.reset()
+            return candidate
+
+        # 기준 미달이면 지금까지 중 가장 좋은 프레임만 복사해 보관
+        if self.best is None or quality.score > self.best.quality.score:
+            self.best = FrameCandidate(frame.copy(), rgb_frame.copy(), detections, quality)
+
+        if now - self.started_at >= self.max_wait:
+            candidate = self.best
+            self.reset()
+            return candidate
+        return None
@@ -0,0 +1,503 @@
+import os
+import threading
+import time
+from collections import namedtuple
+import cv2
+import numpy as np
+
+# 캡처된 프레임 (timestamp: time.monotonic() 기준 캡처 시각(초), index: 캡처 순번)
+Frame = namedtuple('Frame', ['image', 'timestamp', 'index'])
+# '1'이면 카메라 장치를 직접 열지 않고 카메라 브로커(camera_broker.py)의 공유 메모리 프레임을 구독
+CAMERA_BROKER_ENV = 'CAMERA_BROKER'
+
+
+class ThreadedCapture:
+    """
+    백그라운드 스레드가 카메라를 읽어 작은 링 버퍼에 쌓는 프레임 소스
+    - 소비자는 항상 가장 최근 프레임을 받음 (밀린 프레임은 건너뜀)
+    - 링 버퍼 슬롯을 그대로 넘겨주므로 복사가 없음
+      (소비자가 들고 있는 슬롯은 다음 read 전까지 덮어쓰지 않음)
+    - cv2.VideoCapture처럼 read()/isOpened()/release()를 제공
+    - 캡처 FPS, 프레임 나이(캡처~소비 지연), 건너뛴 프레임 수 집계
+    """
+
+    def __init__(self, device=0, width=None, height=None, fps=None, buffer_size=3):
+        """
+        Args:
+            device (int | str): cv2.VideoCapture 장치 번호 또는 경로
+            width (int, optional): 요청할 캡처 너비
+            height (int, optional): 요청할 캡처 높이
+            fps (int, optional): 요청할 캡처 FPS
+            buffer_size (int): 링 버퍼 슬롯 수 (최신/소비 중/기록 중 슬롯이 필요하므로 3 이상)
+        """
+        self.device = device
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = max(3, buffer_size)
+        self.slots = [None] * self.buffer_size
+        self.condition = threading.Condition()
+        self.capture = None
+        self.thread = None
+        self.running = False
+        self.latest = None  # 가장 최근 Frame
+        self.latest_slot = None
+        self.held_slot = None  # 소비자가 들고 있는 슬롯
+        self.last_index = -1  # 소비자에게 마지막으로 넘긴 프레임 순번
+        self.captured = 0
+        self.delivered = 0
+        self.skipped = 0
+        self.age_total = 0.0
+        self.last_age = 0.0
+        self.started_at = None
+
+    def start(self):
+        """
+        장치를 열고 캡처 스레드 시작
+        Returns:
+            ThreadedCapture: 자기 자신 (체이닝용)
+        """
+        self.capture = cv2.VideoCapture(self.device)
+        if self.width:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self.capture.set(cv2.CAP_PROP_FPS, self.fps)
+
+        self.running = self.capture.isOpened()
+        self.started_at = time.monotonic()
+        if self.running:
+            self.thread = threading.Thread(target=self._run, name='frame-capture', daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self):
+        slot = 0
+        while self.running:
+            # 소비자가 들고 있는 슬롯과 최신 슬롯은 건너뛰고 기록
+            with self.condition:
+                while slot in (self.held_slot, self.latest_slot):
+                    slot = (slot + 1) % self.buffer_size
+
+            buffer = self.slots[slot]
+            ret, image = self.capture.read() if buffer is None else self.capture.read(buffer)
+            timestamp = time.monotonic()
+            if not ret:
+                break
+
+            with self.condition:
+                self.slots[slot] = image
+                if self.latest is not None and self.latest.index > self.last_index:
+                    self.skipped += 1  # 소비되지 않고 밀려난 프레임
+                self.latest = Frame(image, timestamp, self.captured)
+                self.latest_slot = slot
+                self.captured += 1
+                self.condition.notify_all()
+            slot = (slot + 1) % self.buffer_size
+
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def read_frame(self, timeout=1.0):
+        """
+        아직 받지 않은 가장 최근 프레임을 기다려 반환
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        Returns:
+            Frame | None: 프레임 (장치가 닫혔거나 시간 초과면 None)
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.latest is None or self.latest.index <= self.last_index:
+                remaining = deadline - time.monotonic()
+                if not self.running or remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+
+            frame = self.latest
+            self.held_slot = self.latest_slot
+            self.last_index = frame.index
+            self.delivered += 1
+            self.last_age = time.monotonic() - frame.timestamp
+            self.age_total += self.last_age
+            return frame
+
+    def read(self):
+        """
+        cv2.VideoCapture.read와 같은 형식
+        Returns:
+            tuple: (성공 여부, BGR 프레임)
+        """
+        frame = self.read_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def isOpened(self):
+        return self.running
+
+    def set(self, prop, value):
+        return self.capture.set(prop, value) if self.capture is not None else False
+
+    def release(self):
+        """
+        캡처 스레드 종료 후 장치 해제
+        """
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+    def stats(self):
+        """
+        Returns:
+            dict: 캡처/전달/건너뛴 프레임 수, 캡처 FPS, 프레임 나이(ms)
+        """
+        with self.condition:
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+            return {
+                'captured': self.captured,
+                'delivered': self.delivered,
+                'skipped': self.skipped,
+                'capture_fps': self.captured / elapsed if elapsed > 0 else 0.0,
+                'last_age_ms': self.last_age * 1000,
+                'avg_age_ms': self.age_total / self.delivered * 1000 if self.delivered else 0.0,
+            }
+
+
+# 이미지 디렉토리 소스에서 읽을 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource:
+    """
+    카메라 없이 인식 파이프라인을 돌리기 위한 오프라인 프레임 소스 공통 부분
+    - ThreadedCapture와 같은 read_frame()/read()/isOpened()/release()/stats() 제공
+    - realtime=True면 fps에 맞춰 프레임 간격을 맞추고, False면 최대한 빠르게 공급
+    - loop=True면 끝에 도달했을 때 처음부터 다시 공급
+    - 반환한 프레임 버퍼는 다음 read 전까지 유효 (그 이후 재사용될 수 있음)
+    """
+
+    def __init__(self, fps=30.0, realtime=False, loop=False):
+        """
+        Args:
+            fps (float): 실시간 재생 시 프레임 속도
+            realtime (bool): fps에 맞춰 공급할지 여부
+            loop (bool): 끝에 도달하면 처음부터 반복할지 여부
+        """
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop
+        self.opened = False
+        self.index = 0
+        self.delivered = 0
+        self.started_at = None
+
+    def _open(self):
+        """
+        Returns:
+            bool: 소스를 열었는지 여부
+        """
+        return True
+
+    def _rewind(self):
+        pass
+
+    def _next_image(self):
+        """
+        Returns:
+            numpy.ndarray | None: 다음 BGR 프레임 (끝이면 None)
+        """
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def start(self):
+        """
+        소스를 열고 시작 시각 기록
+        Returns:
+            FrameSource: 자기 자신 (체이닝용)
+        """
+        self.opened = self._open()
+        self.index = 0
+        self.delivered = 0
+        self.started_at = time.monotonic()
+        return self
+
+    def read_frame(self, timeout=1.0):
+        """
+        다음 프레임 반환
+        Args:
+            timeout (float): ThreadedCapture와의 호환용 (사용하지 않음)
+        Returns:
+            Frame | None: 프레임 (끝이면 None)
+        """
+        if not self.opened:
+            return None
+
+        if self.realtime and self.fps:
+            # 시작 시각 기준으로 간격을 맞춰 처리 지연이 누적되지 않게 함
+            delay = self.started_at + self.index / self.fps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        image = self._next_image()
+        if image is None and self.loop and self.index > 0:
+            self._rewind()
+            image = self._next_image()
+        if image is None:
+            self.opened = False
+            return None
+
+        frame = Frame(image, time.monotonic(), self.index)
+        self.index += 1
+        self.delivered += 1
+        return frame
+
+    def read(self):
+        """
+        cv2.VideoCapture.read와 같은 형식
+        Returns:
+            tuple: (성공 여부, BGR 프레임)
+        """
+        frame = self.read_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self.opened = False
+        self._close()
+
+    def stats(self):
+        """
+        Returns:
+            dict: ThreadedCapture.stats와 같은 형식 (프레임을 요청 시 만들므로 건너뜀/나이는 0)
+        """
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            'captured': self.delivered,
+            'delivered': self.delivered,
+            'skipped': 0,
+            'capture_fps': self.delivered / elapsed if elapsed > 0 else 0.0,
+            'last_age_ms': 0.0,
+            'avg_age_ms': 0.0,
+        }
+
+
+class VideoFileSource(FrameSource):
+    """
+    녹화된 비디오 파일 프레임 소스
+    """
+
+    def __init__(self, path, fps=None, realtime=False, loop=False):
+        """
+        Args:
+            path (str): 비디오 파일 경로
+            fps (float, optional): 실시간 재생 속도 (기본값: 파일에 기록된 FPS)
+            realtime (bool): fps에 맞춰 공급할지 여부
+            loop (bool): 끝에 도달하면 처음부터 반복할지 여부
+        """
+        super().__init__(fps, realtime, loop)
+        self.path = path
+        self.capture = None
+        self.buffer = None
+
+    def _open(self):
+        self.capture = cv2.VideoCapture(self.path)
+        if not self.capture.isOpened():
+            return False
+        if not self.fps:
+            self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+
+    def _rewind(self):
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _next_image(self):
+        # 디코딩 버퍼 재사용
+        if self.buffer is None:
+            ret, image = self.capture.read()
+        else:
+            ret, image = self.capture.read(self.buffer)
+        if not ret:
+            return None
+        self.buffer = image
+        return image
+
+    def _close(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    이미지 시퀀스(디렉토리의 이미지 파일을 이름순으로) 프레임 소스
+    """
+
+    def __init__(self, directory, fps=30.0, realtime=False, loop=False, preload=True):
+        """
+        Args:
+            directory (str): 이미지 디렉토리 경로
+            fps (float): 실시간 재생 속도
+            realtime (bool): fps에 맞춰 공급할지 여부
+            loop (bool): 끝에 도달하면 처음부터 반복할지 여부
+            preload (bool): 시작할 때 모든 이미지를 미리 디코딩할지 여부
+                (처리량 측정에서 디스크/디코딩 시간을 제외)
+        """
+        super().__init__(fps, realtime, loop)
+        self.directory = directory
+        self.preload = preload
+        self.paths = []
+        self.images = None
+        self.position = 0
+
+    def _open(self):
+        if not os.path.isdir(self.directory):
+            return False
+        self.paths = [
+            os.path.join(self.directory, name)
+            for name in sorted(os.listdir(self.directory))
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        if self.preload:
+            self.images = [image for image in (cv2.imread(path) for path in self.paths) if image is not None]
+        self.position = 0
+        return bool(self.paths)
+
+    def _rewind(self):
+        self.position = 0
+
+    def _next_image(self):
+        while True:
+            if self.images is not None:
+                if self.position >= len(self.images):
+                    return None
+                image = self.images[self.position]
+            else:
+                if self.position >= len(self.paths):
+                    return None
+                image = cv2.imread(self.paths[self.position])
+            self.position += 1
+            if image is not None:
+                return image
+
+
+class SyntheticSource(FrameSource):
+    """
+    합성 프레임 소스
+    - 기준 이미지(없으면 얼굴 모양 도형)에 위치 흔들림과 노이즈를 준 프레임 몇 장을 미리 만들어 돌려 사용
+    """
+
+    def __init__(self, count=300, size=(640, 480), fps=30.0, realtime=False, loop=False,
+                 image=None, variants=8, noise=8, seed=0):
+        """
+        Args:
+            count (int): 공급할 프레임 수 (loop=True면 반복)
+            size (tuple): 프레임 (width, height)
+            fps (float): 실시간 재생 속도
+            realtime (bool): fps에 맞춰 공급할지 여부
+            loop (bool): count만큼 공급한 뒤 처음부터 반복할지 여부
+            image (str | numpy.ndarray, optional): 기준 이미지 경로 또는 BGR 배열
+            variants (int): 미리 만들 프레임 변형 수
+            noise (int): 픽셀 노이즈 크기 (0~255)
+            seed (int): 난수 시드
+        """
+        super().__init__(fps, realtime, loop)
+        self.count = count
+        self.size = tuple(size)
+        self.image = image
+        self.variants = max(1, variants)
+        self.noise = noise
+        self.seed = seed
+        self.frames = []
+        self.position = 0
+
+    def _base_image(self):
+        width, height = self.size
+        image = self.image
+        if isinstance(image, str):
+            image = cv2.imread(image)
+        if image is not None:
+            return cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+        # 기준 이미지가 없으면 배경 그라데이션 위에 얼굴 모양 도형을 그림
+        base = np.empty((height, width, 3), dtype=np.uint8)
+        base[:] = np.linspace(40, 160, width, dtype=np.uint8)[None, :, None]
+        center = (width // 2, height // 2)
+        axes = (width // 8, height // 4)
+        cv2.ellipse(base, center, axes, 0, 0, 360, (150, 170, 210), -1)
+        for dx in (-axes[0] // 2, axes[0] // 2):
+            cv2.circle(base, (center[0] + dx, center[1] - axes[1] // 4), max(2, axes[0] // 8), (40, 40, 40), -1)
+        cv2.ellipse(base, (center[0], center[1] + axes[1] // 2), (axes[0] // 3, axes[1] // 10), 0, 0, 180, (60, 60, 150), 2)
+        return base
+
+    def _open(self):
+        rng = np.random.default_rng(self.seed)
+        base = self._base_image()
+        width, height = self.size
+        self.frames = []
+        for _ in range(self.variants):
+            shift = np.float32([[1, 0, rng.integers(-4, 5)], [0, 1, rng.integers(-4, 5)]])
+            frame = cv2.warpAffine(base, shift, (width, height), borderMode=cv2.BORDER_REFLECT)
+            if self.noise:
+                jitter = rng.integers(-self.noise, self.noise + 1, frame.shape, dtype=np.int16)
+                frame = np.clip(frame.astype(np.int16) + jitter, 0, 255).astype(np.uint8)
+            self.frames.append(frame)
+        self.position = 0
+        return self.count > 0
+
+    def _rewind(self):
+        self.position = 0
+
+    def _next_image(self):
+        if self.position >= self.count:
+            return None
+        image = self.frames[self.position % len(self.frames)]
+        self.position += 1
+        return image
+
+
+def open_source(source=None, width=None, height=None, fps=None):
+    """
+    파이프라인이 사용할 프레임 소스 생성
+    Args:
+        source: 다음 중 하나
+            - None 또는 int: 카메라 장치 번호 (ThreadedCapture, CAMERA_BROKER=1이면 BrokerCapture)
+            - 'synthetic': 합성 프레임 (SyntheticSource)
+            - 디렉토리 경로: 이미지 시퀀스 (ImageDirectorySource)
+            - 파일 경로: 비디오 파일 (VideoFileSource)
+            - read_frame()을 가진 소스 객체: 그대로 사용 (시작 전이면 start 호출)
+        width (int, optional): 카메라 요청 너비 (카메라일 때만 사용, 브로커면 구독 해상도)
+        height (int, optional): 카메라 요청 높이 (카메라일 때만 사용, 브로커면 구독 해상도)
+        fps (int, optional): 카메라 요청 FPS (카메라일 때만 사용, 브로커면 구독 FPS)
+    Returns:
+        시작된 프레임 소스
+    """
+    if source is None or isinstance(source, int):
+        if os.environ.get(CAMERA_BROKER_ENV) == '1':
+            from camera_broker import BrokerCapture
+            return BrokerCapture(0 if source is None else source, width, height, fps).start()
+        return ThreadedCapture(0 if source is None else source, width, height, fps).start()
+    if isinstance(source, str):
+        if source == 'synthetic':
+            return SyntheticSource().start()
+        if os.path.isdir(source):
+            return ImageDirectorySource(source).start()
+        return VideoFileSource(source).start()
+    if getattr(source, 'started_at', None) is None:
+        source.start()
+    return source
@@ -1,344 +1,271 @@
-import streamlit as st
-import cv2
-import mediapipe as mp
-import sqlite3
-import time
-from collections import Counter
-
-class GestureAuthSystem:
-    def __init__(self, db_path="./gesture_auth.db"):
-        """
-        제스처 인증 시스템 초기화
-        Args:
-            db_path (str): SQLite 데이터베이스 파일 경로
-        """
-        # 데이터베이스 경로 설정 및 초기화
-        self.db_path = db_path
-        self.setup_database()
-        
-        # MediaPipe 제스처 인식을 위한 클래스들 초기화
-        self.BaseOptions = mp.tasks.BaseOptions
-        self.GestureRecognizer = mp.tasks.vision.GestureRecognizer
-        self.GestureRecognizerOptions = mp.tasks.vision.GestureRecognizerOptions
-        self.VisionRunningMode = mp.tasks.vision.RunningMode
-        
-        # 제스처 인식 및 녹화 관련 상태 변수들
-        self.current_gesture = None  # 현재 감지된 제스처
-        self.gesture_counts = Counter()  # 제스처 빈도수 카운터
-        self.start_time = None  # 녹화 시작 시간
-        self.is_recording = False  # 녹화 상태
-        self.base_timestamp = int(time.time() * 1000)  # 기준 타임스탬프
-        
-    def setup_database(self):
-        """
-        SQLite 데이터베이스 설정 및 초기화
-        - users 테이블 생성
-        - 기존 테이블이 있는 경우 구조 검증 후 필요시 재생성
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # users 테이블 존재 여부 확인
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-        table_exists = cursor.fetchone() is not None
-        
-        if table_exists:
-            # 기존 테이블의 컬럼 구조 확인
-            cursor.execute("PRAGMA table_info(users)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            # id 컬럼이 없으면 테이블 재생성
-            if 'id' not in columns:
-                cursor.execute("DROP TABLE users")
-                table_exists = False
-        
-        # 테이블이 없는 경우 새로 생성
-        if not table_exists:
-            cursor.execute('''
-                CREATE TABLE users (
-                    id TEXT PRIMARY KEY,           -- 사용자 고유 ID
-                    username TEXT,                 -- 사용자 이름
-                    gesture_1 TEXT,                -- 첫 번째 제스처
-                    gesture_2 TEXT,                -- 두 번째 제스처
-                    gesture_3 TEXT,                -- 세 번째 제스처
-                    image_path TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- 생성 시간
-                )
-            ''')
-            
-        conn.commit()
-        conn.close()
-
-    def check_id_availability(self, user_id):
-        """
-        사용자 ID 중복 확인
-        Args:
-            user_id (str): 확인할 사용자 ID
-        Returns:
-            bool: ID 사용 가능 여부 (True: 사용 가능, False: 이미 존재)
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM users WHERE id = ?", (user_id,))
-        result = cursor.fetchone()
-        conn.close()
-        return result is None
-
-    def save_to_database(self, user_id, username, gestures, image_path=None):
-        """
-        사용자 정보와 제스처를 데이터베이스에 저장
-        Args:
-            user_id (str): 사용자 ID
-            username (str): 사용자 이름
-            gestures (list): 3개의 제스처 시퀀스
-            image_path (str, optional): 얼굴 이미지 파일 경로
-        """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # UPDATE query로 변경
-            cursor.execute("""
-                UPDATE users 
-                SET gesture_1 = ?, gesture_2 = ?, gesture_3 = ?
-                WHERE id = ?
-            """, (gestures[0], gestures[1], gestures[2], user_id))
-            
-            conn.commit()
-            conn.close()
-            st.success("제스처가 성공적으로 저장되었습니다!")
-        except Exception as e:
-            st.error(f"데이터베이스 저장 중 오류 발생: {str(e)}")
-            raise
-
-    def result_callback(self, result, output_image, timestamp_ms):
-        """
-        MediaPipe 제스처 인식 결과 콜백 함수
-        Args:
-            result: MediaPipe 제스처 인식 결과
-            output_image: 처리된 이미지
-            timestamp_ms: 타임스탬프
-        """
-        if result.gestures and result.gestures[0]:
-            self.current_gesture = result.gestures[0][0].category_name
-
-    def process_video(self, mode, user_id, username=None):
-        """
-        비디오 스트림 처리 및 제스처 인식 메인 함수
-        Args:
-            mode (str): 'register' 또는 'verify' 모드
-            user_id (str): 사용자 ID
-            username (str, optional): 사용자 이름 (등록 모드에서만 필요)
-        Returns:
-            bool: 제스처 등록/인증 성공 여부
-        """
-        # 카메라 설정
-        cap = cv2.VideoCapture(0)  
-                
-        frame_placeholder = st.empty()  # 프레임 표시 영역
-        status_placeholder = st.empty()  # 상태 메시지 표시 영역
-        
-        # 카메라 속성 설정
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
-        cap.set(cv2.CAP_PROP_FPS, 60)
-
-        # MediaPipe 제스처 인식기 옵션 설정
-        try:
-            with open('gesture_recognizer.task', 'rb') as file:
-                model_data = file.read()
-        except FileNotFoundError:
-            st.error("제스처 인식 모델 파일을 찾을 수 없습니다.")
-            return False
-
-        options = self.GestureRecognizerOptions(
-            base_options=self.BaseOptions(model_asset_buffer=model_data),
-            running_mode=self.VisionRunningMode.LIVE_STREAM,
-            num_hands=1,  # 한 손만 인식
-            min_hand_detection_confidence=0.5,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5,
-            result_callback=self.result_callback
-        )
-
-        # 상태 변수 초기화
-        self.is_recording = False
-        is_countdown = False
-        all_gestures_complete = False
-        self.current_gesture_index = 0
-        recorded_gestures = []
-        frame_count = 0
-
-        # UI 버튼 생성
-        button_container = st.container()
-        col1, col2, col3 = button_container.columns([0.2, 0.2, 0.6])
-        with col1:
-            start_button = st.button("시작")
-        with col2:
-            reset_button_text = "재등록" if mode == 'register' else "재시도"
-            restart_button = st.button(reset_button_text)
-
-        with self.GestureRecognizer.create_from_options(options) as recognizer:
-            try:
-                while cap.isOpened() and not all_gestures_complete:
-                    ret, frame = cap.read()
-                    if not ret:
-                        st.error("카메라에서 프레임을 읽을 수 없습니다.")
-                        break
-
-                    frame = cv2.resize(frame, (640, 480))
-                    frame_count += 1
-                    
-                    # 재시작 버튼 처리
-                    if restart_button:
-                        self.is_recording = False
-                        is_countdown = False
-                        self.current_gesture_index = 0
-                        recorded_gestures = []
-                        self.gesture_counts.clear()
-                        self.base_timestamp = int(time.time() * 1000)
-                        status_text = "재등록" if mode == 'register' else "재시도"
-                        status_placeholder.info(f"{status_text}를 하려면 시작 버튼을 눌러주세요.")
-                        continue
-
-                    # 시작 버튼 처리
-                    if not is_countdown and start_button:
-                        self.start_time = time.time()
-                        is_countdown = True
-                        self.gesture_counts.clear()
-                        status_placeholder.warning("준비하세요!")
-
-                    # 카운트다운 및 녹화 처리
-                    if is_countdown:
-                        current_time = time.time()
-                        elapsed_time = current_time - self.start_time
-
-                        # 3초 카운트다운
-                        if elapsed_time < 3:
-                            countdown_remaining = 3 - int(elapsed_time)
-                            status_placeholder.warning(f"제스처 {self.current_gesture_index + 1} 준비: {countdown_remaining}초")
-                        
-                        # 3초 녹화
-                        elif elapsed_time < 6:
-                            if not self.is_recording:
-                                self.is_recording = True
-                                self.gesture_counts.clear()
-                            
-                            recording_remaining = 6 - int(elapsed_time)
-                            status_placeholder.error(f"제스처 {self.current_gesture_index + 1} 녹화중: {recording_remaining}초")
-                            
-                            # 현재 제스처 카운팅
-                            if self.current_gesture:
-                                self.gesture_counts[self.current_gesture] += 1
-                        
-                        # 녹화 완료 처리
-                        else:
-                            if self.is_recording:
-                                # 가장 많이 감지된 제스처 저장
-                                if self.gesture_counts:
-                                    most_common_gesture = self.gesture_counts.most_common(1)[0][0]
-                                    recorded_gestures.append(most_common_gesture)
-                                    status_placeholder.success(f"제스처 {self.current_gesture_index + 1}번 완료!")
-                                else:
-                                    recorded_gestures.append(None)
-                                    status_placeholder.warning(f"제스처 {self.current_gesture_index + 1}번 인식 실패!")
-                                
-                                self.is_recording = False
-                                self.current_gesture_index += 1
-                                
-                                # 다음 제스처 준비 또는 완료 처리
-                                if self.current_gesture_index < 3:
-                                    self.start_time = current_time
-                                    self.gesture_counts.clear()
-                                else:
-                                    if len(recorded_gestures) == 3 and all(gesture is not None for gesture in recorded_gestures):
-                                        all_gestures_complete = True
-                                        status_placeholder.success("모든 제스처가 완료되었습니다!")
-                                    else:
-                                        st.error("일부 제스처가 제대로 인식되지 않았습니다. 다시 시도해주세요.")
-                                        return False
-
-                    # 제스처 인식 처리
-                    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
-                    current_timestamp = self.base_timestamp + (frame_count * 16)
-                    recognizer.recognize_async(mp_image, current_timestamp)
-
-                    # 감지된 제스처 표시
-                    if self.current_gesture:
-                        cv2.putText(frame, f"Detected: {self.current_gesture}", 
-                                  (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                    
-                    # 프레임 표시
-                    frame_placeholder.image(frame, channels="BGR", use_container_width=True)
-
-            except Exception as e:
-                st.error(f"비디오 처리 중 오류 발생: {str(e)}")
-                return False
-            finally:
-                cap.release()
-
-            # 모든 제스처 완료 후 처리
-            if all_gestures_complete and len(recorded_gestures) == 3:
-                if mode == 'register':
-                    try:
-                        self.save_to_database(user_id, username, recorded_gestures)
-                        status_placeholder.success("제스처 등록이 완료되었습니다!")
-                        return True
-                    except Exception as e:
-                        st.error(f"제스처 등록 중 오류 발생: {str(e)}")
-                        return False
-                elif mode == 'verify':
-                    result = self.verify_gestures(user_id, recorded_gestures)
-                    status_placeholder.info(result)
-                    return "성공" in result
-
-            return False
-
-    def verify_gestures(self, user_id, input_gestures):
-        """
-        입력된 제스처와 저장된 제스처를 비교하여 인증
-        Args:
-            user_id (str): 사용자 ID
-            input_gestures (list): 입력된 3개의 제스처 시퀀스
-        Returns:
-            str: 인증 결과 메시지
-        """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT username, gesture_1, gesture_2, gesture_3 
-                FROM users WHERE id = ?
-            """, (user_id,))
-            result = cursor.fetchone()
-            conn.close()
-
-            if result:
-                username = result[0]
-                stored_gestures = result[1:]
-                # 입력된 제스처와 저장된 제스처 비교
-                matches = sum(1 for stored, input_gesture in zip(stored_gestures, input_gestures)
-                             if stored == input_gesture)
-
-                if matches == 3:
-                    return f"인증 성공! 👋 {username} 님 안녕하세요!"
-                else:
-                    return "인증 실패: 제스처가 일치하지 않습니다."
-            return "인증 실패: 등록되지 않은 사용자입니다."
-        except Exception as e:
-            return f"인증 오류: {str(e)}"
-
-    @staticmethod
-    def get_available_gestures():
-        return """
-        ### 사용 가능한 제스처 목록
-        - None (제스처 없음)
-        - Closed_Fist (주먹)
-        - Open_Palm (손바닥)
-        - Pointing_Up (검지 들기)
-        - Thumb_Down (엄지 아래)
-        - Thumb_Up (엄지 위)
-        - Victory (브이)
-        - ILoveYou (ILY)
+import streamlit as st
+import cv2
+import mediapipe as mp
+import time
+from gesture_buffer import GestureResultBuffer
+from gesture_commit import GestureCommitPolicy
+from frame_pipeline import FramePipeline
+from preview import PreviewChannel
+from model_pool import gesture_recognizer_pool, read_model
+from frame_source import open_source
+from auth_engine import GestureSequenceEngine, IDLE, ACCEPTED, REJECTED, show_event
+from gesture_store import UserGestureStore
+from audit import get_audit_log, SUCCESS, FAILURE, ERROR
+
+class GestureAuthSystem:
+    # 감사 로그에 남길 인증 종류
+    audit_kind = 'gesture'
+
+    def __init__(self, db_path="./gesture_auth.db", commit_policy=None, inference_size=None, store=None,
+                 model_path='gesture_recognizer.task', capture_fps=60, display_size=(640, 480), audit=None):
+        """
+        제스처 인증 시스템 초기화
+        - 로그인(users, 3단계)과 파일 잠금(fpwd, 4단계)이 같은 캡처/인식/확정 경로를 사용
+        - 단계 수와 저장 대상은 store로 결정
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로 (store가 없을 때 사용자 저장소 경로)
+            commit_policy (GestureCommitPolicy, optional): 제스처 확정 정책
+            inference_size (tuple, optional): 인식용 (width, height) (기본값: 캡처 해상도)
+            store (GestureStore, optional): 제스처 저장소 (기본값: users 테이블, 3단계)
+            model_path (str): 제스처 인식 모델 파일 경로
+            capture_fps (int): 요청할 카메라 FPS
+            display_size (tuple): 화면 표시용 (width, height)
+            audit (AuditLog, optional): 등록/인증 시도 기록 (기본값: 프로세스 전역 감사 로그)
+        """
+        # 데이터베이스 경로 설정 및 초기화
+        self.store = store or UserGestureStore(db_path)
+        self.db_path = self.store.db_path
+        self.steps = self.store.steps
+        self.model_path = model_path
+        self.capture_fps = capture_fps
+        self.audit = audit if audit is not None else get_audit_log()
+        
+        # MediaPipe 제스처 인식을 위한 클래스들 초기화
+        self.BaseOptions = mp.tasks.BaseOptions
+        self.GestureRecognizer = mp.tasks.vision.GestureRecognizer
+        self.GestureRecognizerOptions = mp.tasks.vision.GestureRecognizerOptions
+        self.VisionRunningMode = mp.tasks.vision.RunningMode
+        
+        # 제스처 인식 및 녹화 관련 상태 변수들
+        self.gesture_results = GestureResultBuffer()  # 콜백 스레드가 쌓는 인식 결과 버퍼
+        # 안정적으로 유지된 제스처를 바로 확정하는 정책 (고정 3초+3초 타이머 대체)
+        self.commit_policy = commit_policy or GestureCommitPolicy()
+        # 인식은 원본(또는 지정) 해상도, 확대는 화면 표시용으로만 수행
+        self.inference_size = inference_size
+        self.display_size = display_size
+        self.start_time = None  # 녹화 시작 시간
+        self.is_recording = False  # 녹화 상태
+        self.stream_stats = None  # 마지막 세션의 프레임 제출 통계
+        self.preview_stats = None  # 마지막 세션의 미리보기 전송 통계
+        self.capture_stats = None  # 마지막 세션의 캡처 통계 (FPS, 프레임 나이, 건너뛴 프레임)
+
+    def setup_database(self):
+        """
+        저장소 테이블 생성 (기존 테이블 구조 검증 포함)
+        """
+        self.store.setup_database()
+
+    def check_id_availability(self, user_id):
+        """
+        사용자 ID 중복 확인
+        Args:
+            user_id (str): 확인할 사용자 ID
+        Returns:
+            bool: ID 사용 가능 여부 (True: 사용 가능, False: 이미 존재)
+        """
+        return not self.store.exists(user_id)
+
+    def save_to_database(self, user_id, username, gestures, image_path=None):
+        """
+        사용자 제스처를 데이터베이스에 저장 (화면 표시는 호출한 쪽에서 수행)
+        Args:
+            user_id (str): 사용자 ID
+            username (str): 사용자 이름
+            gestures (list): 제스처 시퀀스 (store.steps개)
+            image_path (str, optional): 얼굴 이미지 파일 경로
+        """
+        self.store.save(user_id, gestures)
+
+    @property
+    def current_gesture(self):
+        """
+        화면 표시용 가장 최근 제스처
+        """
+        latest = self.gesture_results.latest
+        return latest.category if latest else None
+
+    def record_attempt(self, action, subject, outcome, reason=None, engine=None, **stages):
+        """
+        제스처 등록/인증 시도를 감사 로그에 기록 (버퍼에 넣기만 하므로 인증 경로를 늦추지 않음)
+        Args:
+            action (str): 'register' 또는 'verify'
+            subject (str): 사용자 ID 또는 파일 이름
+            outcome (str): SUCCESS, FAILURE, ERROR
+            reason (str, optional): 실패 사유
+            engine (GestureSequenceEngine, optional): 단계별 소요 시간을 가진 엔진
+            **stages: 추가로 남길 단계별 소요 시간 (ms)
+        """
+        total_ms = None
+        if engine is not None:
+            stages['steps_ms'] = [round(ms, 1) for ms in engine.step_ms]
+            if self.start_time is not None:
+                total_ms = (time.time() - self.start_time) * 1000
+        self.audit.record(self.audit_kind, action, subject, outcome, reason, total_ms, stages)
+
+    def process_video(self, mode, user_id, username=None, source=None, auto_start=False):
+        """
+        비디오 스트림 처리 및 제스처 인식 메인 함수
+        Args:
+            mode (str): 'register' 또는 'verify' 모드
+            user_id (str): 사용자 ID
+            username (str, optional): 사용자 이름 (등록 모드에서만 필요)
+            source (optional): 프레임 소스 (카메라 번호, 비디오/이미지 디렉토리 경로, 'synthetic' 또는 소스 객체)
+            auto_start (bool): 시작 버튼 없이 바로 인식 시작 (오프라인 실행용)
+        Returns:
+            bool: 제스처 등록/인증 성공 여부
+        """
+        frame_placeholder = st.empty()  # 프레임 표시 영역
+        status_placeholder = st.empty()  # 상태 메시지 표시 영역
+
+        # 프로세스 전역 풀에서 미리 초기화된 제스처 인식기를 빌려 사용
+        # (모델 파일은 최초 한 번만 읽음)
+        try:
+            read_model(self.model_path)
+        except FileNotFoundError:
+            st.error("제스처 인식 모델 파일을 찾을 수 없습니다.")
+            return False
+        recognizer_pool = gesture_recognizer_pool(self.model_path)
+
+        # 카메라 설정 - 백그라운드 스레드가 캡처하고 루프는 최신 프레임만 받음
+        # (source를 지정하면 비디오 파일/이미지 시퀀스/합성 프레임 사용)
+        cap = open_source(source, width=320, height=240, fps=self.capture_fps)
+
+        # UI 버튼 생성
+        button_container = st.container()
+        col1, col2, col3 = button_container.columns([0.2, 0.2, 0.6])
+        with col1:
+            start_button = st.button("시작")
+        with col2:
+            reset_button_text = "재등록" if mode == 'register' else "재시도"
+            restart_button = st.button(reset_button_text)
+
+        with recognizer_pool.lease() as recognizer:
+            # 인식 결과 집계와 단계 진행은 UI와 무관한 엔진이 처리하고, 여기서는 버튼/이벤트 표시만 수행
+            # (실제 캡처 시각으로 제출하고, 인식기가 바쁘면 프레임을 건너뜀)
+            engine = GestureSequenceEngine(recognizer, steps=self.steps, commit_policy=self.commit_policy,
+                                           inference_size=self.inference_size, results=self.gesture_results)
+            pipeline = FramePipeline(display_size=self.display_size)
+            # 전송 FPS를 제한하고 JPEG로 압축해 보내는 미리보기 채널
+            preview = PreviewChannel(frame_placeholder)
+            self.is_recording = False
+
+            if restart_button:
+                status_text = "재등록" if mode == 'register' else "재시도"
+                status_placeholder.info(f"{status_text}를 하려면 시작 버튼을 눌러주세요.")
+            elif start_button or auto_start:
+                self.start_time = time.time()
+                self.is_recording = True
+                for event in engine.start(self.start_time):
+                    show_event(event, status_placeholder)
+
+            try:
+                while cap.isOpened() and not engine.done:
+                    captured = cap.read_frame()
+                    if captured is None:
+                        st.error("카메라에서 프레임을 읽을 수 없습니다.")
+                        break
+                    frame = captured.image
+                    capture_ms = int(captured.timestamp * 1000)  # 실제 캡처 시각 (단조 증가)
+
+                    for event in engine.process(frame, capture_ms):
+                        show_event(event, status_placeholder)
+
+                    # 감지된 제스처 표시 (표시용 버퍼에만 그림)
+                    display_frame = pipeline.for_display(frame)
+                    if self.current_gesture:
+                        cv2.putText(display_frame, f"Detected: {self.current_gesture}", 
+                                  (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    
+                    # 프레임 표시
+                    preview.publish(display_frame)
+
+            except Exception as e:
+                st.error(f"비디오 처리 중 오류 발생: {str(e)}")
+                if engine.state != IDLE:
+                    self.record_attempt(mode, user_id, ERROR, 'exception', engine)
+                return False
+            finally:
+                self.is_recording = False
+                self.capture_stats = cap.stats()
+                cap.release()
+                # 제출/드롭/완료 프레임 수 등 인식 처리량 통계
+                self.stream_stats = engine.stats()
+                self.preview_stats = preview.stats()
+
+            # 모든 제스처 완료 후 처리
+            if engine.state == ACCEPTED:
+                recorded_gestures = engine.decision['gestures']
+                if mode == 'register':
+                    try:
+                        self.store.save(user_id, recorded_gestures)
+                        self.record_attempt(mode, user_id, SUCCESS, engine=engine)
+                        status_placeholder.success("제스처 등록이 완료되었습니다!")
+                        return True
+                    except Exception as e:
+                        self.record_attempt(mode, user_id, ERROR, 'store', engine)
+                        st.error(f"제스처 등록 중 오류 발생: {str(e)}")
+                        return False
+                elif mode == 'verify':
+                    result = self.verify_gestures(user_id, recorded_gestures, engine)
+                    status_placeholder.info(result)
+                    return "성공" in result
+            elif engine.state == REJECTED:
+                self.record_attempt(mode, user_id, FAILURE, 'unrecognized_step', engine)
+            elif engine.state != IDLE:
+                # 시작했지만 결정 전에 카메라가 끊김
+                self.record_attempt(mode, user_id, ERROR, 'camera', engine)
+
+            return False
+
+    def verify_gestures(self, user_id, input_gestures, engine=None):
+        """
+        입력된 제스처와 저장된 제스처를 비교하여 인증
+        Args:
+            user_id (str): 사용자 ID
+            input_gestures (list): 입력된 제스처 시퀀스 (store.steps개)
+            engine (GestureSequenceEngine, optional): 감사 로그에 단계별 소요 시간을 남길 엔진
+        Returns:
+            str: 인증 결과 메시지
+        """
+        start = time.perf_counter()
+        try:
+            matched, label = self.store.verify(user_id, input_gestures)
+        except Exception as e:
+            self.record_attempt('verify', user_id, ERROR, 'store', engine)
+            return f"인증 오류: {str(e)}"
+        verify_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        if matched is None:
+            self.record_attempt('verify', user_id, FAILURE, 'unknown_subject', engine, verify_ms=verify_ms)
+            return "인증 실패: 등록되지 않은 사용자입니다."
+        if not matched:
+            self.record_attempt('verify', user_id, FAILURE, 'mismatch', engine, verify_ms=verify_ms)
+            return "인증 실패: 제스처가 일치하지 않습니다."
+        self.record_attempt('verify', user_id, SUCCESS, engine=engine, verify_ms=verify_ms)
+        if label:
+            return f"인증 성공! 👋 {label} 님 안녕하세요!"
+        return "인증 성공! 👋"
+
+    @staticmethod
+    def get_available_gestures():
+        return """
+        ### 사용 가능한 제스처 목록
+        - None (제스처 없음)
+        - Closed_Fist (주먹)
+        - Open_Palm (손바닥)
+        - Pointing_Up (검지 들기)
+        - Thumb_Down (엄지 아래)
+        - Thumb_Up (엄지 위)
+        - Victory (브이)
+        - ILoveYou (ILY)
         """
\ No newline at end of file
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+# 제스처 인식 결과 한 건
+GestureResult = namedtuple('GestureResult', ['timestamp_ms', 'category', 'score'])
+
+
+class GestureResultBuffer:
+    """
+    MediaPipe LIVE_STREAM 콜백 스레드와 캡처 루프 사이의 제한 크기 링 버퍼
+    - 콜백은 push로 결과를 쌓고, 캡처 루프는 drain으로 새 결과를 정확히 한 번씩 소비
+    - 가득 차면 가장 오래된 결과를 버리고 dropped로 집계
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Args:
+            capacity (int): 보관할 최대 결과 수
+        """
+        self.capacity = capacity
+        self.buffer = deque(maxlen=capacity)
+        self.lock = threading.Lock()
+        self.latest = None  # 화면 표시용 가장 최근 결과
+        self.pushed = 0
+        self.consumed = 0
+        self.dropped = 0
+        self.first_push_at = None
+
+    def push(self, timestamp_ms, category, score):
+        """
+        인식 결과 추가 (콜백 스레드에서 호출)
+        Args:
+            timestamp_ms (int): 결과가 나온 프레임의 타임스탬프
+            category (str | None): 제스처 이름 (손이 없으면 None)
+            score (float): 제스처 점수
+        """
+        record = GestureResult(timestamp_ms, category, score)
+        with self.lock:
+            if len(self.buffer) == self.capacity:
+                self.dropped += 1
+            self.buffer.append(record)
+            self.latest = record
+            self.pushed += 1
+            if self.first_push_at is None:
+                self.first_push_at = time.monotonic()
+
+    def drain(self):
+        """
+        쌓인 결과를 모두 꺼냄 (캡처 루프에서 호출)
+        Returns:
+            list: 오래된 순서의 GestureResult 리스트
+        """
+        with self.lock:
+            records = list(self.buffer)
+            self.buffer.clear()
+            self.consumed += len(records)
+        return records
+
+    def clear(self):
+        """
+        버퍼와 통계 초기화 (재시작 시)
+        """
+        with self.lock:
+            self.buffer.clear()
+            self.latest = None
+            self.pushed = 0
+            self.consumed = 0
+            self.dropped = 0
+            self.first_push_at = None
+
+    def stats(self):
+        """
+        Returns:
+            dict: 누적 결과 수, 소비/유실 수, 초당 결과 수, 유실률
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.first_push_at if self.first_push_at else 0.0
+            return {
+                'pushed': self.pushed,
+                'consumed': self.consumed,
+                'dropped': self.dropped,
+                'results_per_sec': self.pushed / elapsed if elapsed > 0 else 0.0,
+                'drop_rate': self.dropped / self.pushed if self.pushed else 0.0,
+            }
@@ -0,0 +1,102 @@
+import time
+from collections import Counter, namedtuple
+
+# 한 단계의 제스처 확정 결과 (reason: 'stable' 또는 'timeout')
+GestureCommit = namedtuple('GestureCommit', ['category', 'reason', 'elapsed'])
+
+
+class GestureCommitPolicy:
+    """
+    고정 타이머 대신 인식 결과 흐름을 보고 제스처를 확정하는 정책
+    - 점수 min_score 이상인 같은 제스처가 required_streak번 연속되고
+      min_hold초 이상 유지되면 즉시 확정
+    - timeout초 안에 확정되지 않으면 그동안의 다수결(없으면 None)로 확정
+    - 직전 단계에서 확정된 제스처는 손을 바꾸거나 rearm_time이 지나야 다시 인정
+      (같은 자세를 유지한 채 다음 단계가 바로 확정되는 것을 방지)
+    """
+
+    def __init__(self, required_streak=5, min_score=0.6, min_hold=0.3, timeout=5.0, rearm_time=1.0,
+                 ignored=('None',)):
+        """
+        Args:
+            required_streak (int): 확정에 필요한 연속 일치 결과 수
+            min_score (float): 집계할 최소 제스처 점수
+            min_hold (float): 확정에 필요한 최소 유지 시간 (초)
+            timeout (float): 한 단계의 최대 시간 (초)
+            rearm_time (float): 직전 제스처를 다시 인정하기까지의 시간 (초)
+            ignored (tuple): 제스처로 치지 않을 카테고리 이름
+        """
+        self.required_streak = required_streak
+        self.min_score = min_score
+        self.min_hold = min_hold
+        self.timeout = timeout
+        self.rearm_time = rearm_time
+        self.ignored = set(ignored)
+        self.start()
+
+    def start(self, now=None, previous=None):
+        """
+        새 단계 시작
+        Args:
+            now (float, optional): 현재 시각 (기본값: time.time())
+            previous (str, optional): 직전 단계에서 확정된 제스처
+        """
+        self.step_started = time.time() if now is None else now
+        self.blocked = previous
+        self.streak_category = None
+        self.streak = 0
+        self.streak_start_ms = None
+        self.votes = Counter()
+
+    @property
+    def progress(self):
+        """
+        현재 연속 일치 진행률 (0~1)
+        """
+        return min(1.0, self.streak / self.required_streak)
+
+    def update(self, records, now=None):
+        """
+        새 인식 결과 반영
+        Args:
+            records (list): GestureResult 리스트 (오래된 순)
+            now (float, optional): 현재 시각 (기본값: time.time())
+        Returns:
+            GestureCommit | None: 확정된 경우 결과, 아니면 None
+        """
+        now = time.time() if now is None else now
+        elapsed = now - self.step_started
+
+        for record in records:
+            category = record.category
+            valid = category is not None and category not in self.ignored and record.score >= self.min_score
+
+            # 직전 제스처가 풀릴 때까지 같은 제스처는 무시
+            # (인식 실패 결과만으로는 풀리지 않음)
+            if self.blocked is not None:
+                if category == self.blocked and elapsed < self.rearm_time:
+                    continue
+                if valid or elapsed >= self.rearm_time:
+                    self.blocked = None
+
+            if not valid:
+                self.streak_category = None
+                self.streak = 0
+                continue
+
+            self.votes[category] += 1
+            if category == self.streak_category:
+                self.streak += 1
+            else:
+                self.streak_category = category
+                self.streak = 1
+                self.streak_start_ms = record.timestamp_ms
+
+            held = (record.timestamp_ms - self.streak_start_ms) / 1000.0
+            if self.streak >= self.required_streak and held >= self.min_hold:
+                return GestureCommit(category, 'stable', elapsed)
+
+        if elapsed >= self.timeout:
+            most_common = self.votes.most_common(1)
+            return GestureCommit(most_common[0][0] if most_common else None, 'timeout', elapsed)
+        return None
@@ -0,0 +1,327 @@
+import hashlib
+import hmac
+import os
+from db import get_pool, migrate
+
+# 솔트 길이 (바이트, BLAKE2b 솔트 최대 길이)
+SALT_SIZE = 16
+# 다이제스트 길이 (바이트)
+DIGEST_SIZE = 32
+# 키 파일 대신 쓸 비밀 키 환경 변수 (16진수 문자열)
+SECRET_KEY_ENV = 'GESTURE_SECRET_KEY'
+# 키 파일을 둘 디렉토리 환경 변수 (기본값: 데이터베이스 파일 옆 - 저장소 밖에 두려면 지정)
+SECRET_KEY_DIR_ENV = 'GESTURE_KEY_DIR'
+# 정규 시퀀스의 제스처 구분자 (ASCII unit separator, 제스처 이름에는 쓸 수 없음)
+SEPARATOR = '\x1f'
+
+_secret_keys = {}
+
+
+def load_secret_key(db_path):
+    """
+    데이터베이스별 비밀 키 (환경 변수 > 키 파일 순, 없으면 키 파일 생성)
+    - 키는 데이터베이스 파일 밖({db_path}.key, GESTURE_KEY_DIR가 있으면 그 디렉토리)에 두어
+      DB 파일만 유출돼서는 다이제스트를 대입해 볼 수 없음
+    Args:
+        db_path (str): SQLite 데이터베이스 파일 경로
+    Returns:
+        bytes: 비밀 키
+    """
+    env_key = os.environ.get(SECRET_KEY_ENV)
+    if env_key:
+        return bytes.fromhex(env_key)
+
+    key_dir = os.environ.get(SECRET_KEY_DIR_ENV)
+    if key_dir:
+        os.makedirs(key_dir, mode=0o700, exist_ok=True)
+        key_path = os.path.join(os.path.abspath(key_dir), os.path.basename(db_path) + '.key')
+    else:
+        key_path = os.path.abspath(db_path) + '.key'
+    key = _secret_keys.get(key_path)
+    if key is not None:
+        return key
+
+    try:
+        # 소유자만 읽을 수 있는 권한으로 새로 생성 (동시에 생성하면 한쪽만 성공)
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(32))
+    except FileExistsError:
+        pass
+    with open(key_path, 'rb') as f:
+        key = f.read()
+    _secret_keys[key_path] = key
+    return key
+
+
+def canonical_sequence(gestures):
+    """
+    제스처 시퀀스의 정규 바이트 표현 (구분자로 이어 붙여 ["ab"]와 ["a", "b"]가 구분됨)
+    """
+    return SEPARATOR.join(gestures).encode('utf-8')
+
+
+def gesture_digest(key, salt, gestures):
+    """
+    솔트를 붙인 키 해시 (BLAKE2b 키/솔트 모드 - HMAC과 같은 용도로 설계됐고 해시 한 번으로 끝남)
+    Args:
+        key (bytes): 비밀 키
+        salt (bytes): 소유자별 솔트
+        gestures (list): 제스처 시퀀스
+    Returns:
+        bytes: 다이제스트
+    """
+    return hashlib.blake2b(canonical_sequence(gestures), key=key, salt=salt, digest_size=DIGEST_SIZE).digest()
+
+
+def seal_gestures(key, gestures):
+    """
+    저장할 제스처 비밀 생성
+    Args:
+        key (bytes): 비밀 키
+        gestures (list): 제스처 시퀀스
+    Returns:
+        tuple: (솔트, 다이제스트, 시퀀스 길이)
+    """
+    if any(SEPARATOR in gesture for gesture in gestures):
+        raise ValueError("제스처 이름에 구분자 문자를 쓸 수 없습니다.")
+    salt = os.urandom(SALT_SIZE)
+    return salt, gesture_digest(key, salt, gestures), len(gestures)
+
+
+# 제스처 시퀀스 단계 테이블 (스키마 2에서만 사용, 3에서 해시로 옮긴 뒤 삭제)
+GESTURE_STEPS_TABLE = """
+    CREATE TABLE gesture_steps (
+        owner TEXT NOT NULL,           -- 사용자 ID 또는 파일 이름
+        position INTEGER NOT NULL,     -- 단계 번호 (1부터)
+        gesture TEXT NOT NULL,         -- 제스처 이름
+        PRIMARY KEY (owner, position)
+    ) WITHOUT ROWID
+"""
+
+
+def copy_gesture_columns(table, key_column, steps):
+    # 고정 gesture_1..N 컬럼을 단계 테이블 행으로 옮기는 SQL
+    selects = " UNION ALL ".join(
+        f"SELECT {key_column}, {i}, gesture_{i} FROM {table} WHERE gesture_{i} IS NOT NULL"
+        for i in range(1, steps + 1)
+    )
+    return f"INSERT INTO gesture_steps (owner, position, gesture) {selects}"
+
+
+def hash_gesture_steps(table, key_column):
+    """
+    마이그레이션 단계: 평문 gesture_steps를 소유자 행의 해시로 옮김
+    Args:
+        table (str): 소유자 테이블 이름
+        key_column (str): 소유자 기본 키 컬럼
+    Returns:
+        callable: 연결을 받아 실행하는 마이그레이션 함수
+    """
+    def step(conn):
+        db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+        key = load_secret_key(db_path)
+        sequences = {}
+        for owner, gesture in conn.execute("SELECT owner, gesture FROM gesture_steps ORDER BY owner, position"):
+            sequences.setdefault(owner, []).append(gesture)
+        conn.executemany(
+            f"UPDATE {table} SET gesture_salt = ?, gesture_digest = ?, gesture_length = ? WHERE {key_column} = ?",
+            [(*seal_gestures(key, gestures), owner) for owner, gestures in sequences.items()]
+        )
+    return step
+
+
+# gesture_auth.db 스키마 버전 (PRAGMA user_version)
+USER_MIGRATIONS = [
+    # 1: 기존 구조 (고정 gesture_1..3 컬럼)
+    ("""
+        CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            username TEXT,
+            gesture_1 TEXT,
+            gesture_2 TEXT,
+            gesture_3 TEXT,
+            image_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,),
+    # 2: 사용자 정보와 제스처 단계를 분리
+    ("""
+        CREATE TABLE users_new (
+            id TEXT PRIMARY KEY,           -- 사용자 고유 ID
+            username TEXT,                 -- 사용자 이름
+            image_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- 생성 시간
+        )
+    """,
+     "INSERT INTO users_new (id, username, image_path, created_at) "
+     "SELECT id, username, image_path, created_at FROM users",
+     GESTURE_STEPS_TABLE,
+     copy_gesture_columns('users', 'id', 3),
+     "DROP TABLE users",
+     "ALTER TABLE users_new RENAME TO users"),
+    # 3: 평문 제스처 단계를 소유자 행의 솔트+키 해시로 교체
+    # - WITHOUT ROWID: 기본 키 인덱스와 행이 같은 B-트리에 있어 검증 조회가 트리 한 번으로 끝남
+    ("""
+        CREATE TABLE users_new (
+            id TEXT PRIMARY KEY,           -- 사용자 고유 ID
+            username TEXT,                 -- 사용자 이름
+            image_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- 생성 시간
+            gesture_salt BLOB,             -- 사용자별 난수 솔트
+            gesture_digest BLOB,           -- BLAKE2b(키, 솔트, 정규 시퀀스)
+            gesture_length INTEGER         -- 시퀀스 길이
+        ) WITHOUT ROWID
+    """,
+     "INSERT INTO users_new (id, username, image_path, created_at) "
+     "SELECT id, username, image_path, created_at FROM users",
+     hash_gesture_steps('users_new', 'id'),
+     "DROP TABLE users",
+     "ALTER TABLE users_new RENAME TO users",
+     "DROP TABLE gesture_steps"),
+]
+
+# fpwd.db 스키마 버전 (PRAGMA user_version)
+FILE_MIGRATIONS = [
+    # 1: 기존 구조 (고정 gesture_1..4 컬럼)
+    ("""
+        CREATE TABLE IF NOT EXISTS fpwd (
+            fname TEXT PRIMARY KEY,
+            gesture_1 TEXT,
+            gesture_2 TEXT,
+            gesture_3 TEXT,
+            gesture_4 TEXT
+        )
+    """,),
+    # 2: 보호 파일 목록과 제스처 단계를 분리
+    ("""
+        CREATE TABLE files (
+            fname TEXT PRIMARY KEY,        -- 보호 파일 이름
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+     "INSERT INTO files (fname) SELECT fname FROM fpwd",
+     GESTURE_STEPS_TABLE,
+     copy_gesture_columns('fpwd', 'fname', 4),
+     "DROP TABLE fpwd"),
+    # 3: 평문 제스처 단계를 소유자 행의 솔트+키 해시로 교체
+    ("""
+        CREATE TABLE files_new (
+            fname TEXT PRIMARY KEY,        -- 보호 파일 이름
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            gesture_salt BLOB,             -- 파일별 난수 솔트
+            gesture_digest BLOB,           -- BLAKE2b(키, 솔트, 정규 시퀀스)
+            gesture_length INTEGER         -- 시퀀스 길이
+        ) WITHOUT ROWID
+    """,
+     "INSERT INTO files_new (fname, created_at) SELECT fname, created_at FROM files",
+     hash_gesture_steps('files_new', 'fname'),
+     "DROP TABLE files",
+     "ALTER TABLE files_new RENAME TO files",
+     "DROP TABLE gesture_steps"),
+]
+
+
+class GestureStore:
+    """
+    제스처 시퀀스 저장소
+    - 소유자 테이블(users, files) 한 행에 솔트, 키 해시 다이제스트, 시퀀스 길이만 저장 (평문 제스처 없음)
+    - 검증은 기본 키로 한 행만 읽고 다이제스트를 상수 시간으로 비교
+    - 사용자 로그인(3단계)과 파일 잠금(4단계)이 같은 코드로 저장/검증
+    - 스키마는 프로세스당 한 번 user_version 마이그레이션으로 맞춤
+    """
+
+    def __init__(self, db_path, table, key_column, steps, label_column=None, migrations=()):
+        """
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            table (str): 소유자 테이블 이름
+            key_column (str): 소유자 기본 키 컬럼 (사용자 ID, 파일 이름 등)
+            steps (int): 제스처 수 (입력/저장할 시퀀스 길이)
+            label_column (str, optional): 인증 성공 메시지에 쓸 표시 이름 컬럼
+            migrations (list): 이 데이터베이스의 마이그레이션 목록
+        """
+        self.db_path = db_path
+        self.table = table
+        self.key_column = key_column
+        self.steps = steps
+        self.label_column = label_column
+        self.migrations = migrations
+        self.pool = get_pool(db_path)
+
+        # SQL 문자열을 한 번만 만들어 두면 연결별 문장 캐시에서 다시 파싱하지 않음
+        self.exists_sql = f"SELECT 1 FROM {table} WHERE {key_column} = ?"
+        self.save_sql = f"""
+            INSERT INTO {table} ({key_column}, gesture_salt, gesture_digest, gesture_length) VALUES (?, ?, ?, ?)
+            ON CONFLICT({key_column}) DO UPDATE SET gesture_salt = excluded.gesture_salt,
+                gesture_digest = excluded.gesture_digest, gesture_length = excluded.gesture_length
+        """
+        self.verify_sql = f"""
+            SELECT {label_column or 'NULL'}, gesture_salt, gesture_digest FROM {table} WHERE {key_column} = ?
+        """
+        self.setup_database()
+        self.key = load_secret_key(db_path)
+
+    def setup_database(self):
+        """
+        스키마를 최신 버전으로 맞춤 (프로세스당 한 번만 실제로 실행)
+        """
+        migrate(self.db_path, self.migrations)
+
+    def exists(self, key):
+        """
+        Args:
+            key (str): 사용자 ID 또는 파일 이름
+        Returns:
+            bool: 행 존재 여부
+        """
+        return self.pool.fetchone(self.exists_sql, (key,)) is not None
+
+    def save(self, key, gestures):
+        """
+        제스처 시퀀스 저장 (행이 있으면 비밀만 새 솔트로 교체, 없으면 추가)
+        Args:
+            key (str): 사용자 ID 또는 파일 이름
+            gestures (list): steps개의 제스처 시퀀스
+        """
+        if len(gestures) != self.steps:
+            raise ValueError(f"제스처 {self.steps}개가 필요합니다 (입력: {len(gestures)}개)")
+
+        with self.pool.transaction() as conn:
+            conn.execute(self.save_sql, (key, *seal_gestures(self.key, gestures)))
+
+    def verify(self, key, gestures):
+        """
+        입력 제스처와 저장된 제스처 비교 (한 행 조회 + 상수 시간 다이제스트 비교)
+        Args:
+            key (str): 사용자 ID 또는 파일 이름
+            gestures (list): 입력된 제스처 시퀀스
+        Returns:
+            tuple: (일치 여부 또는 None(미등록), 표시 이름)
+        """
+        row = self.pool.fetchone(self.verify_sql, (key,))
+        if row is None:
+            return None, None
+        label, salt, digest = row
+        if digest is None:
+            # 소유자는 있지만 제스처를 아직 등록하지 않음
+            return False, label
+        return hmac.compare_digest(gesture_digest(self.key, salt, gestures), digest), label
+
+
+class UserGestureStore(GestureStore):
+    """
+    로그인용 사용자 제스처 저장소 (gesture_auth.db의 users 테이블, 3단계)
+    """
+
+    def __init__(self, db_path="./gesture_auth.db"):
+        super().__init__(db_path, 'users', 'id', 3, label_column='username', migrations=USER_MIGRATIONS)
+
+
+class FileGestureStore(GestureStore):
+    """
+    파일 잠금용 제스처 저장소 (fpwd.db의 files 테이블, 4단계)
+    """
+
+    def __init__(self, db_path="./fpwd.db"):
+        super().__init__(db_path, 'files', 'fname', 4, migrations=FILE_MIGRATIONS)
@@ -0,0 +1,116 @@
+import threading
+import time
+
+
+def monotonic_ms():
+    """
+    벽시계 보정의 영향을 받지 않는 밀리초 타임스탬프
+    """
+    return int(time.monotonic() * 1000)
+
+
+class RecognizerSubmitter:
+    """
+    LIVE_STREAM 인식기 앞단의 프레임 제출기
+    - 실제 캡처 시각(단조 증가 ms)을 타임스탬프로 사용
+    - 인식기가 처리 중이면 새 프레임은 버리고, 다음에 들어오는 최신 프레임을 제출 (latest-frame-wins)
+    - MediaPipe가 내부적으로 버린 프레임은 콜백이 오지 않으므로 stale_ms가 지나면 유실로 처리
+    - 제출/드롭/완료/유실 수를 집계
+    """
+
+    def __init__(self, recognizer, listener, max_in_flight=1, stale_ms=500):
+        """
+        Args:
+            recognizer: recognize_async(image, timestamp_ms)와 listener 속성을 가진 인식기
+            listener (callable): (result, output_image, timestamp_ms) 결과 콜백
+            max_in_flight (int): 동시에 처리 중일 수 있는 최대 프레임 수
+            stale_ms (int): 결과가 오지 않은 프레임을 유실로 보는 시간 (ms)
+        """
+        self.recognizer = recognizer
+        self.listener = listener
+        self.max_in_flight = max_in_flight
+        self.stale_ms = stale_ms
+        self.lock = threading.Lock()
+        self.in_flight = {}  # 타임스탬프 -> 제출 시각(ms)
+        self.last_timestamp = -1
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+        self.lost = 0
+        self.latency_ms_total = 0
+        self.started_at = time.monotonic()
+        recognizer.listener = self.on_result
+
+    def try_acquire(self, now_ms=None):
+        """
+        제출 가능 여부 확인 (바쁘면 드롭으로 집계)
+        Returns:
+            bool: True면 이어서 submit을 호출해야 함
+        """
+        now_ms = monotonic_ms() if now_ms is None else now_ms
+        with self.lock:
+            # 결과가 끝내 오지 않은 프레임 정리
+            for timestamp, sent_at in list(self.in_flight.items()):
+                if now_ms - sent_at > self.stale_ms:
+                    del self.in_flight[timestamp]
+                    self.lost += 1
+
+            if len(self.in_flight) >= self.max_in_flight:
+                self.dropped += 1
+                return False
+            return True
+
+    def submit(self, image, capture_ms):
+        """
+        프레임 제출
+        Args:
+            image (mp.Image): 인식할 이미지
+            capture_ms (int): 프레임 캡처 시각 (monotonic_ms 기준)
+        Returns:
+            int: 실제 사용된 타임스탬프
+        """
+        with self.lock:
+            # MediaPipe는 엄격히 증가하는 타임스탬프를 요구
+            timestamp = max(int(capture_ms), self.last_timestamp + 1)
+            self.last_timestamp = timestamp
+            self.in_flight[timestamp] = monotonic_ms()
+            self.submitted += 1
+
+        used = self.recognizer.recognize_async(image, timestamp)
+        # 풀 인식기가 타임스탬프를 보정한 경우 그 값으로 추적
+        if used is not None and used != timestamp:
+            with self.lock:
+                sent_at = self.in_flight.pop(timestamp, None)
+                if sent_at is not None:
+                    self.in_flight[used] = sent_at
+                self.last_timestamp = max(self.last_timestamp, used)
+            timestamp = used
+        return timestamp
+
+    def on_result(self, result, output_image, timestamp_ms):
+        """
+        인식기 작업 스레드에서 호출되는 결과 콜백
+        """
+        with self.lock:
+            sent_at = self.in_flight.pop(timestamp_ms, None)
+            if sent_at is not None:
+                self.completed += 1
+                self.latency_ms_total += monotonic_ms() - sent_at
+        self.listener(result, output_image, timestamp_ms)
+
+    def stats(self):
+        """
+        Returns:
+            dict: 제출/드롭/완료/유실 수, 처리 중인 프레임 수, 초당 완료 수, 평균 처리 지연(ms)
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.started_at
+            return {
+                'submitted': self.submitted,
+                'dropped': self.dropped,
+                'completed': self.completed,
+                'lost': self.lost,
+                'in_flight': len(self.in_flight),
+                'completed_per_sec': self.completed / elapsed if elapsed > 0 else 0.0,
+                'avg_latency_ms': self.latency_ms_total / self.completed if self.completed else 0.0,
+            }
@@ -0,0 +1,432 @@
+import threading
+import time
+from contextlib import contextmanager
+import mediapipe as mp
+
+
+class ModelPool:
+    """
+    미리 초기화한 모델 인스턴스를 빌려 쓰고 반납하는 풀
+    - checkout: 쉬고 있는 인스턴스를 꺼내거나 (prepare()가 있으면 호출), 최대 개수 미만이면 새로 생성
+    - checkin: 사용이 끝난 인스턴스를 반납 (reset()이 있으면 호출)
+    - reset/prepare가 실패한 인스턴스는 close() 후 버림 (풀 자리는 그대로 돌려줌)
+    - evict_idle: idle_timeout 이상 쓰이지 않은 인스턴스는 close() 후 제거
+    """
+
+    def __init__(self, factory, max_size=4, idle_timeout=300.0, min_idle=0):
+        """
+        Args:
+            factory (callable): 새 인스턴스를 만드는 함수
+            max_size (int): 동시에 존재할 수 있는 최대 인스턴스 수
+            idle_timeout (float): 이 시간(초) 이상 쉬면 제거
+            min_idle (int): 제거하지 않고 남겨 둘 최소 대기 인스턴스 수
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.min_idle = min_idle
+        self.idle = []  # (반납 시각, 인스턴스) - 마지막이 가장 최근
+        self.in_use = 0
+        self.created = 0
+        self.evicted = 0
+        self.discarded = 0  # reset/prepare 실패로 버린 인스턴스 수
+        self.condition = threading.Condition()
+
+    def checkout(self, timeout=10.0):
+        """
+        인스턴스 대여 (가장 최근에 반납된 것부터 사용하여 캐시 효율 유지)
+        Args:
+            timeout (float, optional): 풀이 가득 찼을 때 기다릴 최대 시간 (None이면 무한 대기)
+        Returns:
+            인스턴스
+        Raises:
+            TimeoutError: 제한 시간 안에 인스턴스를 얻지 못한 경우
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            self.evict_idle()
+            while not self.idle and self.in_use >= self.max_size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("사용 가능한 모델 인스턴스가 없습니다.")
+                self.condition.wait(remaining)
+
+            self.in_use += 1
+            instance = self.idle.pop()[1] if self.idle else None
+
+        if instance is not None:
+            # 반납 때 미뤄 둔 재초기화 (실패하면 버리고 새로 생성)
+            prepare = getattr(instance, 'prepare', None)
+            if prepare is None:
+                return instance
+            try:
+                prepare()
+                return instance
+            except Exception:
+                self._discard(instance)
+
+        # 모델 생성은 느리므로 잠금 밖에서 수행
+        try:
+            instance = self.factory()
+        except Exception:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created += 1
+        return instance
+
+    def checkin(self, instance):
+        """
+        인스턴스 반납
+        """
+        reset = getattr(instance, 'reset', None)
+        try:
+            if reset is not None:
+                reset()
+        except Exception:
+            self._discard(instance)
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            return
+        with self.condition:
+            self.in_use -= 1
+            self.idle.append((time.monotonic(), instance))
+            self.condition.notify()
+
+    def _discard(self, instance):
+        # 상태를 되돌릴 수 없는 인스턴스 정리 (in_use는 호출한 쪽에서 처리)
+        with self.condition:
+            self.discarded += 1
+        close = getattr(instance, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def lease(self, timeout=10.0):
+        """
+        with 문으로 대여/반납
+        """
+        instance = self.checkout(timeout)
+        try:
+            yield instance
+        finally:
+            self.checkin(instance)
+
+    def warm(self, count=1):
+        """
+        첫 요청이 초기화 비용을 치르지 않도록 미리 인스턴스 생성
+        """
+        instances = [self.checkout() for _ in range(min(count, self.max_size))]
+        for instance in instances:
+            self.checkin(instance)
+
+    def evict_idle(self, now=None):
+        """
+        오래 쉬고 있는 인스턴스 제거
+        Returns:
+            int: 제거한 인스턴스 수
+        """
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self.condition:
+            keep = []
+            # 오래된 것부터 검사하되 min_idle개는 남김
+            for index, (returned_at, instance) in enumerate(self.idle):
+                removable = len(self.idle) - index > self.min_idle
+                if removable and now - returned_at >= self.idle_timeout:
+                    expired.append(instance)
+                else:
+                    keep.append((returned_at, instance))
+            self.idle = keep
+            self.evicted += len(expired)
+
+        for instance in expired:
+            close = getattr(instance, 'close', None)
+            if close is not None:
+                close()
+        return len(expired)
+
+    def close(self):
+        """
+        대기 중인 인스턴스를 모두 닫음
+        """
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for _, instance in idle:
+            close = getattr(instance, 'close', None)
+            if close is not None:
+                close()
+
+    def stats(self):
+        with self.condition:
+            return {'idle': len(self.idle), 'in_use': self.in_use,
+                    'created': self.created, 'evicted': self.evicted, 'discarded': self.discarded}
+
+
+class PooledGestureRecognizer:
+    """
+    LIVE_STREAM 모드 GestureRecognizer 래퍼
+    - 결과 콜백은 생성 시 고정되므로, 현재 대여자의 listener로 전달하는 방식으로 재사용
+    - 여러 세션이 같은 인스턴스를 쓰므로 타임스탬프가 항상 증가하도록 보정
+    - 반납 시 listener를 떼어 이전 세션 결과를 버리고, 다음 대여 때(prepare) 내부 그래프를 새로 만들어
+      손 추적 상태가 넘어가지 않게 함 (재생성 비용은 재사용하는 대여의 시작에서 한 번 치름)
+    """
+
+    def __init__(self, model_data, **options):
+        self.listener = None
+        self.last_timestamp = -1
+        self.lock = threading.Lock()
+        self.recognizer_options = mp.tasks.vision.GestureRecognizerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_buffer=model_data),
+            running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
+            result_callback=self.dispatch,
+            **options
+        )
+        self.recognizer = mp.tasks.vision.GestureRecognizer.create_from_options(self.recognizer_options)
+        self.stale = False  # 반납된 뒤 그래프를 아직 새로 만들지 않음
+
+    def dispatch(self, result, output_image, timestamp_ms):
+        listener = self.listener
+        if listener is not None:
+            listener(result, output_image, timestamp_ms)
+
+    def recognize_async(self, image, timestamp_ms):
+        with self.lock:
+            timestamp_ms = max(int(timestamp_ms), self.last_timestamp + 1)
+            self.last_timestamp = timestamp_ms
+        self.recognizer.recognize_async(image, timestamp_ms)
+        return timestamp_ms
+
+    def reset(self):
+        # 반납 후 도착하는 이전 세션의 결과는 버리고, 그래프 재생성은 다음 대여로 미룸
+        self.listener = None
+        self.stale = True
+
+    def prepare(self):
+        # 다음 대여 직전 - 이전 그래프를 닫고(남은 콜백은 listener가 없으므로 버려짐) 새로 만듦
+        if not self.stale:
+            return
+        self.recognizer.close()
+        self.recognizer = mp.tasks.vision.GestureRecognizer.create_from_options(self.recognizer_options)
+        self.stale = False
+
+    def close(self):
+        self.recognizer.close()
+
+
+class VideoGestureRecognizer:
+    """
+    VIDEO 모드 GestureRecognizer 래퍼 (업로드된 프레임 묶음용)
+    - 프레임마다 결과를 바로 돌려주므로 건너뛰는 프레임 없이 모든 프레임을 인식
+    - 여러 요청이 같은 인스턴스를 쓰므로 타임스탬프가 항상 증가하도록 보정
+    - VIDEO 모드는 호출 사이 손 추적 상태를 유지하므로, 반납된 인스턴스는 다음 대여 때(prepare) 그래프를 새로 만들어
+      이전 요청의 손 위치가 다른 사용자의 묶음으로 넘어가지 않게 함
+    """
+
+    def __init__(self, model_data, **options):
+        self.last_timestamp = -1
+        self.recognizer_options = mp.tasks.vision.GestureRecognizerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_buffer=model_data),
+            running_mode=mp.tasks.vision.RunningMode.VIDEO,
+            **options
+        )
+        self.recognizer = mp.tasks.vision.GestureRecognizer.create_from_options(self.recognizer_options)
+        self.stale = False  # 반납된 뒤 그래프를 아직 새로 만들지 않음
+
+    def recognize(self, image, timestamp_ms):
+        """
+        Args:
+            image (mp.Image): 프레임
+            timestamp_ms (int): 프레임 타임스탬프 (이전 값 이하이면 이전 값 + 1로 보정)
+        Returns:
+            GestureRecognizerResult: 인식 결과
+        """
+        timestamp_ms = max(int(timestamp_ms), self.last_timestamp + 1)
+        self.last_timestamp = timestamp_ms
+        return self.recognizer.recognize_for_video(image, timestamp_ms)
+
+    def reset(self):
+        # 반납 - 그래프 재생성은 다음 대여로 미룸
+        self.stale = True
+
+    def prepare(self):
+        # 다음 대여 직전 - 손 추적 상태가 없는 새 그래프로 교체 (타임스탬프도 처음부터)
+        if not self.stale:
+            return
+        self.recognizer.close()
+        self.recognizer = mp.tasks.vision.GestureRecognizer.create_from_options(self.recognizer_options)
+        self.last_timestamp = -1
+        self.stale = False
+
+    def close(self):
+        self.recognizer.close()
+
+
+class ImageGestureRecognizer:
+    """
+    IMAGE 모드 GestureRecognizer 래퍼 (여러 세션이 프레임마다 번갈아 빌려 쓰는 경우용)
+    - 프레임 사이 추적 상태가 없으므로 한 인스턴스가 다른 세션의 프레임을 섞어 처리해도 결과가 서로 영향을 주지 않음
+    """
+
+    def __init__(self, model_data, **options):
+        recognizer_options = mp.tasks.vision.GestureRecognizerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_buffer=model_data),
+            running_mode=mp.tasks.vision.RunningMode.IMAGE,
+            **options
+        )
+        self.recognizer = mp.tasks.vision.GestureRecognizer.create_from_options(recognizer_options)
+
+    def recognize(self, image, timestamp_ms=None):
+        """
+        Args:
+            image (mp.Image): 프레임
+            timestamp_ms (int, optional): VideoGestureRecognizer와의 호환용 (사용하지 않음)
+        Returns:
+            GestureRecognizerResult: 인식 결과
+        """
+        return self.recognizer.recognize(image)
+
+    def close(self):
+        self.recognizer.close()
+
+
+# 프로세스 전역 풀 레지스트리 (Streamlit 재실행/세션 간에 공유)
+_pools = {}
+_pools_lock = threading.Lock()
+_model_data = {}
+_reaper = None
+
+
+def get_pool(key, factory, max_size=4, idle_timeout=300.0, min_idle=0):
+    """
+    키별 풀을 한 번만 만들고 이후에는 같은 풀 반환
+    - 나중 호출자가 더 큰 max_size를 요청하면 기존 풀의 최대 개수를 늘림 (줄이지는 않음)
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ModelPool(factory, max_size, idle_timeout, min_idle)
+            _pools[key] = pool
+            _start_reaper()
+        elif max_size > pool.max_size:
+            with pool.condition:
+                pool.max_size = max_size
+                pool.condition.notify_all()
+        return pool
+
+
+def _start_reaper(interval=30.0):
+    """
+    아무도 풀을 쓰지 않아도 유휴 인스턴스가 정리되도록 백그라운드 스레드 시작
+    """
+    global _reaper
+    if _reaper is not None:
+        return
+
+    def reap():
+        while True:
+            time.sleep(interval)
+            with _pools_lock:
+                pools = list(_pools.values())
+            for pool in pools:
+                pool.evict_idle()
+
+    _reaper = threading.Thread(target=reap, name='model-pool-reaper', daemon=True)
+    _reaper.start()
+
+
+def read_model(model_path):
+    """
+    모델 파일을 한 번만 읽어 바이트로 캐시
+    Raises:
+        FileNotFoundError: 모델 파일이 없는 경우
+    """
+    with _pools_lock:
+        data = _model_data.get(model_path)
+    if data is None:
+        with open(model_path, 'rb') as file:
+            data = file.read()
+        with _pools_lock:
+            _model_data[model_path] = data
+    return data
+
+
+def gesture_recognizer_pool(model_path, num_hands=1, min_confidence=0.5, max_size=4):
+    """
+    제스처 인식기 풀
+    Args:
+        model_path (str): .task 모델 파일 경로
+        num_hands (int): 인식할 손 개수
+        min_confidence (float): 손 검출/존재/추적 최소 신뢰도
+        max_size (int): 최대 인스턴스 수
+    """
+    def factory():
+        return PooledGestureRecognizer(
+            read_model(model_path),
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_confidence,
+            min_hand_presence_confidence=min_confidence,
+            min_tracking_confidence=min_confidence,
+        )
+
+    return get_pool(('gesture', model_path, num_hands, min_confidence), factory, max_size)
+
+
+def video_gesture_recognizer_pool(model_path, num_hands=1, min_confidence=0.5, max_size=4):
+    """
+    VIDEO 모드 제스처 인식기 풀 (프레임마다 동기 인식)
+    Args:
+        model_path (str): .task 모델 파일 경로
+        num_hands (int): 인식할 손 개수
+        min_confidence (float): 손 검출/존재/추적 최소 신뢰도
+        max_size (int): 최대 인스턴스 수
+    """
+    def factory():
+        return VideoGestureRecognizer(
+            read_model(model_path),
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_confidence,
+            min_hand_presence_confidence=min_confidence,
+            min_tracking_confidence=min_confidence,
+        )
+
+    return get_pool(('gesture_video', model_path, num_hands, min_confidence), factory, max_size)
+
+
+def image_gesture_recognizer_pool(model_path, num_hands=1, min_confidence=0.5, max_size=4):
+    """
+    IMAGE 모드 제스처 인식기 풀 (프레임마다 빌리고 반납하는 다중 세션용)
+    Args:
+        model_path (str): .task 모델 파일 경로
+        num_hands (int): 인식할 손 개수
+        min_confidence (float): 손 검출/존재 최소 신뢰도
+        max_size (int): 최대 인스턴스 수
+    """
+    def factory():
+        return ImageGestureRecognizer(
+            read_model(model_path),
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_confidence,
+            min_hand_presence_confidence=min_confidence,
+        )
+
+    return get_pool(('gesture_image', model_path, num_hands, min_confidence), factory, max_size)
+
+
+def face_detector_pool(model_selection=0, min_detection_confidence=0.8, max_size=4):
+    """
+    MediaPipe 얼굴 검출기 풀
+    """
+    def factory():
+        return mp.solutions.face_detection.FaceDetection(
+            model_selection=model_selection,
+            min_detection_confidence=min_detection_confidence,
+        )
+
+    return get_pool(('face_detection', model_selection, min_detection_confidence), factory, max_size)
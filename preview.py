@@ -0,0 +1,98 @@
+import time
+import cv2
+import numpy as np
+
+# 변화 감지용 축소 프레임 크기
+THUMBNAIL_SIZE = (32, 24)
+
+
+class PreviewChannel:
+    """
+    Streamlit 미리보기 전송 채널
+    - 인식 FPS와 별개로 화면 전송 FPS를 max_fps로 제한
+    - 프레임을 JPEG로 한 번 인코딩해 바이트로 전송 (원본 배열 직렬화 대신)
+    - 축소 흑백 프레임 기준으로 변화가 거의 없으면 전송 생략 (keyframe_interval마다 한 번은 전송)
+    - 세션별 전송 바이트/초, 인코딩 시간 집계
+    """
+
+    def __init__(self, placeholder, max_fps=12.0, quality=70, change_threshold=2.0, keyframe_interval=1.0):
+        """
+        Args:
+            placeholder: 프레임을 표시할 Streamlit placeholder (st.empty())
+            max_fps (float): 최대 전송 FPS
+            quality (int): JPEG 품질 (0~100)
+            change_threshold (float): 전송할 최소 평균 밝기 변화량 (0~255)
+            keyframe_interval (float): 변화가 없어도 이 시간(초)마다 한 번은 전송
+        """
+        self.placeholder = placeholder
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.change_threshold = change_threshold
+        self.keyframe_interval = keyframe_interval
+        # 인코딩 파라미터는 한 번만 만들어 재사용
+        self.encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+        self.thumbnail = np.empty((THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0], 3), dtype=np.uint8)
+        self.last_thumbnail = None
+        self.last_sent_at = None
+        self.started_at = time.monotonic()
+        self.sent = 0
+        self.skipped_rate = 0
+        self.skipped_unchanged = 0
+        self.bytes_sent = 0
+        self.encode_seconds = 0.0
+
+    def publish(self, frame, now=None):
+        """
+        프레임 전송 시도
+        Args:
+            frame (numpy.ndarray): BGR 프레임
+            now (float, optional): 현재 시각 (기본값: time.monotonic())
+        Returns:
+            bool: 실제로 전송했는지 여부
+        """
+        now = time.monotonic() if now is None else now
+        since_last = None if self.last_sent_at is None else now - self.last_sent_at
+
+        if since_last is not None and since_last < self.min_interval:
+            self.skipped_rate += 1
+            return False
+
+        cv2.resize(frame, THUMBNAIL_SIZE, dst=self.thumbnail, interpolation=cv2.INTER_AREA)
+        if self.last_thumbnail is not None and since_last < self.keyframe_interval:
+            change = cv2.absdiff(self.thumbnail, self.last_thumbnail).mean()
+            if change < self.change_threshold:
+                self.skipped_unchanged += 1
+                return False
+
+        start = time.perf_counter()
+        ok, encoded = cv2.imencode('.jpg', frame, self.encode_params)
+        self.encode_seconds += time.perf_counter() - start
+        if not ok:
+            return False
+
+        data = encoded.tobytes()
+        self.placeholder.image(data, use_container_width=True)
+
+        if self.last_thumbnail is None:
+            self.last_thumbnail = self.thumbnail.copy()
+        else:
+            np.copyto(self.last_thumbnail, self.thumbnail)
+        self.last_sent_at = now
+        self.sent += 1
+        self.bytes_sent += len(data)
+        return True
+
+    def stats(self):
+        """
+        Returns:
+            dict: 전송/생략 프레임 수, 초당 전송 바이트, 프레임당 평균 인코딩 시간(ms)
+        """
+        elapsed = time.monotonic() - self.started_at
+        return {
+            'sent': self.sent,
+            'skipped_rate': self.skipped_rate,
+            'skipped_unchanged': self.skipped_unchanged,
+            'bytes_sent': self.bytes_sent,
+            'bytes_per_sec': self.bytes_sent / elapsed if elapsed > 0 else 0.0,
+            'fps': self.sent / elapsed if elapsed > 0 else 0.0,
+            'avg_encode_ms': self.encode_seconds / self.sent * 1000 if self.sent else 0.0,
+        }
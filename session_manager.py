@@ -0,0 +1,526 @@
+import asyncio
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+import cv2
+import mediapipe as mp
+import numpy as np
+from auth_engine import FaceAuthEngine, GestureSequenceEngine, encode_faces, REJECTED
+from audit import get_audit_log, SUCCESS, FAILURE, ERROR
+from frame_source import FrameSource
+from model_pool import face_detector_pool, image_gesture_recognizer_pool
+
+# 추론 스레드 수 환경 변수
+THREADS_ENV = 'AUTH_SESSION_THREADS'
+
+# 세션 상태 (엔진 상태와 별개로 세션 수명 표시)
+PENDING = 'pending'    # 첫 프레임 대기
+RUNNING = 'running'    # 프레임 처리 중
+FINISHED = 'finished'  # 결정 완료 (accepted로 성공 여부 확인)
+TIMEOUT = 'timeout'    # session_timeout 안에 결정하지 못함
+FAILED = 'failed'      # 예외
+CLOSED = 'closed'      # 결정 전에 프레임 공급이 끝남
+
+# 세션 상태 조회 결과
+# - engine_state: 엔진 상태 (searching, capturing, recording, ...)
+# - frames: 처리한 프레임 수, dropped: 처리 중에 도착해 덮어쓴 프레임 수
+# - age_ms: 세션 시작 이후 경과 시간, message: 마지막 이벤트 메시지
+SessionInfo = namedtuple('SessionInfo', ['session_id', 'kind', 'mode', 'user_id', 'state', 'engine_state',
+                                         'frames', 'dropped', 'age_ms', 'message', 'accepted', 'reason'])
+
+
+class FrameFeed:
+    """
+    세션 코루틴이 기다리는 최신 프레임 우편함
+    - push/close는 어느 스레드에서나 호출 가능 (이벤트 루프로 넘겨 처리)
+    - 세션이 이전 프레임을 처리하는 동안 도착한 프레임은 새 프레임으로 덮어씀 (밀린 프레임을 쌓지 않음)
+    - 세션 하나가 들고 있는 프레임은 최대 한 장
+    """
+
+    def __init__(self, loop):
+        """
+        Args:
+            loop (asyncio.AbstractEventLoop): 세션이 도는 이벤트 루프
+        """
+        self.loop = loop
+        self.frame = None
+        self.closed = False
+        self.ready = asyncio.Event()
+        self.pushed = 0
+        self.dropped = 0
+
+    def push(self, frame):
+        """
+        프레임 공급
+        Args:
+            frame (Frame): frame_source.Frame (image, timestamp, index)
+        """
+        self.loop.call_soon_threadsafe(self._put, frame)
+
+    def close(self):
+        """
+        공급 종료 (세션은 남은 프레임을 처리한 뒤 지금까지 본 프레임으로 결정)
+        """
+        self.loop.call_soon_threadsafe(self._close)
+
+    def _put(self, frame):
+        if self.closed:
+            return
+        if self.frame is not None:
+            self.dropped += 1
+        self.frame = frame
+        self.pushed += 1
+        self.ready.set()
+
+    def _close(self):
+        self.closed = True
+        self.ready.set()
+
+    async def get(self):
+        """
+        다음 프레임 대기
+        Returns:
+            Frame | None: 가장 최근 프레임 (공급이 끝났으면 None)
+        """
+        while self.frame is None:
+            if self.closed:
+                return None
+            self.ready.clear()
+            await self.ready.wait()
+        frame, self.frame = self.frame, None
+        return frame
+
+
+async def pump_source(source, feed, executor=None):
+    """
+    프레임 소스를 피드로 흘려 보내는 코루틴
+    - 오프라인 소스(FrameSource)는 이벤트 루프에서 바로 읽고, 실시간 간격은 asyncio.sleep으로 맞춤 (스레드 없음)
+    - 카메라(ThreadedCapture)처럼 읽기가 막히는 소스는 executor 스레드에서 읽음
+    Args:
+        source: read_frame()을 가진 시작된 프레임 소스
+        feed (FrameFeed): 프레임을 받을 피드
+        executor (Executor, optional): 막히는 읽기를 실행할 스레드 풀 (None이면 루프 기본 실행기)
+    """
+    loop = asyncio.get_running_loop()
+    offline = isinstance(source, FrameSource)
+    try:
+        while not feed.closed:
+            if offline:
+                if source.realtime and source.fps:
+                    delay = source.started_at + source.index / source.fps - time.monotonic()
+                    await asyncio.sleep(max(0.0, delay))
+                else:
+                    await asyncio.sleep(0)
+                frame = source.read_frame()
+            else:
+                frame = await loop.run_in_executor(executor, source.read_frame)
+            if frame is None:
+                break
+            feed._put(frame)
+    finally:
+        feed._close()
+        source.release()
+
+
+class LeasedDetector:
+    """
+    process()를 호출할 때마다 풀에서 검출기를 빌려 쓰는 프록시
+    - 세션 수백 개가 검출기를 하나씩 붙잡지 않고, 추론 스레드 수만큼의 인스턴스를 나눠 씀
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def process(self, rgb_frame):
+        with self.pool.lease() as detector:
+            return detector.process(rgb_frame)
+
+
+class AuthSession:
+    """
+    세션 관리자가 돌리는 인증 세션 하나
+    - feed로 프레임을 넣고, result(concurrent Future)로 결정을 받음
+    """
+
+    def __init__(self, session_id, kind, mode, user_id, feed):
+        self.session_id = session_id
+        self.kind = kind
+        self.mode = mode
+        self.user_id = user_id
+        self.feed = feed
+        self.state = PENDING
+        self.engine = None
+        self.frames = 0
+        self.message = None
+        self.accepted = None
+        self.reason = None
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.result = Future()  # 결정 dict (다른 스레드에서 기다릴 때 사용)
+        self.task = None
+
+    def apply(self, events):
+        for event in events:
+            self.message = event.message
+
+    def info(self):
+        """
+        Returns:
+            SessionInfo: 현재 상태
+        """
+        end = self.finished_at or time.monotonic()
+        return SessionInfo(self.session_id, self.kind, self.mode, self.user_id, self.state,
+                           self.engine.state if self.engine is not None else None,
+                           self.frames, self.feed.dropped, (end - self.started_at) * 1000,
+                           self.message, self.accepted, self.reason)
+
+
+class SessionManager:
+    """
+    asyncio 인증 세션 다중화기
+    - 인증 세션 하나가 코루틴 하나 (Streamlit 스크립트 스레드를 세션 내내 붙잡는 while 루프 대신)
+    - 세션은 FrameFeed에서 프레임을 기다리고, 검출/인식/인코딩 같은 CPU 작업만 inference_threads개 스레드 풀로 넘김
+    - 검출기/인식기는 프레임마다 풀에서 빌려 쓰므로 세션 수와 무관하게 인스턴스 수가 스레드 수로 고정
+    - 세션당 메모리는 엔진 상태 + 최신 프레임 한 장
+    - 세션별 상태와 이벤트 루프 지연(lag: 예약한 시각보다 늦게 깨어난 정도) 집계
+    """
+
+    def __init__(self, inference_threads=8, max_sessions=1000, session_timeout=30.0, lag_interval=0.05,
+                 face_detectors=None, gesture_recognizers=None, encoder=None, audit=None,
+                 model_path='gesture_recognizer.task'):
+        """
+        Args:
+            inference_threads (int): 추론 스레드 수 (검출기/인식기 풀 크기와 같게 맞춤)
+            max_sessions (int): 동시에 열 수 있는 최대 세션 수
+            session_timeout (float): 세션 하나의 최대 시간 (초)
+            lag_interval (float): 이벤트 루프 지연 측정 주기 (초)
+            face_detectors (ModelPool, optional): 얼굴 검출기 풀 (기본값: 프로세스 전역 MediaPipe 풀)
+            gesture_recognizers (ModelPool, optional): recognize(image, timestamp_ms)를 가진 제스처 인식기 풀
+                (기본값: 프로세스 전역 IMAGE 모드 풀)
+            encoder (callable, optional): (rgb_frame, detections) -> 인코딩 리스트 (기본값: 이 스레드에서 dlib 인코딩)
+            audit (AuditLog, optional): 등록/인증 시도 기록 (기본값: 프로세스 전역 감사 로그)
+            model_path (str): 기본 제스처 인식기 풀의 모델 파일 경로
+        """
+        self.inference_threads = inference_threads
+        self.max_sessions = max_sessions
+        self.session_timeout = session_timeout
+        self.lag_interval = lag_interval
+        self.face_detectors = face_detectors or face_detector_pool(model_selection=0, min_detection_confidence=0.8,
+                                                                   max_size=inference_threads)
+        self.gesture_recognizers = gesture_recognizers or image_gesture_recognizer_pool(model_path,
+                                                                                        max_size=inference_threads)
+        self.encoder = encoder or encode_faces
+        self.audit = audit if audit is not None else get_audit_log()
+        self.inference = ThreadPoolExecutor(max_workers=inference_threads, thread_name_prefix='session-infer')
+
+        self.loop = None
+        self.thread = None
+        self.lag_task = None
+        self.sessions = {}  # 세션 ID -> AuthSession (진행 중)
+        self.recent = deque(maxlen=256)  # 끝난 세션
+        self.next_id = 0
+        self.id_lock = threading.Lock()
+        self.outcomes = Counter()
+        self.inflight = 0
+        self.inference_calls = 0
+        self.inference_seconds = 0.0
+        self.lag_samples = deque(maxlen=1024)
+        self.lag_max = 0.0
+
+    def start(self):
+        """
+        이벤트 루프를 백그라운드 스레드에서 시작 (이미 도는 루프 안에서 쓰려면 attach 사용)
+        Returns:
+            SessionManager: 자기 자신 (체이닝용)
+        """
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.lag_task = self.loop.create_task(self._monitor_lag())
+            self.loop.call_soon(ready.set)
+            self.loop.run_forever()
+            self.loop.close()
+
+        self.thread = threading.Thread(target=run, name='session-loop', daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+
+    def attach(self):
+        """
+        현재 실행 중인 이벤트 루프에 붙음 (코루틴 안에서 호출)
+        """
+        self.loop = asyncio.get_running_loop()
+        self.lag_task = self.loop.create_task(self._monitor_lag())
+        return self
+
+    async def _monitor_lag(self):
+        # 주기적으로 잠들었다 깨어나 예정보다 늦어진 시간을 기록 (루프를 막는 작업이 있으면 커짐)
+        while True:
+            started = self.loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, self.loop.time() - started - self.lag_interval)
+            self.lag_samples.append(lag)
+            self.lag_max = max(self.lag_max, lag)
+
+    async def _infer(self, function, *args):
+        # CPU 작업을 추론 스레드로 넘기고 기다리는 동안 루프는 다른 세션을 진행
+        self.inflight += 1
+        start = time.perf_counter()
+        try:
+            return await self.loop.run_in_executor(self.inference, function, *args)
+        finally:
+            self.inflight -= 1
+            self.inference_calls += 1
+            self.inference_seconds += time.perf_counter() - start
+
+    def open_face_session(self, mode='verify', user_id=None, matcher=None, identifier=None, max_wait=2.0):
+        """
+        얼굴 등록/인증 세션 시작 (어느 스레드에서나 호출 가능)
+        Args:
+            mode (str): 'register' 또는 'verify'
+            user_id (str, optional): 주장된 사용자 ID (있으면 1:1 검증)
+            matcher (FaceMatcher, optional): 1:1 검증용 매처
+            identifier (optional): 1:N 식별기 (기본값: matcher)
+            max_wait (float): 품질 기준을 넘는 프레임이 없을 때 최대 대기 시간 (초)
+        Returns:
+            AuthSession: 세션 (feed로 프레임 공급, result로 결정 수신)
+        Raises:
+            queue.Full: 열린 세션이 max_sessions개인 경우
+        """
+        engine = FaceAuthEngine(LeasedDetector(self.face_detectors), mode=mode, matcher=matcher,
+                                identifier=identifier, user_id=user_id, max_wait=max_wait, encoder=self.encoder)
+        return self._open('face', mode, user_id, engine, self._run_face)
+
+    def open_gesture_session(self, store, mode='verify', user_id=None):
+        """
+        제스처 등록/인증 세션 시작 (어느 스레드에서나 호출 가능)
+        Args:
+            store (GestureStore): 단계 수와 저장/검증 대상
+            mode (str): 'register' 또는 'verify'
+            user_id (str): 사용자 ID 또는 파일 이름
+        Returns:
+            AuthSession: 세션
+        Raises:
+            queue.Full: 열린 세션이 max_sessions개인 경우
+        """
+        engine = GestureSequenceEngine(steps=store.steps)
+        return self._open('gesture', mode, user_id, engine, lambda session: self._run_gesture(session, store))
+
+    def _open(self, kind, mode, user_id, engine, runner):
+        if self.loop is None:
+            raise RuntimeError("start() 또는 attach()를 먼저 호출해야 합니다.")
+        with self.id_lock:
+            if len(self.sessions) >= self.max_sessions:
+                raise queue.Full("열린 세션이 너무 많습니다.")
+            self.next_id += 1
+            session = AuthSession(self.next_id, kind, mode, user_id, FrameFeed(self.loop))
+            self.sessions[session.session_id] = session
+        session.engine = engine
+        self.loop.call_soon_threadsafe(self._spawn, session, runner)
+        return session
+
+    def _spawn(self, session, runner):
+        session.task = self.loop.create_task(self._supervise(session, runner))
+
+    async def _supervise(self, session, runner):
+        # 세션 시간 제한, 예외, 결과 전달과 정리
+        try:
+            await asyncio.wait_for(runner(session), self.session_timeout)
+            if session.state == RUNNING or session.state == PENDING:
+                session.state = FINISHED if session.engine.done else CLOSED
+        except asyncio.TimeoutError:
+            session.state = TIMEOUT
+            session.reason = 'timeout'
+        except asyncio.CancelledError:
+            session.state = CLOSED
+            raise
+        except Exception as e:
+            session.state = FAILED
+            session.reason = 'exception'
+            session.message = str(e)
+        finally:
+            session.feed._close()
+            session.finished_at = time.monotonic()
+            if session.accepted is None:
+                session.accepted = False
+                session.reason = session.reason or 'no_decision'
+            self.outcomes[session.state] += 1
+            self._record(session)
+            with self.id_lock:
+                self.sessions.pop(session.session_id, None)
+            self.recent.append(session)
+            # 얼굴 등록이면 decision에 담긴 인코딩/프레임을 호출한 쪽에서 저장
+            session.result.set_result({'accepted': session.accepted, 'reason': session.reason,
+                                       'state': session.state, 'message': session.message,
+                                       'decision': session.engine.decision})
+
+    async def _run_face(self, session):
+        engine = session.engine
+        while not engine.done:
+            frame = await session.feed.get()
+            if frame is None:
+                # 공급이 끝나면 지금까지 본 가장 좋은 프레임으로 결정
+                session.apply(await self._infer(engine.finish))
+                break
+            session.state = RUNNING
+            session.apply(await self._infer(engine.process, frame.image, frame.timestamp))
+            session.frames += 1
+
+        if engine.done:
+            decision = engine.decision
+            session.accepted = decision['accepted']
+            session.reason = decision.get('reason')
+
+    def _recognize(self, engine, frame):
+        # 추론 스레드에서 실행 - 프레임마다 인식기를 빌려 한 장 인식
+        # (RGB 변환 버퍼를 세션마다 두지 않고 호출마다 만들어 메모리를 추론 스레드 수에 비례하게 유지)
+        timestamp_ms = int(frame.timestamp * 1000)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame.image, cv2.COLOR_BGR2RGB))
+        with self.gesture_recognizers.lease() as recognizer:
+            result = recognizer.recognize(mp_image, timestamp_ms)
+        engine.on_result(result, None, timestamp_ms)
+
+    async def _run_gesture(self, session, store):
+        engine = session.engine
+        while not engine.done:
+            frame = await session.feed.get()
+            if frame is None:
+                return
+            if session.state == PENDING:
+                session.state = RUNNING
+                session.apply(engine.start(frame.timestamp))
+            await self._infer(self._recognize, engine, frame)
+            session.apply(engine.update(engine.results.drain(), frame.timestamp))
+            session.frames += 1
+
+        gestures = engine.decision['gestures']
+        if engine.state == REJECTED:
+            session.accepted, session.reason = False, 'unrecognized_step'
+        elif session.mode == 'register':
+            await self._infer(store.save, session.user_id, gestures)
+            session.accepted = True
+        else:
+            matched, _ = await self._infer(store.verify, session.user_id, gestures)
+            session.accepted = bool(matched)
+            if not matched:
+                session.reason = 'unknown_subject' if matched is None else 'mismatch'
+
+    def _record(self, session):
+        # 세션 결과를 감사 로그에 기록 (버퍼에 넣기만 함)
+        if session.state in (FINISHED, CLOSED) and session.engine.done:
+            outcome = SUCCESS if session.accepted else FAILURE
+        elif session.state == FAILED:
+            outcome = ERROR
+        else:
+            outcome = FAILURE
+        stages = {'frames': session.frames, 'dropped': session.feed.dropped}
+        engine = session.engine
+        if session.kind == 'face':
+            stages.update(engine.timings)
+        else:
+            stages['steps_ms'] = [round(ms, 1) for ms in engine.step_ms]
+        self.audit.record(session.kind, session.mode, session.user_id, outcome, session.reason,
+                          (session.finished_at - session.started_at) * 1000, stages)
+
+    def list_sessions(self):
+        """
+        Returns:
+            list: 진행 중인 세션의 SessionInfo 리스트
+        """
+        with self.id_lock:
+            sessions = list(self.sessions.values())
+        return [session.info() for session in sessions]
+
+    def stats(self):
+        """
+        Returns:
+            dict: 진행 중 세션 수(상태별), 끝난 세션 결과별 수, 추론 대기/평균 시간, 이벤트 루프 지연(ms)
+        """
+        sessions = self.list_sessions()
+        lags = np.asarray(self.lag_samples) * 1000 if self.lag_samples else np.zeros(1)
+        return {
+            'active': len(sessions),
+            'active_by_state': dict(Counter(info.state for info in sessions)),
+            'finished': dict(self.outcomes),
+            'dropped_frames': sum(info.dropped for info in sessions),
+            'inference_threads': self.inference_threads,
+            'inference_inflight': self.inflight,
+            'avg_inference_ms': self.inference_seconds / self.inference_calls * 1000 if self.inference_calls else 0.0,
+            'loop_lag_ms': {
+                'last': float(lags[-1]),
+                'avg': float(lags.mean()),
+                'p99': float(np.percentile(lags, 99)),
+                'max': self.lag_max * 1000,
+            },
+        }
+
+    def _cancel_all(self):
+        # 진행 중인 세션 작업과 지연 측정 작업 취소 (루프 스레드에서 호출)
+        with self.id_lock:
+            tasks = [session.task for session in self.sessions.values() if session.task is not None]
+        tasks.append(self.lag_task)
+        for task in tasks:
+            task.cancel()
+        return tasks
+
+    async def aclose(self):
+        """
+        attach한 루프 안에서 종료 - 세션 취소와 결과 전달이 끝난 뒤 추론 스레드 종료
+        """
+        if self.loop is None:
+            return
+        await asyncio.gather(*self._cancel_all(), return_exceptions=True)
+        await self.loop.run_in_executor(None, self.inference.shutdown)
+        self.loop = None
+
+    def close(self):
+        """
+        진행 중인 세션을 취소하고 루프/추론 스레드 종료
+        - attach 모드에서는 세션을 취소만 하고 기다리지 않음 (루프 안에서는 aclose로 결과 전달까지 기다림)
+        """
+        if self.loop is None:
+            return
+        if self.thread is None:
+            self._cancel_all()
+        else:
+            async def cancel_all():
+                await asyncio.gather(*self._cancel_all(), return_exceptions=True)
+
+            asyncio.run_coroutine_threadsafe(cancel_all(), self.loop).result(timeout=5.0)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5.0)
+        self.inference.shutdown(wait=True)
+        self.loop = None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """
+    프로세스 전역 세션 관리자 (Streamlit 재실행/세션 간에 공유)
+    - 추론 스레드 수는 AUTH_SESSION_THREADS 환경 변수 (기본값: CPU 코어 수 * 2)
+    - dlib 인코딩은 배치 스케줄러/프로세스 풀을 그대로 사용
+    Returns:
+        SessionManager: 시작된 세션 관리자
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from encode_batcher import SERVICE_BATCH_MS, get_encoding_batcher
+            from encode_executor import get_encoding_executor
+            batcher = get_encoding_batcher(SERVICE_BATCH_MS)
+            executor = get_encoding_executor()
+            encoder = batcher.encode if batcher is not None else executor.encode if executor is not None else None
+            threads = int(os.environ.get(THREADS_ENV, (os.cpu_count() or 1) * 2))
+            _manager = SessionManager(inference_threads=threads, encoder=encoder).start()
+            atexit.register(_manager.close)
+        return _manager
@@ -0,0 +1,74 @@
+"""
+CombinedAuthEngine 프레임 버퍼 재사용 테스트
+- ThreadedCapture 링 슬롯이나 BrokerCapture(copy=False)처럼 소스가 process() 반환 뒤 같은 버퍼를 덮어써도
+  얼굴 작업 스레드는 제출 시점의 프레임을 처리해야 함
+- 모델 대신 합성 검출기/인식기/인코더 사용
+
+실행 예:
+    python -m pytest -q test_combined_auth.py
+"""
+import threading
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from auth_engine import CombinedAuthEngine, FaceAuthEngine, GestureSequenceEngine
+from face_matcher import FaceMatcher
+
+
+class RecordingDetector:
+    """
+    받은 프레임의 값을 기록하고 가운데 얼굴 하나를 돌려주는 합성 검출기
+    """
+
+    def __init__(self):
+        self.seen = []
+        box = SimpleNamespace(xmin=0.3, ymin=0.15, width=0.35, height=0.5)
+        self.results = SimpleNamespace(detections=[
+            SimpleNamespace(location_data=SimpleNamespace(relative_bounding_box=box), score=[0.99])])
+
+    def process(self, rgb_frame):
+        self.seen.append((int(rgb_frame.min()), int(rgb_frame.max())))
+        return self.results
+
+
+class IdleRecognizer:
+    """
+    결과를 돌려주지 않는 LIVE_STREAM 인식기 흉내
+    """
+
+    def __init__(self):
+        self.listener = None
+
+    def recognize_async(self, image, timestamp_ms):
+        pass
+
+
+class CombinedAuthFrameReuseTest(unittest.TestCase):
+
+    def setUp(self):
+        encoding = np.random.default_rng(1).normal(0, 0.1, 128)
+        self.detector = RecordingDetector()
+        face = FaceAuthEngine(self.detector, mode='verify', matcher=FaceMatcher([encoding], ['user']),
+                              user_id='user', encoder=lambda rgb_frame, detections: [encoding])
+        gesture = GestureSequenceEngine(IdleRecognizer(), steps=3, inference_size=(80, 60))
+        self.engine = CombinedAuthEngine(face, gesture)
+        self.engine.start()
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_source_overwrites_buffer_after_process(self):
+        # 얼굴 작업 스레드를 막아 둔 채 프레임을 제출하고, 처리되기 전에 소스가 같은 버퍼에 다음 프레임을 씀
+        gate = threading.Event()
+        self.engine.worker.submit(gate.wait, 5.0)
+        buffer = np.full((120, 160, 3), 40, dtype=np.uint8)
+        self.engine.process(buffer, 0)
+        buffer[:] = 200
+        gate.set()
+        self.engine.wait()
+
+        self.assertEqual(self.detector.seen, [(40, 40)])
+
+
+if __name__ == '__main__':
+    unittest.main()